@@ -0,0 +1,101 @@
+"""Отчет о времени импорта (`python -X importtime`) и проверка бюджета.
+
+    python scripts/importtime.py                     # main и application.app
+    python scripts/importtime.py run_service --top 20 --budget-ms 400
+
+Каждый модуль импортируется в отдельном чистом процессе. Код выхода 1, если
+суммарное время импорта какого-либо модуля превышает бюджет.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_MODULES = ("main", "application.app")
+DEFAULT_BUDGET_MS = float(os.environ.get("IMPORT_BUDGET_MS", "600"))
+
+
+@dataclass
+class ImportRecord:
+    name: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def measure(module: str) -> list[ImportRecord]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": f"{ROOT}{os.pathsep}{ROOT / 'src'}",
+        "PROJ_ENV": os.environ.get("PROJ_ENV", "test"),
+    }
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    records = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        # "import time:   self |  cumulative |   name" (отступ имени = глубина)
+        self_us, cumulative_us, name = line.split("|")
+        self_us = self_us.rsplit(":", 1)[1]
+        records.append(
+            ImportRecord(
+                name=name.strip(),
+                depth=(len(name) - len(name.lstrip()) - 1) // 2,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+            )
+        )
+    return records
+
+
+def report(module: str, records: list[ImportRecord], top: int) -> float:
+    total_ms = sum(r.cumulative_us for r in records if r.depth == 0) / 1000
+    print(f"\n== import {module}: {total_ms:.1f} ms, {len(records)} modules")
+
+    print(f"\n  top {top} by cumulative time:")
+    for r in sorted(records, key=lambda r: -r.cumulative_us)[:top]:
+        print(f"  {r.cumulative_us / 1000:>9.1f} ms  {'  ' * r.depth}{r.name}")
+
+    print(f"\n  top {top} by self time:")
+    for r in sorted(records, key=lambda r: -r.self_us)[:top]:
+        print(f"  {r.self_us / 1000:>9.1f} ms  {r.name}")
+    return total_ms
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    args = parser.parse_args()
+
+    over_budget = []
+    for module in args.modules:
+        total_ms = report(module, measure(module), args.top)
+        if total_ms > args.budget_ms:
+            over_budget.append(f"{module}: {total_ms:.1f} ms")
+
+    if over_budget:
+        exceeded = ", ".join(over_budget)
+        print(f"\nImport budget {args.budget_ms:.0f} ms exceeded: {exceeded}")
+        return 1
+    print(f"\nAll imports within {args.budget_ms:.0f} ms budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
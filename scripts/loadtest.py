@@ -0,0 +1,305 @@
+"""Нагрузочный тест процесса main.py.
+
+Поднимает локальный фейковый источник курсов в формате cbr-xml-daily.ru,
+запускает main.py с CBR_URL на него и гоняет API заданной смесью чтений и
+записей. В конце печатает p50/p95/p99 и пропускную способность по операциям,
+а также задержку event loop из /metrics отдельно для тиков планировщика.
+
+    python scripts/loadtest.py --duration 30 --concurrency 32 --write-ratio 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+PREFIX = "/api/test"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Load test for main.py")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds of load")
+    parser.add_argument("--concurrency", type=int, default=16, help="Parallel clients")
+    parser.add_argument(
+        "--write-ratio", type=float, default=0.1, help="Share of write requests"
+    )
+    parser.add_argument("--period", type=int, default=2, help="Scheduler period, s")
+    parser.add_argument(
+        "--currencies", type=int, default=40, help="Currencies in the fake upstream"
+    )
+    parser.add_argument(
+        "--upstream-delay", type=float, default=0.05, help="Fake upstream latency, s"
+    )
+    parser.add_argument("--api-port", type=int, default=8765)
+    parser.add_argument("--upstream-port", type=int, default=8766)
+    parser.add_argument("--workers", type=int, default=1, help="API_WORKERS")
+    parser.add_argument("--json", type=Path, help="Also write the report here")
+    return parser.parse_args()
+
+
+# --- фейковый источник курсов ---------------------------------------------
+
+
+def cbr_payload(currencies: int) -> bytes:
+    codes = ["USD", "EUR"] + [f"X{i:02d}" for i in range(max(0, currencies - 2))]
+    return json.dumps(
+        {
+            "Date": time.strftime("%Y-%m-%dT%H:%M:%S+03:00"),
+            "Valute": {
+                code: {
+                    "CharCode": code,
+                    "Nominal": 1,
+                    "Value": round(random.uniform(10, 120), 4),
+                }
+                for code in codes
+            },
+        }
+    ).encode()
+
+
+async def start_fake_upstream(port: int, currencies: int, delay: float):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            await asyncio.sleep(delay)
+            body = cbr_payload(currencies)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Connection: close\r\n"
+                + f"Content-Length: {len(body)}\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", port)
+
+
+# --- сервис ----------------------------------------------------------------
+
+
+def start_service(args: argparse.Namespace) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "PROJ_ENV": "test",
+        "PYTHONPATH": f"{ROOT}{os.pathsep}{ROOT / 'src'}",
+        "CBR_URL": f"http://127.0.0.1:{args.upstream_port}/daily_json.js",
+        "API_HOST": "127.0.0.1",
+        "API_PORT": str(args.api_port),
+        "API_WORKERS": str(args.workers),
+    }
+    argv = [sys.executable, str(ROOT / "main.py")]
+    argv += ["--rub", "100000", "--usd", "1000", "--eur", "1000"]
+    argv += ["--period", str(args.period)]
+    return subprocess.Popen(
+        argv,
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get(f"{PREFIX}/health/health")).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Service did not become healthy in time")
+
+
+# --- нагрузка --------------------------------------------------------------
+
+READS = (
+    ("GET /{currency}", "GET", f"{PREFIX}/USD", None),
+    ("GET /amount/get", "GET", f"{PREFIX}/amount/get", None),
+    ("GET /rates/batch", "GET", f"{PREFIX}/rates/batch?codes=USD,EUR&matrix=true", None),
+)
+WRITES = (
+    (
+        "PUT /amount/modify",
+        "PUT",
+        f"{PREFIX}/amount/modify",
+        {"items": [{"code": "USD", "delta": 0.01}]},
+    ),
+)
+
+
+async def client_loop(
+    client: httpx.AsyncClient,
+    deadline: float,
+    write_ratio: float,
+    latencies: dict[str, list[float]],
+    errors: dict[str, int],
+) -> None:
+    while time.monotonic() < deadline:
+        ops = WRITES if random.random() < write_ratio else READS
+        name, method, url, body = random.choice(ops)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, json=body)
+            ok = response.status_code < 400
+        except httpx.HTTPError:
+            ok = False
+        elapsed = time.perf_counter() - started
+        if ok:
+            latencies[name].append(elapsed)
+        else:
+            errors[name] += 1
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    return sorted_values[min(int(len(sorted_values) * q), len(sorted_values) - 1)]
+
+
+def summarize(values: list[float], duration: float) -> dict[str, float]:
+    values = sorted(values)
+    return {
+        "count": len(values),
+        "rps": round(len(values) / duration, 1),
+        "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+        "max_ms": round(values[-1] * 1000, 2) if values else float("nan"),
+    }
+
+
+def loop_lag_from_metrics(text: str) -> dict[str, dict[str, float]]:
+    """Оценка квантилей event_loop_lag_seconds по ячейкам гистограммы"""
+    buckets: dict[str, list[tuple[float, float]]] = defaultdict(list)
+    for line in text.splitlines():
+        if not line.startswith("event_loop_lag_seconds_bucket"):
+            continue
+        labels, value = line.rsplit(" ", 1)
+        raw = labels[labels.index("{") + 1 : -1].split(",")
+        parts = dict(p.split("=", 1) for p in raw)
+        phase, le = parts["phase"].strip('"'), parts["le"].strip('"')
+        buckets[phase].append((float("inf") if le == "+Inf" else float(le), float(value)))
+
+    result = {}
+    for phase, items in buckets.items():
+        items.sort()
+        total = items[-1][1]
+        stats: dict[str, float] = {"samples": total}
+        for q in (0.5, 0.95, 0.99):
+            bound = next((b for b, c in items if c >= total * q), float("inf"))
+            stats[f"p{int(q * 100)}_le_ms"] = bound * 1000
+        result[phase] = stats
+    return result
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    if args.workers > 1 and args.write_ratio > 0:
+        # Воркеры API отклоняют изменения сумм (503) — меряем только чтения
+        print("--workers > 1: amounts are read-only, using --write-ratio 0")
+        args.write_ratio = 0.0
+    upstream = await start_fake_upstream(
+        args.upstream_port, args.currencies, args.upstream_delay
+    )
+    service = start_service(args)
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{args.api_port}", limits=limits, timeout=30
+        ) as client:
+            await wait_ready(client)
+            # Ждем первый тик планировщика, чтобы курсы были загружены
+            await asyncio.sleep(args.period)
+
+            latencies: dict[str, list[float]] = defaultdict(list)
+            errors: dict[str, int] = defaultdict(int)
+            started = time.monotonic()
+            await asyncio.gather(
+                *(
+                    client_loop(
+                        client,
+                        started + args.duration,
+                        args.write_ratio,
+                        latencies,
+                        errors,
+                    )
+                    for _ in range(args.concurrency)
+                )
+            )
+            duration = time.monotonic() - started
+
+            metrics = (await client.get(f"{PREFIX}/metrics")).text
+    finally:
+        service.send_signal(signal.SIGTERM)
+        try:
+            service.wait(10)
+        except subprocess.TimeoutExpired:
+            service.kill()
+        upstream.close()
+        await upstream.wait_closed()
+
+    all_latencies = [v for values in latencies.values() for v in values]
+    return {
+        "config": {
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "write_ratio": args.write_ratio,
+            "period": args.period,
+            "workers": args.workers,
+        },
+        "total": summarize(all_latencies, duration),
+        "operations": {name: summarize(v, duration) for name, v in latencies.items()},
+        "errors": dict(errors),
+        # При API_WORKERS > 1 /metrics отдает один воркер, а не main.py
+        "event_loop_lag": loop_lag_from_metrics(metrics),
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    header = (
+        f"{'operation':<22}{'count':>8}{'rps':>9}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    )
+    print(header)
+    print("-" * len(header))
+    rows = {**report["operations"], "TOTAL": report["total"]}
+    for name, s in rows.items():
+        print(
+            f"{name:<22}{s['count']:>8}{s['rps']:>9}{s['p50_ms']:>9}"
+            f"{s['p95_ms']:>9}{s['p99_ms']:>9}{s['max_ms']:>9}"
+        )
+    if report["errors"]:
+        print(f"errors: {report['errors']}")
+    print("\nevent loop lag (ms, upper bucket bound):")
+    for phase, s in report["event_loop_lag"].items():
+        print(
+            f"  {phase:<5} samples={int(s['samples'])} p50<={s['p50_le_ms']:g} "
+            f"p95<={s['p95_le_ms']:g} p99<={s['p99_le_ms']:g}"
+        )
+
+
+def main() -> None:
+    args = parse_args()
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
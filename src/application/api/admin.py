@@ -0,0 +1,30 @@
+import secrets
+from typing import Optional
+
+from fastapi import Header, HTTPException, status
+
+from application.settings import get_settings
+
+ADMIN_TOKEN_HEADER = "X-Admin-Token"
+
+
+def require_admin_token(
+    x_admin_token: Optional[str] = Header(None),  # noqa: UP007
+) -> None:
+    """Dependency для админских endpoint'ов: сверяет X-Admin-Token с ADMIN_TOKEN.
+
+    Пока ADMIN_TOKEN не задан, админские endpoint'ы выключены.
+    """
+    settings = get_settings()
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin endpoints are disabled: ADMIN_TOKEN is not set",
+        )
+    if x_admin_token is None or not secrets.compare_digest(
+        x_admin_token.encode(), settings.ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail=f"Invalid or missing {ADMIN_TOKEN_HEADER} header",
+        )
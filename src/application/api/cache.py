@@ -0,0 +1,57 @@
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Response
+
+
+def set_rates_cache_headers(
+    response: Response,
+    updated_at: Optional[float],  # noqa: UP007
+    next_run_in: Optional[float],  # noqa: UP007
+    now: Optional[float] = None,  # noqa: UP007
+) -> None:
+    """Last-Modified, Age и Cache-Control для ответов с курсами.
+
+    Курсы меняются только на следующем тике планировщика. Кэш считает ответ
+    свежим, пока Age < max-age, поэтому max-age — полное время жизни снимка
+    (возраст + время до следующего запроса курсов). Если следующий запуск
+    неизвестен (задача выполняется или планировщика нет в процессе),
+    ответ можно хранить только с перепроверкой.
+    """
+    if updated_at is None:
+        response.headers["Cache-Control"] = "no-cache"
+        return
+    now = time.time() if now is None else now
+    age = max(int(now - updated_at), 0)
+    response.headers["Last-Modified"] = formatdate(updated_at, usegmt=True)
+    response.headers["Age"] = str(age)
+    if next_run_in is None:
+        response.headers["Cache-Control"] = "no-cache"
+    else:
+        response.headers["Cache-Control"] = f"public, max-age={age + int(next_run_in)}"
+
+
+def is_not_modified(
+    if_modified_since: Optional[str],  # noqa: UP007
+    updated_at: Optional[float],  # noqa: UP007
+) -> bool:
+    """Курсы не менялись с момента из If-Modified-Since (точность — секунда)"""
+    if if_modified_since is None or updated_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        # Некорректную дату RFC 9110 велит игнорировать
+        return False
+    return int(updated_at) <= since
+
+
+def not_modified(response: Response) -> Response:
+    """304 с заголовками кэширования, уже выставленными на response"""
+    headers = {
+        key: value
+        for key, value in response.headers.items()
+        if key not in ("content-length", "content-type")
+    }
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,125 @@
+import importlib.util
+from functools import lru_cache
+from typing import Any, Optional, Union
+
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Бинарные форматы — опциональные зависимости: msgpack и pyarrow
+_OPTIONAL_MEDIA_TYPES = {
+    MSGPACK_MEDIA_TYPE: "msgpack",
+    ARROW_MEDIA_TYPE: "pyarrow",
+}
+_ALIASES = {
+    "application/x-msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.msgpack": MSGPACK_MEDIA_TYPE,
+    "application/vnd.apache.arrow.file": ARROW_MEDIA_TYPE,
+}
+_WILDCARDS = ("*/*", "application/*")
+
+
+@lru_cache(maxsize=1)
+def available_media_types() -> tuple[str, ...]:
+    optional = (
+        media
+        for media, module in _OPTIONAL_MEDIA_TYPES.items()
+        if importlib.util.find_spec(module) is not None
+    )
+    return (JSON_MEDIA_TYPE, *optional)
+
+
+def parse_accept(value: str) -> list[tuple[str, float]]:
+    """Типы из Accept по убыванию q (при равных q — в порядке перечисления)"""
+    items = []
+    for part in value.split(","):
+        media, *params = (p.strip() for p in part.split(";"))
+        if not media:
+            continue
+        q = 1.0
+        for param in params:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        items.append((media.lower(), q))
+    return sorted(items, key=lambda item: -item[1])
+
+
+def negotiate_media_type(accept: Optional[str]) -> str:  # noqa: UP007
+    """Лучший поддерживаемый тип ответа; 406, если клиент не принимает ни один"""
+    if not accept:
+        return JSON_MEDIA_TYPE
+    available = available_media_types()
+    for media, q in parse_accept(accept):
+        if q <= 0:
+            continue
+        if media in _WILDCARDS:
+            return JSON_MEDIA_TYPE
+        media = _ALIASES.get(media, media)
+        if media in available:
+            return media
+    raise HTTPException(
+        status_code=406,
+        detail=f"Not acceptable: {accept}. Available: {', '.join(available)}",
+    )
+
+
+def encode_msgpack(data: Any) -> bytes:
+    import msgpack
+
+    return msgpack.packb(data, use_bin_type=True)
+
+
+def encode_arrow(data: dict[str, Any]) -> bytes:
+    """Arrow IPC stream.
+
+    Если все поля — списки одной длины (колонки), каждый становится колонкой
+    таблицы; иначе ответ кодируется одной строкой со struct-полями.
+    """
+    import pyarrow as pa
+
+    values = list(data.values())
+    columnar = (
+        values
+        and all(isinstance(v, list) for v in values)
+        and len({len(v) for v in values}) == 1
+    )
+    table = pa.table(data) if columnar else pa.Table.from_pylist([data])
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+_ENCODERS = {
+    MSGPACK_MEDIA_TYPE: encode_msgpack,
+    ARROW_MEDIA_TYPE: encode_arrow,
+}
+
+
+def negotiated(
+    schema: BaseModel,
+    accept: Optional[str],  # noqa: UP007
+    response: Response,
+) -> Union[BaseModel, Response]:  # noqa: UP007
+    """Схема для JSON (сериализует FastAPI) или готовый бинарный Response.
+
+    Заголовки, уже выставленные на response (ETag, Cache-Control), переносятся
+    в бинарный ответ.
+    """
+    media_type = negotiate_media_type(accept)
+    response.headers["Vary"] = "Accept"
+    if media_type == JSON_MEDIA_TYPE:
+        return schema
+    content = _ENCODERS[media_type](schema.model_dump())
+    headers = {
+        key: value
+        for key, value in response.headers.items()
+        if key not in ("content-length", "content-type")
+    }
+    return Response(content=content, media_type=media_type, headers=headers)
@@ -0,0 +1,8 @@
+from fastapi import APIRouter
+
+from . import alerts
+
+# Префикс задается при включении: у POST/GET списка правил пустой путь
+router = APIRouter(tags=["Alerts v1"])
+
+router.include_router(alerts.router, prefix="/alerts")
@@ -0,0 +1,84 @@
+from itertools import islice
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from application.api.schemas.alerts import (
+    AlertCreateSchema,
+    AlertRuleListSchema,
+    AlertRuleSchema,
+)
+from application.depends.provider import get_alert_engine
+from core.exceptions import AlertError, AlertNotFoundError
+from core.services.alert_engine import AlertEngine
+
+router = APIRouter()
+
+
+def _engine(
+    engine: Optional[AlertEngine] = Depends(get_alert_engine),  # noqa: UP007
+) -> AlertEngine:
+    """Правила живут в процессе с планировщиком; в воркерах API их нет"""
+    if engine is None:
+        raise HTTPException(status_code=503, detail="Alerts are not available")
+    return engine
+
+
+@router.post(
+    "",
+    status_code=201,
+    responses={
+        201: {"model": AlertRuleSchema},
+    },
+)
+async def create_alert(schema: AlertCreateSchema, engine: AlertEngine = Depends(_engine)):
+    """Оповестить, когда курс code пересечет threshold.
+
+    above — при росте до порога и выше, below — при падении до порога и
+    ниже, cross — в обе стороны. Срабатывания приходят событием `alerts`
+    в `/stream/sse` и `/stream/ws`.
+    """
+    try:
+        rule = engine.add(schema.code, schema.threshold, schema.direction)
+    except AlertError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
+    return AlertRuleSchema(**rule.to_dict())
+
+
+@router.get(
+    "",
+    responses={
+        200: {"model": AlertRuleListSchema},
+    },
+)
+async def list_alerts(
+    code: Optional[str] = Query(None),  # noqa: UP007
+    limit: int = Query(1000, ge=1, le=100_000),
+    engine: AlertEngine = Depends(_engine),
+):
+    rules = islice(engine.iter_rules(code), limit)
+    return AlertRuleListSchema(
+        items=[AlertRuleSchema(**rule.to_dict()) for rule in rules]
+    )
+
+
+@router.get(
+    "/{alert_id}",
+    responses={
+        200: {"model": AlertRuleSchema},
+    },
+)
+async def get_alert(alert_id: int, engine: AlertEngine = Depends(_engine)):
+    try:
+        return AlertRuleSchema(**engine.get(alert_id).to_dict())
+    except AlertNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
+@router.delete("/{alert_id}", status_code=204)
+async def delete_alert(alert_id: int, engine: AlertEngine = Depends(_engine)):
+    try:
+        engine.remove(alert_id)
+    except AlertNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    return Response(status_code=204)
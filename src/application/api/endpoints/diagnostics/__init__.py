@@ -0,0 +1,11 @@
+from fastapi import APIRouter
+
+from . import diagnostics, profiling
+
+router = APIRouter(
+    prefix="/diagnostics",
+    tags=["Diagnostics v1"],
+)
+
+router.include_router(diagnostics.router)
+router.include_router(profiling.router)
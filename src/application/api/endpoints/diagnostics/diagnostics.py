@@ -0,0 +1,31 @@
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from application.api.admin import require_admin_token
+from shared.tracing import recorder
+
+
+# Span'ы содержат пути и id запросов — только по X-Admin-Token
+router = APIRouter(dependencies=[Depends(require_admin_token)])
+
+logger = logging.getLogger(__name__)
+
+
+@router.get("/spans")
+async def get_spans(
+    limit: int = Query(200, ge=1, le=10_000),
+    trace_id: Optional[str] = Query(None),  # noqa: UP007
+):
+    """Последние span'ы из кольцевого буфера (фильтр по trace_id = X-Request-ID)"""
+    return {
+        "enabled": recorder.enabled,
+        "spans": [s.to_dict() for s in recorder.spans(limit=limit, trace_id=trace_id)],
+    }
+
+
+@router.get("/spans/summary")
+async def get_spans_summary():
+    """Перцентили длительности по именам span'ов"""
+    return recorder.summary()
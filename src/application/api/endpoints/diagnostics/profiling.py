@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import threading
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from application.api.admin import require_admin_token
+from shared.profiling import (
+    ProfilerBusyError,
+    allocation_profiler,
+    sampling_profiler,
+)
+
+
+router = APIRouter(prefix="/profile", dependencies=[Depends(require_admin_token)])
+
+logger = logging.getLogger(__name__)
+
+
+@router.post("/cpu", response_class=PlainTextResponse)
+async def profile_cpu(
+    seconds: float = Query(5.0, gt=0, le=60),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+):
+    """Сэмплирует стек event loop seconds секунд, отдает collapsed stacks"""
+    loop_thread_id = threading.get_ident()
+    logger.info("CPU profiling started for %.1fs", seconds)
+    try:
+        samples = await asyncio.to_thread(
+            sampling_profiler.run, loop_thread_id, seconds, interval_ms / 1000
+        )
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
+    return PlainTextResponse(sampling_profiler.format_collapsed(samples))
+
+
+@router.post("/memory/start")
+async def start_memory_profiling(frames: int = Query(1, ge=1, le=64)):
+    """Включает tracemalloc и запоминает базовый снимок"""
+    # Снимок и перепись объектов обходят всю кучу — не в event loop
+    await asyncio.to_thread(allocation_profiler.start, frames)
+    logger.info("tracemalloc started with %s frames", frames)
+    return {"tracing": True}
+
+
+@router.get("/memory/snapshot")
+async def memory_snapshot(limit: int = Query(20, ge=1, le=500)):
+    """Топ аллокаций, разница с предыдущим снимком и перепись DTO по типам"""
+    try:
+        return await asyncio.to_thread(allocation_profiler.snapshot, limit)
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e)) from e
+
+
+@router.post("/memory/stop")
+async def stop_memory_profiling():
+    """Выключает tracemalloc и освобождает снимки"""
+    await asyncio.to_thread(allocation_profiler.stop)
+    logger.info("tracemalloc stopped")
+    return {"tracing": False}
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from . import export
+
+router = APIRouter(
+    prefix="/export",
+    tags=["Export v1"],
+)
+
+router.include_router(export.router)
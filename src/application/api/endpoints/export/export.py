@@ -0,0 +1,88 @@
+from collections.abc import Iterable, Sequence
+from datetime import UTC, datetime
+from typing import Any, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from application.depends.provider import get_rates_history, get_repo
+from application.settings import get_settings
+from core.exceptions import CurrencyNotFoundError
+from core.interface.portfolio import IPortfolio
+from core.services.rates_history import RatesHistory
+from shared.export import CSV, MEDIA_TYPES, encode_rows
+
+router = APIRouter()
+
+Format = Literal["ndjson", "csv"]
+
+
+def _export(
+    name: str, rows: Iterable[Sequence[Any]], fields: Sequence[str], fmt: str
+) -> StreamingResponse:
+    headers = {"Cache-Control": "no-store"}
+    if fmt == CSV:
+        headers["Content-Disposition"] = f'attachment; filename="{name}.csv"'
+    return StreamingResponse(
+        encode_rows(rows, fields, fmt, chunk_rows=get_settings().EXPORT_CHUNK_ROWS),
+        media_type=MEDIA_TYPES[fmt],
+        headers=headers,
+    )
+
+
+@router.get("/holdings")
+async def export_holdings(
+    fmt: Format = Query("ndjson", alias="format"),
+    repo: IPortfolio = Depends(get_repo),
+):
+    """Количество каждой валюты: code, amount"""
+    return _export("holdings", repo.iter_amounts(), ("code", "amount"), fmt)
+
+
+@router.get("/rates")
+async def export_rates(
+    fmt: Format = Query("ndjson", alias="format"),
+    base: Optional[str] = Query(  # noqa: UP007
+        None, description="По умолчанию BASE_CURRENCY"
+    ),
+    repo: IPortfolio = Depends(get_repo),
+):
+    """Текущие курсы к base: code, value"""
+    try:
+        rates = repo.iter_rates(base)
+    except CurrencyNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+    return _export("rates", rates, ("code", "value"), fmt)
+
+
+@router.get("/history")
+async def export_history(
+    fmt: Format = Query("ndjson", alias="format"),
+    since: Optional[datetime] = Query(None, description="ISO 8601"),  # noqa: UP007
+    codes: Optional[list[str]] = Query(None, description="USD,EUR"),  # noqa: UP007
+    history: Optional[RatesHistory] = Depends(get_rates_history),  # noqa: UP007
+):
+    """История курсов: timestamp (ISO 8601, UTC), code, value.
+
+    История хранится в памяти процесса с планировщиком; в воркерах API
+    выгрузка пустая.
+    """
+    wanted = (
+        {code.strip().upper() for chunk in codes for code in chunk.split(",")}
+        if codes
+        else None
+    )
+    if since is not None and since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    records = (
+        history.iter_records(
+            since=since.timestamp() if since is not None else None, codes=wanted
+        )
+        if history is not None
+        else iter(())
+    )
+    rows = (
+        (datetime.fromtimestamp(ts, UTC).isoformat(), code, value)
+        for ts, code, value in records
+    )
+    return _export("history", rows, ("timestamp", "code", "value"), fmt)
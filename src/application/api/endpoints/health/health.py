@@ -1,4 +1,5 @@
 import logging
+import time
 from fastapi import APIRouter, Depends, HTTPException, status
 
 from application.depends.provider import get_repo
@@ -14,19 +15,25 @@ logger = logging.getLogger(__name__)
 async def health_check(repo: IPortfolio = Depends(get_repo)):
     """Проверка работоспособности сервиса и подключения к репозиторию"""
     try:
-        # Проверяем базовую операцию чтения
-        test_currency = "USD"
-        rate = repo.get_rate(test_currency)
-
         # Проверяем операцию получения списка валют
         currencies = repo.currencies
 
+        # Проверяем базовую операцию чтения: курс любой валюты, кроме базовой
+        test_currency = next(
+            (c.code for c in currencies.items if c.code != repo.base_currency), "USD"
+        )
+        rate = repo.get_rate(test_currency)
+        updated_at = repo.rates_updated_at
+
         return {
             "status": "OK",
             "details": {
                 "repository": str(type(repo).__name__),
                 "available_currencies": [c.code for c in currencies.items],
                 "test_rate": {"currency": test_currency, "rate": rate.value},
+                "rates_age_seconds": (
+                    round(time.time() - updated_at, 1) if updated_at is not None else None
+                ),
             },
         }
     except Exception as e:
@@ -0,0 +1,9 @@
+from fastapi import APIRouter
+
+from . import metrics
+
+router = APIRouter(
+    tags=["Metrics v1"],
+)
+
+router.include_router(metrics.router)
@@ -1,19 +1,48 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from pydantic import BaseModel, ValidationError
 
+from application.api.cache import is_not_modified, not_modified, set_rates_cache_headers
+from application.api.encoding import negotiated
+from application.api.etag import parse_if_match, set_etag
 from application.api.schemas.portfolio import (
     AmountCurrencyListSchema,
+    BatchRatesSchema,
+    BulkConversionSchema,
+    ConvertedAmountsSchema,
+    CurrencyAmountSchema,
     CurrencyValueSchema,
+    IngestReportSchema,
     SummaryCurrencySchema,
     UpdatedAmountCurrencyListSchema,
+    UpdatedCurrencyAmountSchema,
 )
-from application.depends.provider import get_repo
-from core.dto.currency_dto import AmountCurrencyListDTO, UpdateCurrencyAmountListDTO
-from core.exceptions import CurrencyNotFoundError, PortfolioError
+from application.depends.provider import (
+    get_is_api_worker,
+    get_notifier,
+    get_repo,
+    get_scheduler,
+)
+from application.settings import get_settings
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    BulkConversionDTO,
+    CurrencyAmountDTO,
+    UpdateCurrencyAmountDTO,
+    UpdateCurrencyAmountListDTO,
+)
+from core.exceptions import CurrencyNotFoundError, PortfolioError, VersionConflictError
 from core.interface.portfolio import IPortfolio
+from core.interface.scheduler import IScheduler
+from shared.ndjson import iter_lines
+from core.services.portfolio_notifier import PortfolioNotifier
 from core.usecases import (
+    convert_bulk_usecase,
     get_currency_usecase,
     get_full_amount_usecase,
+    get_rates_usecase,
+    ingest_amounts_usecase,
     modify_amount_usecase,
     set_amount_usecase,
 )
@@ -22,6 +51,34 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+_BASE_DESCRIPTION = "Валюта, к которой отдаются курсы (по умолчанию BASE_CURRENCY)"
+
+
+def _rates_response(
+    schema: BaseModel,
+    response: Response,
+    repo: IPortfolio,
+    scheduler: Optional[IScheduler],  # noqa: UP007
+    accept: Optional[str],  # noqa: UP007
+    if_modified_since: Optional[str],  # noqa: UP007
+):
+    """Ответ с курсами: кэшируется до следующего тика планировщика"""
+    updated_at = repo.rates_updated_at
+    next_run_in = scheduler.next_run_in() if scheduler is not None else None
+    set_rates_cache_headers(response, updated_at, next_run_in)
+    if is_not_modified(if_modified_since, updated_at):
+        response.headers["Vary"] = "Accept"
+        return not_modified(response)
+    return negotiated(schema, accept, response)
+
+
+def _require_writable(is_api_worker: bool = Depends(get_is_api_worker)) -> None:
+    """Суммы в воркерах API у каждого процесса свои: изменения не принимаем"""
+    if is_api_worker:
+        raise HTTPException(
+            status_code=503, detail="Amounts are read-only with API_WORKERS > 1"
+        )
+
 
 @router.get(
     "/{currency}",
@@ -31,15 +88,88 @@ router = APIRouter()
 )
 async def get_currency(
     currency: str,
+    response: Response,
+    base: Optional[str] = Query(None, description=_BASE_DESCRIPTION),  # noqa: UP007
     repo: IPortfolio = Depends(get_repo),
+    scheduler: Optional[IScheduler] = Depends(get_scheduler),  # noqa: UP007
+    accept: Optional[str] = Header(None),  # noqa: UP007
+    if_modified_since: Optional[str] = Header(None),  # noqa: UP007
 ):
     try:
         uc = get_currency_usecase.Usecase(repo=repo)
-        res = await uc(currency)
+        res = await uc(currency, base=base)
         response_schema = CurrencyValueSchema(**res.to_dict())
-        return response_schema
+        return _rates_response(
+            response_schema, response, repo, scheduler, accept, if_modified_since
+        )
+    except CurrencyNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
+@router.get(
+    "/rates/batch",
+    responses={
+        200: {"model": BatchRatesSchema},
+    },
+)
+async def get_rates_batch(
+    response: Response,
+    codes: list[str] = Query(..., description="USD,EUR или ?codes=USD&codes=EUR"),
+    matrix: bool = Query(False, description="Вернуть матрицу кросс-курсов"),
+    base: Optional[str] = Query(None, description=_BASE_DESCRIPTION),  # noqa: UP007
+    repo: IPortfolio = Depends(get_repo),
+    scheduler: Optional[IScheduler] = Depends(get_scheduler),  # noqa: UP007
+    accept: Optional[str] = Header(None),  # noqa: UP007
+    if_modified_since: Optional[str] = Header(None),  # noqa: UP007
+):
+    currencies = list(
+        dict.fromkeys(
+            code.strip().upper()
+            for chunk in codes
+            for code in chunk.split(",")
+            if code.strip()
+        )
+    )
+    try:
+        uc = get_rates_usecase.Usecase(repo=repo)
+        res = await uc(currencies, with_matrix=matrix, base=base)
+        response_schema = BatchRatesSchema(**res.to_dict())
+        return _rates_response(
+            response_schema, response, repo, scheduler, accept, if_modified_since
+        )
+    except CurrencyNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e)) from e
+
+
+@router.post(
+    "/convert/bulk",
+    responses={
+        200: {"model": ConvertedAmountsSchema},
+    },
+)
+async def convert_bulk(
+    schema: BulkConversionSchema,
+    response: Response,
+    repo: IPortfolio = Depends(get_repo),
+    accept: Optional[str] = Header(None),  # noqa: UP007
+):
+    max_rows = get_settings().BULK_CONVERT_MAX_ROWS
+    if schema.size > max_rows:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many rows: {schema.size} > {max_rows}",
+        )
+    try:
+        uc = convert_bulk_usecase.Usecase(repo=repo)
+        dto = BulkConversionDTO.from_dict(schema.to_columns())
+        res = await uc(dto=dto)
+        # Без to_dict(): asdict поэлементно копирует колонку
+        response_schema = ConvertedAmountsSchema(amounts=res.amounts)
+        return negotiated(response_schema, accept, response)
     except CurrencyNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
+    except PortfolioError as e:
+        raise HTTPException(status_code=422, detail=str(e)) from e
 
 
 @router.get(
@@ -48,58 +178,124 @@ async def get_currency(
         200: {"model": SummaryCurrencySchema},
     },
 )
-async def get_full_amount(repo: IPortfolio = Depends(get_repo)):
+async def get_full_amount(
+    response: Response,
+    base: Optional[str] = Query(None, description=_BASE_DESCRIPTION),  # noqa: UP007
+    repo: IPortfolio = Depends(get_repo),
+    accept: Optional[str] = Header(None),  # noqa: UP007
+):
     try:
         uc = get_full_amount_usecase.Usecase(repo=repo)
-        res = await uc()
+        res = await uc(in_currency=base)
+        set_etag(response, repo.amount_version)
         response_schema = SummaryCurrencySchema(**res.to_dict())
-        return response_schema
+        return negotiated(response_schema, accept, response)
     except PortfolioError as e:
         raise HTTPException(status_code=404, detail=str(e)) from e
 
 
 @router.post(
     "/amount/set",
+    dependencies=[Depends(_require_writable)],
     responses={
         200: {"model": AmountCurrencyListSchema},
     },
 )
 async def set_amount(
     schema: AmountCurrencyListSchema,
+    response: Response,
     repo: IPortfolio = Depends(get_repo),
+    if_match: Optional[str] = Header(None),  # noqa: UP007
+    notifier: Optional[PortfolioNotifier] = Depends(get_notifier),  # noqa: UP007
 ):
     try:
         uc = set_amount_usecase.Usecase(repo=repo)
-        print(schema)
         data = schema.model_dump()
-        print(data)
         dto = AmountCurrencyListDTO.from_dict(data)
-        print(dto)
-        res = await uc(dto=dto)
+        expected_version = parse_if_match(if_match, repo.amount_version)
+        res = await uc(dto=dto, expected_version=expected_version)
+        set_etag(response, repo.amount_version)
+        if notifier is not None:
+            notifier.notify_amounts_changed()
         response_schema = AmountCurrencyListSchema(**res.to_dict())
         return response_schema
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e)) from e
     except PortfolioError as e:
         raise HTTPException(status_code=422, detail=str(e)) from e
 
 
 @router.put(
     "/amount/modify",
+    dependencies=[Depends(_require_writable)],
     responses={
         200: {"model": AmountCurrencyListSchema},
     },
 )
 async def modify(
     schema: UpdatedAmountCurrencyListSchema,
+    response: Response,
     repo: IPortfolio = Depends(get_repo),
+    if_match: Optional[str] = Header(None),  # noqa: UP007
+    notifier: Optional[PortfolioNotifier] = Depends(get_notifier),  # noqa: UP007
 ):
     try:
         uc = modify_amount_usecase.Usecase(repo=repo)
         data = schema.model_dump()
-        print(data)
         dto = UpdateCurrencyAmountListDTO.from_dict(data)
-        print(dto)
-        res = await uc(dto=dto)
+        expected_version = parse_if_match(if_match, repo.amount_version)
+        res = await uc(dto=dto, expected_version=expected_version)
+        set_etag(response, repo.amount_version)
+        if notifier is not None:
+            notifier.notify_amounts_changed()
         response_schema = AmountCurrencyListSchema(**res.to_dict())
         return response_schema
+    except VersionConflictError as e:
+        raise HTTPException(status_code=412, detail=str(e)) from e
     except PortfolioError as e:
         raise HTTPException(status_code=422, detail=str(e)) from e
+
+
+@router.post(
+    "/amount/ingest",
+    dependencies=[Depends(_require_writable)],
+    responses={
+        200: {"model": IngestReportSchema},
+    },
+)
+async def ingest_amounts(
+    request: Request,
+    mode: Literal["set", "modify"] = Query("set", description="Установить или изменить"),
+    chunk_size: Optional[int] = Query(None, ge=1, le=100_000),  # noqa: UP007
+    repo: IPortfolio = Depends(get_repo),
+    notifier: Optional[PortfolioNotifier] = Depends(get_notifier),  # noqa: UP007
+):
+    """NDJSON: {"code": "USD", "amount": 10} (set) или {"code": "USD", "delta": -1}
+
+    Тело читается построчно и применяется порциями, каждая порция атомарна.
+    """
+    if mode == ingest_amounts_usecase.MODE_SET:
+        schema, dto_type = CurrencyAmountSchema, CurrencyAmountDTO
+    else:
+        schema, dto_type = UpdatedCurrencyAmountSchema, UpdateCurrencyAmountDTO
+
+    def parse(raw: bytes):
+        try:
+            item = schema.model_validate_json(raw)
+        except ValidationError as e:
+            detail = "; ".join(
+                f"{'.'.join(map(str, err['loc'])) or 'line'}: {err['msg']}"
+                for err in e.errors()
+            )
+            raise ValueError(detail) from e
+        return dto_type(**item.model_dump())
+
+    settings = get_settings()
+    uc = ingest_amounts_usecase.Usecase(
+        repo=repo, chunk_size=chunk_size or settings.INGEST_CHUNK_SIZE
+    )
+    lines = iter_lines(request.stream(), settings.INGEST_MAX_LINE_BYTES)
+    res = await uc(lines, parse, mode=mode)
+    if res.applied and notifier is not None:
+        notifier.notify_amounts_changed()
+    return IngestReportSchema(**res.to_dict())
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+
+from . import stream
+
+router = APIRouter(
+    prefix="/stream",
+    tags=["Stream v1"],
+)
+
+router.include_router(stream.router)
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from fastapi.responses import StreamingResponse
+
+from application.depends.provider import get_event_hub, get_is_api_worker
+from application.settings import get_settings
+from core.events.hub import Event, EventHub
+
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+# В воркерах API нет планировщика и уведомлений: поток событий был бы пустым
+_NO_EVENTS_DETAIL = "Event stream is not available with API_WORKERS > 1"
+# Try Again Later (RFC 6455)
+_WS_TRY_AGAIN_LATER = 1013
+
+
+def _format_sse(event: Event) -> str:
+    return f"id: {event.seq}\nevent: {event.topic}\ndata: {event.data}\n\n"
+
+
+def _format_ws(event: Event) -> str:
+    # event.data уже JSON — вставляем без повторной сериализации
+    return f'{{"seq":{event.seq},"topic":"{event.topic}","data":{event.data}}}'
+
+
+async def _sse_events(request: Request, hub: EventHub) -> AsyncIterator[str]:
+    keepalive = get_settings().STREAM_KEEPALIVE
+    subscription = hub.subscribe()
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=keepalive)
+            except TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keepalive\n\n"
+                continue
+            yield _format_sse(event)
+    finally:
+        hub.unsubscribe(subscription)
+
+
+@router.get("/sse")
+async def stream_sse(
+    request: Request,
+    hub: EventHub = Depends(get_event_hub),
+    is_api_worker: bool = Depends(get_is_api_worker),
+):
+    """Server-Sent Events: курсы (event: rates) и итог портфеля (event: total)"""
+    if is_api_worker:
+        raise HTTPException(status_code=503, detail=_NO_EVENTS_DETAIL)
+    return StreamingResponse(
+        _sse_events(request, hub),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def stream_ws(
+    websocket: WebSocket,
+    hub: EventHub = Depends(get_event_hub),
+    is_api_worker: bool = Depends(get_is_api_worker),
+):
+    """Те же события, что и /sse, в виде JSON-сообщений WebSocket"""
+    if is_api_worker:
+        await websocket.close(code=_WS_TRY_AGAIN_LATER, reason=_NO_EVENTS_DETAIL)
+        return
+    await websocket.accept()
+    subscription = hub.subscribe()
+    # Читаем входящие кадры только чтобы вовремя заметить закрытие соединения
+    receiver = asyncio.create_task(websocket.receive())
+    try:
+        while True:
+            getter = asyncio.create_task(subscription.get())
+            done, _ = await asyncio.wait(
+                [getter, receiver], return_when=asyncio.FIRST_COMPLETED
+            )
+            if getter in done:
+                await websocket.send_text(_format_ws(getter.result()))
+            else:
+                getter.cancel()
+            if receiver in done:
+                if receiver.result()["type"] == "websocket.disconnect":
+                    break
+                receiver = asyncio.create_task(websocket.receive())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        hub.unsubscribe(subscription)
@@ -0,0 +1,58 @@
+import re
+from typing import Optional
+
+from application.middleware.compression import ETAG_SUFFIXES
+from fastapi import HTTPException, Response
+
+
+# entity-tag из списка If-Match: [W/]"etagc*", разделитель — запятая (RFC 9110)
+_ENTITY_TAG = re.compile(r'\s*(W/)?"([\x21\x23-\x7e]*)"\s*(?:,|$)')
+
+
+def format_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def set_etag(response: Response, version: int) -> None:
+    response.headers["ETag"] = format_etag(version)
+
+
+def _strip_encoding(tag: str) -> str:
+    for suffix in ETAG_SUFFIXES.values():
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)]
+    return tag
+
+
+def parse_if_match(
+    value: Optional[str], current_version: int  # noqa: UP007
+) -> Optional[int]:  # noqa: UP007
+    """Версия для проверки If-Match; None — условие не задано или '*'.
+
+    If-Match сравнивается строго: слабые W/"..." не совпадают ни с чем. ETag
+    сжатого ответа ("5-gzip") указывает на ту же версию. Если в списке есть
+    текущая версия, она и возвращается (repo еще раз сверит ее при записи),
+    иначе — 412.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if value == "*":
+        return None
+    tags = []
+    pos = 0
+    while pos < len(value) or not pos:
+        match = _ENTITY_TAG.match(value, pos)
+        if match is None or match.end() == pos:
+            raise HTTPException(
+                status_code=400, detail=f"Malformed If-Match header: {value}"
+            )
+        if match.group(1) is None:
+            tags.append(_strip_encoding(match.group(2)))
+        pos = match.end()
+    if str(current_version) not in tags:
+        raise HTTPException(
+            status_code=412,
+            detail=f"Portfolio version is {format_etag(current_version)}",
+        )
+    return current_version
@@ -1,12 +1,23 @@
+from importlib import import_module
+
 from fastapi import FastAPI
-from application.api.endpoints.portfolio import portfolio
-from src.application.api.endpoints import health
 
 
-routes = [portfolio.router, health.router]
+# Модули роутеров импортируются при регистрации, а не при импорте этого модуля.
+# metrics и alerts идут раньше portfolio: иначе /metrics и /alerts перехватит
+# маршрут /{currency}
+ROUTER_MODULES = (
+    "application.api.endpoints.metrics",
+    "application.api.endpoints.alerts",
+    "application.api.endpoints.portfolio.portfolio",
+    "application.api.endpoints.health",
+    "application.api.endpoints.stream",
+    "application.api.endpoints.export",
+    "application.api.endpoints.diagnostics",
+)
 
 
 def register_api_routes(app: FastAPI, prefix: str):
-    for route in routes:
-        app.include_router(route, prefix=prefix)
+    for module in ROUTER_MODULES:
+        app.include_router(import_module(module).router, prefix=prefix)
     return app.routes
@@ -0,0 +1,21 @@
+from collections.abc import Sequence
+from typing import Literal
+
+from pydantic import BaseModel, Field
+
+
+class AlertCreateSchema(BaseModel):
+    code: str
+    threshold: float = Field(..., gt=0, description="Курс к BASE_CURRENCY")
+    direction: Literal["above", "below", "cross"] = "cross"
+
+
+class AlertRuleSchema(BaseModel):
+    id: int
+    code: str
+    threshold: float
+    direction: str
+
+
+class AlertRuleListSchema(BaseModel):
+    items: Sequence[AlertRuleSchema]
@@ -1,5 +1,6 @@
 from collections.abc import Sequence
-from pydantic import BaseModel
+from typing import Optional
+from pydantic import BaseModel, model_validator
 
 
 class CurrencySchema(BaseModel):
@@ -38,3 +39,80 @@ class SummaryCurrencySchema(BaseModel):
     amounts: AmountCurrencyListSchema
     rates: CurrencyValueListSchema
     total: TotalCurrencySchema
+
+
+class ConversionMatrixSchema(BaseModel):
+    codes: Sequence[str]
+    matrix: Sequence[Sequence[float]]
+
+
+class BatchRatesSchema(BaseModel):
+    rates: CurrencyValueListSchema
+    matrix: Optional[ConversionMatrixSchema] = None  # noqa: UP007
+    base: Optional[str] = None  # noqa: UP007
+
+
+class BulkConversionSchema(BaseModel):
+    """Строки [[amount, from, to], ...] или колонки amounts/from_codes/to_codes"""
+
+    rows: Optional[list[tuple[float, str, str]]] = None  # noqa: UP007
+    amounts: Optional[list[float]] = None  # noqa: UP007
+    from_codes: Optional[list[str]] = None  # noqa: UP007
+    to_codes: Optional[list[str]] = None  # noqa: UP007
+
+    @model_validator(mode="after")
+    def check_layout(self) -> "BulkConversionSchema":
+        columns = (self.amounts, self.from_codes, self.to_codes)
+        if self.rows is not None:
+            if any(column is not None for column in columns):
+                raise ValueError("Pass either rows or amounts/from_codes/to_codes")
+        elif any(column is None for column in columns):
+            raise ValueError("amounts, from_codes and to_codes are required together")
+        elif not len(self.amounts) == len(self.from_codes) == len(self.to_codes):
+            raise ValueError("amounts, from_codes and to_codes must have equal length")
+        return self
+
+    def to_columns(self) -> dict[str, list]:
+        if self.rows is not None:
+            amounts, from_codes, to_codes = (
+                map(list, zip(*self.rows, strict=True)) if self.rows else ([], [], [])
+            )
+        else:
+            amounts, from_codes, to_codes = self.amounts, self.from_codes, self.to_codes
+        return {
+            "amounts": amounts,
+            "from_codes": [code.upper() for code in from_codes],
+            "to_codes": [code.upper() for code in to_codes],
+        }
+
+    @property
+    def size(self) -> int:
+        return len(self.rows) if self.rows is not None else len(self.amounts or [])
+
+
+class ConvertedAmountsSchema(BaseModel):
+    amounts: Sequence[float]
+
+
+class IngestLineErrorSchema(BaseModel):
+    line: int
+    error: str
+
+
+class IngestChunkResultSchema(BaseModel):
+    chunk: int
+    first_line: int
+    last_line: int
+    applied: int
+    failed: int
+    version: int
+    error: Optional[str] = None  # noqa: UP007
+    line_errors: Sequence[IngestLineErrorSchema] = ()
+
+
+class IngestReportSchema(BaseModel):
+    chunks: Sequence[IngestChunkResultSchema]
+    lines: int
+    applied: int
+    failed: int
+    version: int
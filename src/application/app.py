@@ -2,15 +2,22 @@ import logging
 from fastapi import FastAPI
 
 from application.api.register_api import register_api_routes
-from src.application.settings import settings
-from src.application.logger_settings import logging_setup
+from application.middleware.admission import AdmissionMiddleware
+from application.middleware.compression import CompressionMiddleware
+from application.middleware.metrics import MetricsMiddleware
+from application.middleware.request_id import RequestIdMiddleware
+from shared.tracing import recorder
+from application.settings import get_settings
+from application.logger_settings import logging_setup
 
 
 logger = logging.getLogger(__name__)
 
 
 def create_app():
+    settings = get_settings()
     logging_setup(settings=settings)
+    recorder.configure(size=settings.TRACE_BUFFER_SIZE, enabled=settings.TRACING_ENABLED)
     logger.info(f"Init app with ENV={settings.PROJ_ENV}")
     app = FastAPI(
         title=settings.TITLE,
@@ -21,7 +28,30 @@ def create_app():
     )
 
     # middleware
-    # TODO
+    if settings.COMPRESSION_MIN_SIZE > 0:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MIN_SIZE,
+            gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        )
+    # health, метрики и потоки не ограничиваются: health должен отвечать под
+    # перегрузкой, а SSE/WebSocket держат соединение неограниченно долго
+    app.add_middleware(
+        AdmissionMiddleware,
+        rate=settings.RATE_LIMIT_RPS,
+        burst=settings.RATE_LIMIT_BURST,
+        write_cost=settings.RATE_LIMIT_WRITE_COST,
+        max_concurrency=settings.MAX_CONCURRENT_REQUESTS,
+        read_reserve=settings.ADMISSION_READ_RESERVE,
+        exempt_paths=tuple(
+            f"{settings.GLOBAL_PREFIX_URL}{path}"
+            for path in ("/health", "/metrics", "/stream")
+        ),
+        client_header=settings.RATE_LIMIT_CLIENT_HEADER,
+    )
+    app.add_middleware(MetricsMiddleware)
+    app.add_middleware(RequestIdMiddleware)
     # routes
     register_api_routes(
         app=app,
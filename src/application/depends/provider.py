@@ -1,7 +1,44 @@
+from typing import Optional
+
+from core.events.hub import EventHub
 from core.interface.portfolio import IPortfolio
+from core.interface.scheduler import IScheduler
+from core.services.alert_engine import AlertEngine
+from core.services.portfolio_notifier import PortfolioNotifier
+from core.services.rates_history import RatesHistory
 from application.state import app_state
 
 
 def get_repo() -> IPortfolio:
     """Dependency для получения репозитория"""
     return app_state.get_repo()
+
+
+def get_event_hub() -> EventHub:
+    """Dependency для получения шины событий"""
+    return app_state.event_hub
+
+
+def get_notifier() -> Optional[PortfolioNotifier]:  # noqa: UP007
+    """Dependency для уведомлений об изменении портфеля (может отсутствовать)"""
+    return app_state.notifier
+
+
+def get_scheduler() -> Optional[IScheduler]:  # noqa: UP007
+    """Dependency планировщика обновления курсов (нет в воркерах API)"""
+    return app_state.scheduler
+
+
+def get_rates_history() -> Optional[RatesHistory]:  # noqa: UP007
+    """Dependency истории курсов (есть только в процессе с планировщиком)"""
+    return app_state.rates_history
+
+
+def get_alert_engine() -> Optional[AlertEngine]:  # noqa: UP007
+    """Dependency оповещений о курсах (есть только в процессе с планировщиком)"""
+    return app_state.alert_engine
+
+
+def get_is_api_worker() -> bool:
+    """Dependency режима воркера API: суммы только для чтения, событий нет"""
+    return app_state.is_api_worker
@@ -1,8 +1,12 @@
+import atexit
 import os
 import logging
 import logging.handlers
+import queue
 import sys
+import time
 from pathlib import Path
+from typing import Optional
 
 from application.settings import Base
 from shared.logutils import CtxVarEnum
@@ -20,9 +24,13 @@ logging.setLogRecordFactory(CustomLogRecord)
 
 
 class ExtraCtxFilter(logging.Filter):
-    """Фильтр для добавления контекстных переменных в логи."""
+    """Фильтр для добавления контекстных переменных в логи.
 
-    CTX_VARIABLES_LIST = [var.value for var in list(CtxVarEnum)]
+    Вешается на QueueHandler: контекст читается один раз на запись и в потоке,
+    где запись создана (contextvars в потоке QueueListener уже не те).
+    """
+
+    CTX_VARIABLES_LIST = tuple(var.value for var in list(CtxVarEnum))
 
     def filter(self, record: CustomLogRecord) -> CustomLogRecord:
         extra_ctx_msg_lst = []
@@ -37,6 +45,50 @@ class ExtraCtxFilter(logging.Filter):
         return record
 
 
+class RateLimitFilter(logging.Filter):
+    """Ограничивает частоту одинаковых сообщений уровня INFO и ниже.
+
+    Ключ — место вызова (name, lineno), поэтому f-строки тоже группируются.
+    В окне window секунд пропускается не больше burst записей, остальные
+    отбрасываются, а их число дописывается к первому сообщению следующего окна.
+    WARNING и выше не ограничиваются.
+    """
+
+    def __init__(self, burst: int, window: float) -> None:
+        super().__init__()
+        self._burst = burst
+        self._window = window
+        self._state: dict[tuple, list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        now = time.monotonic()
+        key = (record.name, record.lineno)
+        state = self._state.get(key)
+        if state is None or now - state[0] >= self._window:
+            suppressed = state[2] if state else 0
+            self._state[key] = [now, 1, 0]
+            if suppressed:
+                record.msg = f"{record.msg} [suppressed {suppressed} similar]"
+            return True
+        if state[1] < self._burst:
+            state[1] += 1
+            return True
+        state[2] += 1
+        return False
+
+
+_listener: Optional[logging.handlers.QueueListener] = None  # noqa: UP007
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def _disable_loggers(*names: str) -> None:
     """Отключить ненужные логгеры"""
     for n in names:
@@ -54,15 +106,27 @@ def _set_lvl_loggers(level: int, *names: str) -> None:
 
 
 def logging_setup(settings: Base) -> None:
-    """Настройка логгирования для сервиса"""
+    """Настройка логгирования для сервиса.
+
+    Записи из event loop только кладутся в очередь (QueueHandler), а
+    форматирование и запись в stdout/файл выполняет поток QueueListener.
+    Повторный вызов только обновляет уровень корневого логгера.
+    """
+    global _listener
+
+    base_level = logging.DEBUG if settings.DEBUG else logging.INFO
+    if _listener is not None:
+        logging.getLogger().setLevel(base_level)
+        return
+
     format_date = "%d-%m-%Y %H:%M:%S"
     format_ctx_extended = "%(asctime)s - [%(levelname)s] - [%(extra_message)s] - %(name)s(%(lineno)d): %(message)s"  # noqa: E501
 
-    base_level = logging.DEBUG if settings.DEBUG else logging.INFO
+    formatter = logging.Formatter(fmt=format_ctx_extended, datefmt=format_date)
 
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.DEBUG)
-    console_handler.addFilter(ExtraCtxFilter())
+    console_handler.setFormatter(formatter)
 
     handlers = [
         console_handler,
@@ -78,14 +142,33 @@ def logging_setup(settings: Base) -> None:
             filename=log_file_path,
             encoding="utf-8",
         )
-        file_handler.addFilter(ExtraCtxFilter())
+        file_handler.setFormatter(formatter)
         handlers.append(file_handler)
 
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # prepare() только подставляет args в сообщение, полный формат — в listener
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    # Сначала ограничение частоты: контекст собирается только для записей,
+    # которые дойдут до listener
+    queue_handler.addFilter(
+        RateLimitFilter(
+            burst=settings.LOG_RATE_LIMIT_BURST,
+            window=settings.LOG_RATE_LIMIT_WINDOW,
+        )
+    )
+    queue_handler.addFilter(ExtraCtxFilter())
+
+    _listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(_stop_listener)
+
     logging.basicConfig(
-        format=format_ctx_extended,
-        datefmt=format_date,
         level=base_level,
-        handlers=handlers,
+        handlers=[queue_handler],
+        force=True,
     )
 
     info_level_loggers = [
@@ -0,0 +1,105 @@
+import math
+from collections.abc import Sequence
+from typing import Optional
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from shared.metrics import ADMISSION_REJECTED, HTTP_REQUESTS_IN_FLIGHT
+from shared.rate_limit import KeyedRateLimiter
+
+_READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+class AdmissionMiddleware:
+    """Допуск запросов: лимит на клиента и общий лимит одновременных запросов.
+
+    Пути из exempt_paths (health, метрики, долгоживущие потоки) проходят без
+    проверок — health-check отвечает и под перегрузкой. Чтения занимают любой
+    из max_concurrency слотов, записи — только пока свободно больше
+    read_reserve, поэтому при перегрузке первыми отклоняются записи.
+    Запись списывает write_cost токенов из корзины клиента, чтение — один.
+    Отказ быстрый и без очереди: 429 при исчерпании корзины, 503 при
+    занятых слотах, оба с Retry-After.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        rate: float = 0.0,
+        burst: float = 40.0,
+        write_cost: float = 5.0,
+        max_concurrency: int = 0,
+        read_reserve: int = 0,
+        exempt_paths: Sequence[str] = (),
+        client_header: Optional[str] = None,  # noqa: UP007
+        max_clients: int = 10_000,
+    ) -> None:
+        self.app = app
+        self.limiter = (
+            KeyedRateLimiter(rate, burst, max_keys=max_clients) if rate > 0 else None
+        )
+        self.write_cost = write_cost
+        self.max_concurrency = max_concurrency
+        self.read_reserve = min(read_reserve, max(max_concurrency - 1, 0))
+        self.exempt_paths = tuple(exempt_paths)
+        self.client_header = client_header.lower() if client_header else None
+        self.in_flight = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        is_read = scope["method"] in _READ_METHODS
+        kind = "read" if is_read else "write"
+
+        if self.limiter is not None:
+            cost = 1.0 if is_read else self.write_cost
+            wait = self.limiter.try_acquire(self._client_key(scope), cost)
+            if wait > 0:
+                ADMISSION_REJECTED.labels("rate_limited", kind).inc()
+                await self._reject(429, "Too many requests", wait, scope, receive, send)
+                return
+
+        if self.max_concurrency > 0:
+            limit = self.max_concurrency - (0 if is_read else self.read_reserve)
+            if self.in_flight >= limit:
+                ADMISSION_REJECTED.labels("overloaded", kind).inc()
+                await self._reject(503, "Server is busy", 1.0, scope, receive, send)
+                return
+
+        self.in_flight += 1
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+
+    def _client_key(self, scope: Scope) -> str:
+        if self.client_header is not None:
+            value = Headers(scope=scope).get(self.client_header)
+            if value:
+                # X-Forwarded-For: client, proxy1, proxy2
+                return value.split(",", 1)[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    async def _reject(
+        status_code: int,
+        detail: str,
+        retry_after: float,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+    ) -> None:
+        response = JSONResponse(
+            {"detail": detail},
+            status_code=status_code,
+            headers={"Retry-After": str(max(math.ceil(retry_after), 1))},
+        )
+        await response(scope, receive, send)
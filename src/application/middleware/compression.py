@@ -0,0 +1,176 @@
+import importlib.util
+import zlib
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+BROTLI_AVAILABLE = importlib.util.find_spec("brotli") is not None
+
+# Потоки событий сжимать нельзя: клиент должен получать каждое событие сразу
+_SKIP_CONTENT_TYPES = ("text/event-stream",)
+
+# Суффикс сильного ETag сжатого ответа: "5" -> "5-gzip" (как в mod_deflate)
+ETAG_SUFFIXES = {"gzip": "-gzip", "br": "-br"}
+
+
+def encode_etag(etag: str, encoding: str) -> str:
+    """ETag представления в кодировке encoding: байты другие, тег тоже.
+
+    Сильный "v" становится "v-gzip"; слабый W/"v" остается как есть — он и
+    так не обещает побайтового совпадения.
+    """
+    if etag.startswith("W/") or not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}{ETAG_SUFFIXES[encoding]}"'
+
+
+def parse_accept_encoding(value: str) -> dict[str, float]:
+    """{кодировка: q} из заголовка Accept-Encoding"""
+    result = {}
+    for part in value.split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        result[name.strip().lower()] = q
+    return result
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int) -> None:
+        self._brotli = encoding == "br"
+        if self._brotli:
+            import brotli
+
+            self._obj = brotli.Compressor(quality=brotli_quality)
+        else:
+            # wbits=31 — формат gzip (заголовок и CRC)
+            self._obj = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._obj.process(data) if self._brotli else self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        """Отдать все накопленное, не завершая поток (для стриминговых ответов)"""
+        return self._obj.flush() if self._brotli else self._obj.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._obj.finish() if self._brotli else self._obj.flush()
+
+
+class CompressionMiddleware:
+    """gzip/brotli для ответов от minimum_size байт.
+
+    brotli используется, если установлен пакет `brotli` и клиент его
+    принимает, иначе gzip. Ответ целиком сжимается, только если он не меньше
+    minimum_size; потоковые ответы сжимаются по частям (кроме
+    text/event-stream). Уже закодированные ответы не трогаются.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self._choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingSend(self, send, encoding)
+        await self.app(scope, receive, responder)
+
+    @staticmethod
+    def _choose_encoding(header: str) -> Optional[str]:  # noqa: UP007
+        accepted = parse_accept_encoding(header)
+        wildcard = accepted.get("*", 0.0)
+        if BROTLI_AVAILABLE and accepted.get("br", wildcard) > 0:
+            return "br"
+        if accepted.get("gzip", wildcard) > 0:
+            return "gzip"
+        return None
+
+
+class _CompressingSend:
+    def __init__(self, mw: CompressionMiddleware, send: Send, encoding: str) -> None:
+        self._mw = mw
+        self._send = send
+        self._encoding = encoding
+        self._start: Optional[Message] = None  # noqa: UP007
+        self._compressor: Optional[_Compressor] = None  # noqa: UP007
+        self._passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self._start is not None:
+            await self._first_body(message)
+            return
+
+        if self._passthrough:
+            await self._send(message)
+            return
+
+        body = self._compressor.compress(message.get("body", b""))
+        more_body = message.get("more_body", False)
+        body += self._compressor.flush() if more_body else self._compressor.finish()
+        await self._send({**message, "body": body})
+
+    async def _first_body(self, message: Message) -> None:
+        start = {**self._start, "headers": list(self._start.get("headers", []))}
+        self._start = None
+        headers = MutableHeaders(raw=start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        skip = (
+            "content-encoding" in headers
+            or headers.get("content-type", "").startswith(_SKIP_CONTENT_TYPES)
+            or (not more_body and len(body) < self._mw.minimum_size)
+        )
+        if skip:
+            self._passthrough = True
+            await self._send(start)
+            await self._send(message)
+            return
+
+        self._compressor = _Compressor(
+            self._encoding, self._mw.gzip_level, self._mw.brotli_quality
+        )
+        headers["Content-Encoding"] = self._encoding
+        headers.add_vary_header("Accept-Encoding")
+        if "etag" in headers:
+            headers["ETag"] = encode_etag(headers["etag"], self._encoding)
+        compressed = self._compressor.compress(body)
+        if more_body:
+            del headers["Content-Length"]
+            compressed += self._compressor.flush()
+        else:
+            compressed += self._compressor.finish()
+            headers["Content-Length"] = str(len(compressed))
+        await self._send(start)
+        await self._send({**message, "body": compressed})
@@ -0,0 +1,56 @@
+import re
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from shared.logutils import ctx_request_id
+from shared.tracing import new_trace_id, span
+
+REQUEST_ID_HEADER = "X-Request-ID"
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class RequestIdMiddleware:
+    """Назначает запросу id и открывает корневой span.
+
+    Входящий X-Request-ID используется, если он корректен, иначе генерируется
+    новый. Id кладется в ctx_request_id (попадает в логи через ExtraCtxFilter и
+    служит trace_id span'ов) и возвращается в заголовке ответа.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._incoming_id(scope) or new_trace_id()
+        header = (REQUEST_ID_HEADER.lower().encode(), request_id.encode())
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], header]
+            await send(message)
+
+        token = ctx_request_id.set(request_id)
+        try:
+            with span(
+                f"{scope['type']}.request",
+                method=scope.get("method", "WS"),
+                path=scope["path"],
+            ):
+                await self.app(scope, receive, send_with_id)
+        finally:
+            ctx_request_id.reset(token)
+
+    @staticmethod
+    def _incoming_id(scope: Scope) -> str:
+        name = REQUEST_ID_HEADER.lower().encode()
+        for key, value in scope.get("headers", []):
+            if key == name:
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    return candidate
+        return ""
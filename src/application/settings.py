@@ -1,5 +1,9 @@
 import os
+import tempfile
+from datetime import time
 from pathlib import Path
+from functools import lru_cache
+from typing import Any, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
@@ -13,10 +17,85 @@ class Base(BaseSettings):
     TITLE: str = "TOKEN AUTH APP"
     GLOBAL_PREFIX_URL: str
     LOG_DIR: str = "logs"
+    LOG_RATE_LIMIT_BURST: int = 20
+    LOG_RATE_LIMIT_WINDOW: float = 1.0
+    # Трассировка
+    TRACING_ENABLED: bool = True
+    TRACE_BUFFER_SIZE: int = 10_000
+    # Токен для админских endpoint'ов (профилирование); не задан — выключены
+    ADMIN_TOKEN: Optional[str] = None  # noqa: UP007
+    BULK_CONVERT_MAX_ROWS: int = 1_000_000
+    # Хранить количество валют в целых минорных единицах (точные суммы)
+    AMOUNT_MINOR_UNITS: bool = False
+    # Потоковая загрузка сумм (NDJSON): строк в порции и максимальная длина строки
+    INGEST_CHUNK_SIZE: int = 1000
+    INGEST_MAX_LINE_BYTES: int = 4096
+    # Выгрузка (NDJSON/CSV): строк в порции ответа; снимков в истории курсов
+    EXPORT_CHUNK_ROWS: int = 1000
+    RATES_HISTORY_SIZE: int = 1000
+    # Оповещения о пересечении курсом порога: максимум правил в процессе
+    ALERTS_MAX_RULES: int = 1_000_000
+    # Webhook: JSON-список url (пусто — выключено), события EventHub для
+    # отправки, пачки, параллельные POST, повторы; очередь — sqlite в RUN_DIR
+    WEBHOOK_URLS: list[str] = []
+    WEBHOOK_EVENTS: list[str] = ["rates", "total", "alerts"]
+    WEBHOOK_BATCH_SIZE: int = 100
+    WEBHOOK_MAX_CONCURRENCY: int = 4
+    WEBHOOK_TIMEOUT: float = 5.0
+    WEBHOOK_MAX_ATTEMPTS: int = 10
+    WEBHOOK_BACKOFF_BASE: float = 1.0
+    WEBHOOK_BACKOFF_MAX: float = 300.0
+    WEBHOOK_OUTBOX_MAX_ROWS: int = 100_000
+    # Сжатие ответов (brotli — если установлен пакет brotli), 0 — выключено
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    # Допуск запросов: корзина токенов на клиента (0 — выключено), запись
+    # списывает RATE_LIMIT_WRITE_COST токенов; лимит одновременных запросов
+    # (0 — выключено), из них ADMISSION_READ_RESERVE слотов только для чтений
+    RATE_LIMIT_RPS: float = 0.0
+    RATE_LIMIT_BURST: float = 40.0
+    RATE_LIMIT_WRITE_COST: float = 5.0
+    # Заголовок с адресом клиента за прокси (например, X-Forwarded-For)
+    RATE_LIMIT_CLIENT_HEADER: Optional[str] = None  # noqa: UP007
+    MAX_CONCURRENT_REQUESTS: int = 64
+    ADMISSION_READ_RESERVE: int = 16
+    # Push-уведомления (SSE / WebSocket)
+    STREAM_QUEUE_SIZE: int = 16
+    STREAM_KEEPALIVE: float = 15.0
+    # Adaptive polling
+    ADAPTIVE_POLLING: bool = False
+    POLL_MAX_INTERVAL: int = 3600
+    POLL_BACKOFF_FACTOR: float = 2.0
+    PUBLISH_WINDOW_START: Optional[time] = time(11, 0)  # noqa: UP007
+    PUBLISH_WINDOW_END: Optional[time] = time(16, 0)  # noqa: UP007
+    PUBLISH_TZ: str = "Europe/Moscow"
+    # API server
+    API_HOST: str = "0.0.0.0"
+    API_PORT: int = 8000
+    # >1 — несколько процессов API, курсы читаются из shared memory
+    API_WORKERS: int = 1
+    SHARED_RATES_CAPACITY: int = 256
+    # Leader election между несколькими процессами main.py
+    LEADER_ELECTION: bool = False
+    LEADER_SYNC_INTERVAL: float = 1.0
+    RUN_DIR: str = tempfile.gettempdir()
+    # Снимок последних курсов на диске для быстрого старта (файл в RUN_DIR);
+    # снимок старше RATES_CACHE_MAX_AGE секунд при старте не используется
+    RATES_CACHE_ENABLED: bool = True
+    RATES_CACHE_MAX_AGE: float = 7 * 24 * 3600
+    # Источник курсов (для нагрузочного теста подменяется локальным) и валюта,
+    # к которой он котирует курсы; BASE_CURRENCY — к какой валюте курсы
+    # хранятся и отдаются по умолчанию (источник пересчитывается к ней)
+    CBR_URL: str = "https://www.cbr-xml-daily.ru/daily_json.js"
+    RATES_SOURCE_BASE: str = "RUB"
+    BASE_CURRENCY: str = "RUB"
+    # Период замера задержки event loop, 0 — выключено
+    LOOP_LAG_INTERVAL: float = 0.25
 
     @property
     def URL(self) -> str:
-        return "https://www.cbr-xml-daily.ru/daily_json.js"
+        return self.CBR_URL
 
     @property
     def BASE_DIR(self) -> Path:
@@ -50,21 +129,36 @@ config_map = {
     "prod": Production,
 }
 
-env_variable = os.environ.get("PROJ_ENV")
 
-if env_variable is None:
-    raise ValueError(
-        "!!!!!Not found 'PROJ_ENV' enviroment variable ПОЧИТАЙ README.md!!!!"
-    )
+def _load_settings() -> Base:
+    env_variable = os.environ.get("PROJ_ENV")
 
-env_variable = env_variable.lower()
-if env_variable not in config_map:
-    raise ValueError(
-        f"Incorrect 'PROJ_ENV' enviroment variable, must be in {list(config_map.keys())}"
-    )
+    if env_variable is None:
+        raise ValueError(
+            "!!!!!Not found 'PROJ_ENV' enviroment variable ПОЧИТАЙ README.md!!!!"
+        )
 
-try:
-    settings: Base = config_map[env_variable]()
-except ValueError as e:
-    print(f"Error on validate configuration from *.env: {e}")
-    raise
+    env_variable = env_variable.lower()
+    if env_variable not in config_map:
+        raise ValueError(
+            f"Incorrect 'PROJ_ENV' enviroment variable, must be in {list(config_map.keys())}"  # noqa: E501
+        )
+
+    try:
+        return config_map[env_variable]()
+    except ValueError as e:
+        print(f"Error on validate configuration from *.env: {e}")
+        raise
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Base:
+    """Настройки читаются и валидируются при первом обращении, а не при импорте"""
+    return _load_settings()
+
+
+def __getattr__(name: str) -> Any:
+    # `from application.settings import settings` продолжает работать
+    if name == "settings":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,17 +1,36 @@
 # src/application/state.py
 from typing import Optional
+from core.events.hub import EventHub
 from core.exceptions import AppStateError
 from core.interface.portfolio import IPortfolio
+from core.interface.scheduler import IScheduler
+from core.interface.shared_rates import ISharedRates
+from core.services.alert_engine import AlertEngine
+from core.services.portfolio_notifier import PortfolioNotifier
+from core.services.rates_history import RatesHistory
 
 
 class AppState:
     def __init__(self):
         self.repo_portfolio: Optional[IPortfolio] = None  # noqa: UP007
+        self.shared_rates: Optional[ISharedRates] = None  # noqa: UP007
+        self.event_hub = EventHub()
+        self.notifier: Optional[PortfolioNotifier] = None  # noqa: UP007
+        self.scheduler: Optional[IScheduler] = None  # noqa: UP007
+        self.rates_history: Optional[RatesHistory] = None  # noqa: UP007
+        self.alert_engine: Optional[AlertEngine] = None  # noqa: UP007
+        # Процесс-воркер API (API_WORKERS > 1): общие только курсы
+        self.is_api_worker = False
 
     def get_repo(self) -> IPortfolio:
         if self.repo_portfolio is None:
             raise AppStateError("Ошибка Состояния приложения не доступен Repo")
         return self.repo_portfolio
 
+    def get_shared_rates(self) -> ISharedRates:
+        if self.shared_rates is None:
+            raise AppStateError("Ошибка Состояния приложения не доступен сегмент курсов")
+        return self.shared_rates
+
 
 app_state = AppState()
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+import multiprocessing
+import socket
+
+import uvicorn
+
+from application.settings import get_settings
+from application.state import app_state
+from depends.dep import attach_rates_segment, create_shared_rates_portfolio
+from shared.arg_parse import mapper_args, parse_args
+
+
+logger = logging.getLogger(__name__)
+
+
+def serve_worker(sock: socket.socket, segment_name: str) -> None:
+    """Точка входа процесса-воркера API (multiprocessing spawn)"""
+    amounts_dict, currencies_dict, _, debug = parse_args()
+    settings = get_settings()
+    settings.DEBUG = debug
+    dto_amount, dto_currency = mapper_args(amounts_dict, currencies_dict)
+
+    segment = attach_rates_segment(segment_name)
+    app_state.shared_rates = segment
+    app_state.is_api_worker = True
+    app_state.repo_portfolio = create_shared_rates_portfolio(
+        initial_amounts=dto_amount,
+        shared_rates=segment,
+        currencies=dto_currency,
+        minor_units=settings.AMOUNT_MINOR_UNITS,
+        base_currency=settings.BASE_CURRENCY,
+    )
+
+    config = uvicorn.Config(
+        "application.app:create_app",
+        factory=True,
+        log_level="debug" if settings.DEBUG else "info",
+        lifespan="off",
+    )
+    server = uvicorn.Server(config)
+    try:
+        asyncio.run(server.serve(sockets=[sock]))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        segment.close()
+
+
+def bind_socket(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+async def run_workers(stop_event: asyncio.Event, workers: int) -> None:
+    """Запускает workers процессов API на одном сокете и ждет stop_event"""
+    segment_name = app_state.get_shared_rates().name
+    settings = get_settings()
+    sock = bind_socket(settings.API_HOST, settings.API_PORT)
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(
+            target=serve_worker,
+            args=(sock, segment_name),
+            name=f"api-worker-{i}",
+            daemon=True,
+        )
+        for i in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(
+        "Started %s API workers on %s:%s", workers, settings.API_HOST, settings.API_PORT
+    )
+
+    try:
+        await stop_event.wait()
+    finally:
+        for process in processes:
+            process.terminate()
+        await asyncio.gather(
+            *(asyncio.to_thread(process.join, 5) for process in processes)
+        )
+        sock.close()
+        logger.info("API workers stopped")
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+
+from core.dto.base_dto import BaseDTO
+
+
+@dataclass
+class AlertRuleDTO(BaseDTO):
+    """Правило: оповестить, когда курс code пересечет threshold в direction"""
+
+    id: int
+    code: str
+    threshold: float
+    direction: str
+
+
+@dataclass
+class AlertTriggerDTO(BaseDTO):
+    """Сработавшее правило: курс прошел threshold, изменившись old -> new"""
+
+    id: int
+    code: str
+    threshold: float
+    direction: str
+    old_value: float
+    new_value: float
@@ -2,6 +2,9 @@ from dataclasses import dataclass, asdict
 from collections.abc import Callable, Sequence
 from typing import Any, Generic, Optional, TypeVar
 from typing import get_type_hints, get_args, get_origin
+import time
+
+from shared.metrics import DTO_CONVERT_SECONDS, DTO_ITEMS
 
 
 RootDTO = TypeVar("RootDTO", bound="BaseDTO")
@@ -63,6 +66,7 @@ class BaseListDTO(Generic[RootDTO]):
         """  # noqa: E501
         if not isinstance(data, dict):
             raise ValueError("Input data must be a dictionary")
+        started = time.perf_counter()
 
         if items_key is None:
             items_key = "items"
@@ -85,6 +89,8 @@ class BaseListDTO(Generic[RootDTO]):
             for item in raw_items
         ]
 
+        DTO_CONVERT_SECONDS.labels(cls.__name__).observe(time.perf_counter() - started)
+        DTO_ITEMS.labels(cls.__name__).inc(len(converted_items))
         return cls(items=converted_items)
 
     def to_dict(self) -> dict[str, Any]:
@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
 from core.dto.base_dto import BaseDTO, BaseListDTO
 
@@ -49,3 +50,61 @@ class SummaryCurrencyDTO(BaseDTO):
     amounts: AmountCurrencyListDTO
     rates: CurrencyListDTO
     total: TotalCurrencyDTO
+
+
+@dataclass
+class ConversionMatrixDTO(BaseDTO):
+    """matrix[i][j] — сколько единиц codes[j] стоит одна единица codes[i]"""
+
+    codes: list[str]
+    matrix: list[list[float]]
+
+
+@dataclass
+class BatchRatesDTO(BaseDTO):
+    rates: CurrencyListDTO
+    matrix: Optional[ConversionMatrixDTO] = None  # noqa: UP007
+    base: Optional[str] = None  # noqa: UP007
+
+
+@dataclass
+class BulkConversionDTO(BaseDTO):
+    """Колонки конвертации: amounts[i] из from_codes[i] в to_codes[i]"""
+
+    amounts: list[float]
+    from_codes: list[str]
+    to_codes: list[str]
+
+
+@dataclass
+class ConvertedAmountsDTO(BaseDTO):
+    amounts: list[float]
+
+
+@dataclass
+class IngestLineErrorDTO(BaseDTO):
+    line: int
+    error: str
+
+
+@dataclass
+class IngestChunkResultDTO(BaseDTO):
+    """Итог одной порции потоковой загрузки (строки first_line..last_line)"""
+
+    chunk: int
+    first_line: int
+    last_line: int
+    applied: int
+    failed: int
+    version: int
+    error: Optional[str] = None  # noqa: UP007
+    line_errors: list[IngestLineErrorDTO] = field(default_factory=list)
+
+
+@dataclass
+class IngestReportDTO(BaseDTO):
+    chunks: list[IngestChunkResultDTO]
+    lines: int
+    applied: int
+    failed: int
+    version: int
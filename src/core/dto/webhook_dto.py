@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+
+from core.dto.base_dto import BaseDTO
+
+
+@dataclass
+class WebhookMessageDTO(BaseDTO):
+    """Событие в очереди доставки на один url; data — готовый JSON"""
+
+    id: int
+    url: str
+    topic: str
+    data: str
+    created_at: float
+    attempts: int = 0
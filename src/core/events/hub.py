@@ -0,0 +1,99 @@
+import asyncio
+import itertools
+import json
+import logging
+from collections import OrderedDict
+from collections.abc import Hashable, Set
+from dataclasses import dataclass
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Event:
+    seq: int
+    topic: str
+    data: str  # JSON, сериализуется один раз на публикацию
+
+
+class Subscription:
+    """Очередь подписчика с ограничением размера и схлопыванием по topic.
+
+    Новое событие topic заменяет еще не отданное событие того же topic — медленный
+    клиент получает только последнее состояние. События из queued_topics не
+    схлопываются: каждое (например, срабатывание алерта) ждет своей очереди.
+    Если событий в очереди больше maxsize, выбрасывается самое старое и
+    увеличивается dropped.
+    """
+
+    def __init__(self, maxsize: int, queued_topics: Set[str] = frozenset()) -> None:
+        self._maxsize = maxsize
+        self._queued_topics = queued_topics
+        self._pending: OrderedDict[Hashable, Event] = OrderedDict()
+        self._ready = asyncio.Event()
+        self.dropped = 0
+        self.coalesced = 0
+
+    def push(self, event: Event) -> None:
+        key = event.topic
+        if key in self._queued_topics:
+            key = (event.topic, event.seq)
+        elif key in self._pending:
+            del self._pending[key]
+            self.coalesced += 1
+        if key not in self._pending and len(self._pending) >= self._maxsize:
+            self._pending.popitem(last=False)
+            self.dropped += 1
+        self._pending[key] = event
+        self._ready.set()
+
+    async def get(self) -> Event:
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        _, event = self._pending.popitem(last=False)
+        return event
+
+
+class EventHub:
+    """Рассылка событий подписчикам в пределах event loop процесса."""
+
+    def __init__(self, queue_size: int = 16) -> None:
+        self._queue_size = queue_size
+        # Общий для всех подписок: queue_topic действует и на уже открытые
+        self._queued_topics: set[str] = set()
+        self._subscribers: set[Subscription] = set()
+        self._last: dict[str, Event] = {}
+        self._seq = itertools.count(1)
+
+    @property
+    def subscribers_count(self) -> int:
+        return len(self._subscribers)
+
+    def queue_topic(self, topic: str) -> None:
+        """Не схлопывать события topic: каждое доставляется подписчикам"""
+        self._queued_topics.add(topic)
+
+    def subscribe(self, replay_last: bool = True) -> Subscription:
+        subscription = Subscription(self._queue_size, self._queued_topics)
+        if replay_last:
+            for event in sorted(self._last.values(), key=lambda e: e.seq):
+                subscription.push(event)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def publish(self, topic: str, payload: Any) -> Event:
+        event = Event(
+            seq=next(self._seq),
+            topic=topic,
+            data=json.dumps(payload, separators=(",", ":"), ensure_ascii=False),
+        )
+        self._last[topic] = event
+        for subscription in self._subscribers:
+            subscription.push(event)
+        return event
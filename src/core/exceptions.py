@@ -14,6 +14,10 @@ class PortfolioError(BaseError):
     """Ошибка Portfolio"""
 
 
+class VersionConflictError(PortfolioError):
+    """Версия портфеля изменилась с момента чтения клиентом"""
+
+
 class UsecaseError(BaseError):
     """Ошибка Usecase"""
 
@@ -27,3 +31,14 @@ class AppStateError(BaseError):
 
 
 class CurrencyNotFoundError(BaseError): ...
+
+
+class AlertError(BaseError):
+    """Ошибка правила оповещения"""
+
+
+class AlertNotFoundError(AlertError): ...
+
+
+class WebhookError(BaseError):
+    """Ошибка доставки webhook"""
@@ -0,0 +1,10 @@
+from abc import ABC, abstractmethod
+from typing import Any
+
+
+class IIntervalPolicy(ABC):
+    @abstractmethod
+    def next_interval(self, result: Any, failed: bool = False) -> float: ...
+
+    @abstractmethod
+    def reset(self) -> None: ...
@@ -0,0 +1,24 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from core.dto.currency_dto import CurrencyListDTO
+
+
+class ILeaderElector(ABC):
+    @property
+    @abstractmethod
+    def is_leader(self) -> bool: ...
+
+    @abstractmethod
+    def try_acquire(self) -> bool: ...
+
+    @abstractmethod
+    def release(self) -> None: ...
+
+
+class IRatesChannel(ABC):
+    @abstractmethod
+    def publish(self, dto: CurrencyListDTO) -> None: ...
+
+    @abstractmethod
+    def poll(self) -> Optional[CurrencyListDTO]: ...  # noqa: UP007
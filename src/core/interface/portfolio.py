@@ -1,8 +1,14 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
+from typing import Optional
 
 from core.dto.currency_dto import (
     AmountCurrencyListDTO,
+    BatchRatesDTO,
+    BulkConversionDTO,
     CodeCurrencyListDTO,
+    ConversionMatrixDTO,
+    ConvertedAmountsDTO,
     CurrencyAmountDTO,
     CurrencyDTO,
     CurrencyListDTO,
@@ -33,6 +39,26 @@ class IPortfolio(ABC):
     @abstractmethod
     def amount(self, dto: AmountCurrencyListDTO) -> None: ...
 
+    @property
+    @abstractmethod
+    def amount_version(self) -> int: ...
+
+    @property
+    @abstractmethod
+    def rates_updated_at(self) -> Optional[float]: ...  # noqa: UP007
+
+    @property
+    @abstractmethod
+    def base_currency(self) -> str: ...
+
+    @abstractmethod
+    def iter_amounts(self) -> Iterator[tuple[str, float]]: ...
+
+    @abstractmethod
+    def iter_rates(
+        self, base: Optional[str] = None  # noqa: UP007
+    ) -> Iterator[tuple[str, float]]: ...
+
     @abstractmethod
     def get_amount_one(self, currency: str) -> float: ...
 
@@ -44,24 +70,56 @@ class IPortfolio(ABC):
 
     @abstractmethod
     def set_multiple_amounts(
-        self, amounts: AmountCurrencyListDTO
+        self,
+        amounts: AmountCurrencyListDTO,
+        expected_version: Optional[int] = None,  # noqa: UP007
     ) -> AmountCurrencyListDTO:  # noqa: E501
         ...
 
     @abstractmethod
     def modify_multiple_amounts(
-        self, amounts: UpdateCurrencyAmountListDTO
+        self,
+        amounts: UpdateCurrencyAmountListDTO,
+        expected_version: Optional[int] = None,  # noqa: UP007
     ) -> AmountCurrencyListDTO:  # noqa: E501
         ...
 
     @abstractmethod
-    def get_rate(self, currency: str) -> CurrencyDTO: ...
+    def get_rate(
+        self, currency: str, base: Optional[str] = None  # noqa: UP007
+    ) -> CurrencyDTO: ...
+
+    @abstractmethod
+    def get_rates(
+        self, currencies: Sequence[str], base: Optional[str] = None  # noqa: UP007
+    ) -> CurrencyListDTO: ...
+
+    @abstractmethod
+    def get_conversion_matrix(self, currencies: Sequence[str]) -> ConversionMatrixDTO: ...
+
+    @abstractmethod
+    def get_batch_rates(
+        self,
+        currencies: Sequence[str],
+        with_matrix: bool = False,
+        base: Optional[str] = None,  # noqa: UP007
+    ) -> BatchRatesDTO: ...
+
+    @abstractmethod
+    def convert_bulk(self, dto: BulkConversionDTO) -> ConvertedAmountsDTO: ...
 
     @abstractmethod
     def update_rates(self, dto: CurrencyListDTO) -> None: ...
 
     @abstractmethod
-    def get_total(self, in_currency: str = "rub") -> TotalCurrencyDTO: ...
+    def restore_rates(self, dto: CurrencyListDTO, updated_at: float) -> None: ...
+
+    @abstractmethod
+    def get_total(
+        self, in_currency: Optional[str] = None  # noqa: UP007
+    ) -> TotalCurrencyDTO: ...
 
     @abstractmethod
-    def get_portfolio_summary(self, in_currency: str = "rub") -> SummaryCurrencyDTO: ...
+    def get_portfolio_summary(
+        self, in_currency: Optional[str] = None  # noqa: UP007
+    ) -> SummaryCurrencyDTO: ...
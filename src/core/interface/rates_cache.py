@@ -0,0 +1,12 @@
+from abc import abstractmethod
+from typing import Optional
+
+from core.dto.currency_dto import CurrencyListDTO
+from core.interface.rates_listener import IRatesListener
+
+
+class IRatesCache(IRatesListener):
+    """Последние полученные курсы, переживающие перезапуск процесса"""
+
+    @abstractmethod
+    def load(self) -> Optional[tuple[CurrencyListDTO, float]]: ...  # noqa: UP007
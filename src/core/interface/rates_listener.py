@@ -0,0 +1,8 @@
+from abc import ABC, abstractmethod
+
+from core.dto.currency_dto import CurrencyListDTO
+
+
+class IRatesListener(ABC):
+    @abstractmethod
+    def on_rates_updated(self, dto: CurrencyListDTO) -> None: ...
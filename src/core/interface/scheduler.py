@@ -15,3 +15,7 @@ class IScheduler(ABC):
 
     @abstractmethod
     async def shutdown(self) -> None: ...
+
+    def next_run_in(self) -> Optional[float]:  # noqa: UP007
+        """Секунд до следующего запуска; None — неизвестно (задача выполняется)"""
+        return None
@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+
+
+class ISharedRates(ABC):
+    @property
+    @abstractmethod
+    def name(self) -> str: ...
+
+    @property
+    @abstractmethod
+    def version(self) -> int: ...
+
+    @abstractmethod
+    def snapshot(self) -> tuple[int, float, dict[str, float]]:
+        """(version, время получения курсов, {code: value})"""
@@ -0,0 +1,38 @@
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+
+from core.dto.webhook_dto import WebhookMessageDTO
+
+
+class IWebhookOutbox(ABC):
+    """Персистентная очередь webhook-событий (at-least-once).
+
+    Методы синхронные и могут обращаться к диску — вызываются из потока,
+    а не из event loop.
+    """
+
+    @abstractmethod
+    def add(self, rows: Sequence[tuple[str, str, str, float]]) -> int:
+        """Добавить (url, topic, data, created_at); вернуть число вытесненных"""
+
+    @abstractmethod
+    def claim(self, now: float, lease: float, limit: int) -> list[WebhookMessageDTO]:
+        """Забрать готовые к отправке сообщения на lease секунд (по порядку id)"""
+
+    @abstractmethod
+    def ack(self, ids: Sequence[int]) -> None: ...
+
+    @abstractmethod
+    def retry(self, ids: Sequence[int], next_attempt_at: float) -> None: ...
+
+    @abstractmethod
+    def close(self) -> None: ...
+
+
+class IWebhookSender(ABC):
+    @abstractmethod
+    async def send(self, url: str, body: bytes) -> None:
+        """Отправить пачку; WebhookError — доставка не удалась"""
+
+    @abstractmethod
+    async def aclose(self) -> None: ...
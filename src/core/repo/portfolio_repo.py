@@ -1,11 +1,17 @@
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping, Sequence
 import logging
+import operator
+import time
 from typing import TypeVar, TypedDict, Any, cast, Optional
 from collections.abc import Callable
 
 from core.dto.currency_dto import (
     AmountCurrencyListDTO,
+    BatchRatesDTO,
+    BulkConversionDTO,
     CodeCurrencyListDTO,
+    ConversionMatrixDTO,
+    ConvertedAmountsDTO,
     CurrencyAmountDTO,
     CurrencyDTO,
     CurrencyListDTO,
@@ -22,8 +28,19 @@ from core.entity.currency_item import (
     CurrencyValueItem,
     ExchangeRateData,
 )
-from core.exceptions import CurrencyNotFoundError, PortfolioError
+from core.exceptions import CurrencyNotFoundError, PortfolioError, VersionConflictError
 from core.interface.portfolio import IPortfolio
+from core.services.rates_rebase import rebase_rates
+from shared.metrics import PORTFOLIO_VALUATION_SECONDS, timed
+from shared.money import (
+    MAX_EXPONENT,
+    decimal_ratio,
+    div_round_half_even,
+    from_minor,
+    minor_exponent,
+    to_scaled,
+)
+from shared.tracing import traced
 
 
 T = TypeVar("T", bound=TypedDict)
@@ -35,17 +52,25 @@ logger = logging.getLogger(__name__)
 
 
 class Portfolio(IPortfolio):
+    # Кэш кросс-курсов пар валют; при переполнении сбрасывается целиком
+    _cross_cache_max = 65_536
     _default_currencies = {"items": [{"code": "RUB"}, {"code": "USD"}, {"code": "EUR"}]}
 
     def __init__(
         self,
         initial_amounts: AmountCurrencyListDTO,
         currencies: Optional[CodeCurrencyListDTO] = None,  # noqa: UP007
+        minor_units: bool = False,
+        base_currency: str = "RUB",
     ) -> None:
         """
         :param initial_amounts: пример DTO -> AmountCurrencyListDTO(items=[CurrencyAmountDTO(code='USD', amount=84.004), CurrencyAmountDTO(code='EUR', amount=96.2163)]) - количество каждой валюты
 
         :param currencies: пример DTO -> CodeCurrencyListDTO(items=[BaseCurrencyDTO(code='USD'), BaseCurrencyDTO(code='EUR')]) - коды валют
+
+        :param minor_units: хранить количество в целых минорных единицах (shared.money): суммы округляются до знаков валюты, изменения не накапливают ошибку float, итог считается точно с округлением half-even
+
+        :param base_currency: валюта, к которой хранятся курсы (курс валюты — сколько base_currency стоит ее единица)
         """  # noqa: E501
         for item in initial_amounts.items:
             if item.amount < 0:
@@ -71,8 +96,22 @@ class Portfolio(IPortfolio):
             value_field="amount",
             value_converter=float,
         )
+        self._amount_version = 0
+        self._minor_units = minor_units
+        # Суммы в единицах 10**-MAX_EXPONENT (только в режиме minor_units)
+        self._amount_minor: dict[str, int] = {}
+        self._quantize_all()
         self._exchange_rates: Optional[ExchangeRateData] = None  # noqa: UP007
         self._rates_index: Optional[dict[str, float]] = None  # noqa: UP007
+        self._rates_updated_at: Optional[float] = None  # noqa: UP007
+        # Растет при каждом обновлении курсов; ключ кэшей, зависящих от курсов
+        self._rates_version = 0
+        self._rates_minor: tuple[int, dict[str, int]] = (-1, {})
+        self._base_currency = base_currency.upper()
+        # Курсы к другим базам и кросс-курсы пар для версии _cache_version
+        self._rebased: dict[str, dict[str, float]] = {}
+        self._cross: dict[tuple[str, str], float] = {}
+        self._cache_version = -1
 
     @staticmethod
     def _convert_to_typed_dict(
@@ -152,6 +191,8 @@ class Portfolio(IPortfolio):
             value_field="value",
             value_converter=float,
         )
+        self._rates_updated_at = time.time()
+        self._rates_version += 1
 
     @property
     def amount(self) -> AmountCurrencyListDTO:
@@ -174,6 +215,77 @@ class Portfolio(IPortfolio):
             value_field="amount",
             value_converter=float,
         )
+        self._quantize_all()
+        self._amount_version += 1
+
+    def _quantize(self, code: str, amount: float) -> float:
+        """В режиме minor_units — округлить до знаков валюты и запомнить int"""
+        if not self._minor_units:
+            return amount
+        units = to_scaled(amount, code)
+        self._amount_minor[code] = units
+        return from_minor(units, MAX_EXPONENT)
+
+    def _quantize_all(self) -> None:
+        if not self._minor_units:
+            return
+        self._amount_minor = {}
+        for item in self._amount["items"]:
+            item["amount"] = self._quantize(item["code"], item["amount"])
+            self._amount_index[item["code"]] = item["amount"]
+
+    @property
+    def amount_version(self) -> int:
+        """Версия сумм портфеля, растет при каждом изменении"""
+        return self._amount_version
+
+    @property
+    def rates_updated_at(self) -> Optional[float]:  # noqa: UP007
+        """Unix-время последнего обновления курсов; None — курсов еще не было"""
+        return self._rates_updated_at
+
+    @property
+    def base_currency(self) -> str:
+        """Валюта, к которой хранятся курсы"""
+        return self._base_currency
+
+    def _check_version(self, expected_version: Optional[int]) -> None:  # noqa: UP007
+        if expected_version is not None and expected_version != self._amount_version:
+            raise VersionConflictError(
+                f"Версия портфеля {self._amount_version}, ожидалась {expected_version}"
+            )
+
+    def iter_entities(self) -> Iterator[tuple[type, dict]]:
+        """(тип, словарь) всех сущностей портфеля — для переписи в профилировщике.
+
+        Сущности — TypedDict, то есть обычные dict: по type() их не отличить.
+        """
+        for container, container_type, item_type in (
+            (self._currencies, CurrencyData, CurrencyItem),
+            (self._amount, AmountData, CurrencyAmountItem),
+            (self._exchange_rates, ExchangeRateData, CurrencyValueItem),
+        ):
+            if container is None:
+                continue
+            yield container_type, container
+            for item in container["items"]:
+                yield item_type, item
+
+    def iter_amounts(self) -> Iterator[tuple[str, float]]:
+        """(код, количество) без сборки DTO.
+
+        Итерация по снимку пар индекса: изменения портфеля во время выгрузки
+        не ломают итератор.
+        """
+        return iter(list(self._amount_index.items()))
+
+    def iter_rates(
+        self, base: Optional[str] = None  # noqa: UP007
+    ) -> Iterator[tuple[str, float]]:
+        """(код, курс к base) без сборки DTO; пусто, если курсов еще нет"""
+        if self._rates_index is None:
+            return iter(())
+        return iter(list(self._rebased_index(base).items()))
 
     def get_amount_one(self, currency: str) -> float:
         """Получить количество указанной валюты."""
@@ -186,20 +298,22 @@ class Portfolio(IPortfolio):
         if dto.amount < 0:
             raise PortfolioError("Невозможно установить отрицательное значение!")
         self._update_currencies_list(dto.code)
+        amount = self._quantize(dto.code, dto.amount)
         items = self._amount["items"]
         updated = False
 
         for item in items:
             if item["code"] == dto.code:
-                item["amount"] = dto.amount
+                item["amount"] = amount
                 updated = True
                 break
 
         if not updated:
-            items.append({"code": dto.code, "amount": dto.amount})
+            items.append({"code": dto.code, "amount": amount})
 
         # Обновляем индекс
-        self._amount_index[dto.code] = dto.amount
+        self._amount_index[dto.code] = amount
+        self._amount_version += 1
 
     def modify_amount_one(self, dto: UpdateCurrencyAmountDTO) -> CurrencyAmountDTO:
         currency_code = dto.code
@@ -208,7 +322,14 @@ class Portfolio(IPortfolio):
         if currency_code not in self._amount_index:
             raise PortfolioError(f"Валюта '{currency_code}' не найдена в портфеле")
 
-        new_amount = self._amount_index[currency_code] + change_amount
+        if self._minor_units:
+            # Складываем целые единицы: дельты не накапливают ошибку float
+            new_units = self._amount_minor[currency_code] + to_scaled(
+                change_amount, currency_code
+            )
+            new_amount = from_minor(new_units, MAX_EXPONENT)
+        else:
+            new_amount = self._amount_index[currency_code] + change_amount
         if new_amount < 0:
             raise PortfolioError(
                 f"Невозможно уменьшить количество валюты '{currency_code}' до отрицательного значения. "  # noqa: E501
@@ -229,15 +350,26 @@ class Portfolio(IPortfolio):
             )
 
         self._amount_index[currency_code] = new_amount
+        if self._minor_units:
+            self._amount_minor[currency_code] = new_units
+        self._amount_version += 1
 
         return CurrencyAmountDTO(code=currency_code, amount=new_amount)
 
+    @traced("repo.set_multiple_amounts")
     def set_multiple_amounts(
-        self, amounts: AmountCurrencyListDTO
+        self,
+        amounts: AmountCurrencyListDTO,
+        expected_version: Optional[int] = None,  # noqa: UP007
     ) -> AmountCurrencyListDTO:  # noqa: E501
-        """Установить несколько валют одновременно"""
+        """Установить несколько валют одновременно.
+
+        :param expected_version: если передана и не совпадает с amount_version,
+            изменение отклоняется с VersionConflictError
+        """
         if not amounts.items:
             raise PortfolioError("Передан пустой список валют")
+        self._check_version(expected_version)
 
         for item in amounts.items:
             if item.amount < 0:
@@ -248,18 +380,48 @@ class Portfolio(IPortfolio):
         for item in amounts.items:
             self.set_amount_one(item)
 
+        if self._minor_units:
+            # Возвращаем суммы после округления до знаков валюты
+            return AmountCurrencyListDTO(
+                items=[
+                    CurrencyAmountDTO(
+                        code=item.code, amount=self._amount_index[item.code]
+                    )
+                    for item in amounts.items
+                ]
+            )
         return amounts
 
+    @traced("repo.modify_multiple_amounts")
     def modify_multiple_amounts(
-        self, amounts: UpdateCurrencyAmountListDTO
+        self,
+        amounts: UpdateCurrencyAmountListDTO,
+        expected_version: Optional[int] = None,  # noqa: UP007
     ) -> AmountCurrencyListDTO:  # noqa: E501
         """Изменить несколько валют одновременно"""
         if not amounts.items:
             raise PortfolioError("Передан пустой список изменений")
+        self._check_version(expected_version)
 
+        # Проверяем все изменения до применения, чтобы не изменить часть валют;
+        # в режиме minor_units — в тех же целых единицах, что и modify_amount_one
+        current_amounts = self._amount_minor if self._minor_units else self._amount_index
+        projected: dict[str, float] = {}
         for item in amounts.items:
             if item.code not in self._amount_index:
                 raise PortfolioError(f"Валюта {item.code} не найдена в портфеле")
+            current = projected.get(item.code, current_amounts[item.code])
+            if self._minor_units:
+                projected[item.code] = current + to_scaled(item.delta, item.code)
+            else:
+                projected[item.code] = current + item.delta
+            if projected[item.code] < 0:
+                if self._minor_units:
+                    current = from_minor(current, MAX_EXPONENT)
+                raise PortfolioError(
+                    f"Невозможно уменьшить количество валюты '{item.code}' "
+                    f"до отрицательного значения: {current} + {item.delta}"
+                )
         updated_items = []
         for item in amounts.items:
             dto = self.modify_amount_one(
@@ -268,15 +430,154 @@ class Portfolio(IPortfolio):
             updated_items.append(dto)
         return AmountCurrencyListDTO(items=updated_items)
 
-    def get_rate(self, currency: str) -> CurrencyDTO:
-        """Получить курс валюты к рублю"""
-        if self._rates_index is None:
+    def _rates_caches(
+        self,
+    ) -> tuple[dict[str, dict[str, float]], dict[tuple[str, str], float]]:
+        """Кэши пересчета курсов; сбрасываются, когда меняется версия курсов"""
+        if self._cache_version != self._rates_version:
+            self._rebased = {}
+            self._cross = {}
+            self._cache_version = self._rates_version
+        return self._rebased, self._cross
+
+    def _rebased_index(
+        self, base: Optional[str] = None  # noqa: UP007
+    ) -> dict[str, float]:
+        """Курсы всех известных валют к base (по умолчанию — к base_currency).
+
+        Пересчет к другой базе выполняется один раз на версию курсов, дальше
+        индекс берется из кэша. Результат нельзя изменять.
+        """
+        rates_index = self._rates_index
+        if rates_index is None:
             raise CurrencyNotFoundError("Курсы валют не установлены")
-        if currency not in self._rates_index:
-            raise CurrencyNotFoundError(f"Курс для валюты {currency} не найден")
-        dto = CurrencyDTO(code=currency, value=self._rates_index[currency])
-        return dto
+        base = base.upper() if base else self._base_currency
+        if base == self._base_currency:
+            return rates_index
+        rebased, _ = self._rates_caches()
+        index = rebased.get(base)
+        if index is None:
+            if base not in rates_index:
+                raise CurrencyNotFoundError(f"Курс для валюты {base} не найден")
+            index = rebase_rates(rates_index, self._base_currency, base)
+            rebased[base] = index
+        return index
+
+    @traced("repo.get_rate")
+    def get_rate(
+        self, currency: str, base: Optional[str] = None  # noqa: UP007
+    ) -> CurrencyDTO:
+        """Получить курс валюты к base (по умолчанию — к base_currency).
+
+        Курс самой базы — 1.0, как и в get_rates.
+        """
+        snapshot = self._rates_snapshot((currency,), base)
+        return CurrencyDTO(code=currency, value=snapshot[currency])
+
+    def _rates_snapshot(
+        self, currencies: Sequence[str], base: Optional[str] = None  # noqa: UP007
+    ) -> dict[str, float]:
+        """Курсы к base для набора валют из одного чтения индекса"""
+        rates_index = self._rebased_index(base)
+        base = base.upper() if base else self._base_currency
+
+        snapshot: dict[str, float] = {}
+        missing = []
+        for currency in currencies:
+            if currency in rates_index:
+                snapshot[currency] = rates_index[currency]
+            elif currency == base:
+                snapshot[currency] = 1.0
+            else:
+                missing.append(currency)
+        if missing:
+            raise CurrencyNotFoundError(
+                f"Курсы для валют {', '.join(missing)} не найдены"
+            )
+        return snapshot
+
+    @traced("repo.get_rates")
+    def get_rates(
+        self, currencies: Sequence[str], base: Optional[str] = None  # noqa: UP007
+    ) -> CurrencyListDTO:
+        """Получить курсы нескольких валют к base (по умолчанию — к base_currency)"""
+        return self._rates_dto(self._rates_snapshot(currencies, base))
+
+    @traced("repo.get_conversion_matrix")
+    def get_conversion_matrix(self, currencies: Sequence[str]) -> ConversionMatrixDTO:
+        """Кросс-курсы между всеми парами переданных валют"""
+        return self._matrix_dto(self._rates_snapshot(currencies))
+
+    @traced("repo.get_batch_rates")
+    def get_batch_rates(
+        self,
+        currencies: Sequence[str],
+        with_matrix: bool = False,
+        base: Optional[str] = None,  # noqa: UP007
+    ) -> BatchRatesDTO:
+        """Курсы и (опционально) матрица кросс-курсов из одного снимка курсов"""
+        base = base.upper() if base else self._base_currency
+        snapshot = self._rates_snapshot(currencies, base)
+        return BatchRatesDTO(
+            rates=self._rates_dto(snapshot),
+            # Кросс-курс не зависит от базы: row / col для любой общей базы
+            matrix=self._matrix_dto(snapshot) if with_matrix else None,
+            base=base,
+        )
+
+    @staticmethod
+    def _rates_dto(snapshot: Mapping[str, float]) -> CurrencyListDTO:
+        items = [CurrencyDTO(code=code, value=value) for code, value in snapshot.items()]
+        return CurrencyListDTO(items=items)
+
+    @staticmethod
+    def _matrix_dto(snapshot: Mapping[str, float]) -> ConversionMatrixDTO:
+        codes = list(snapshot)
+        values = [snapshot[code] for code in codes]
+        matrix = [[row / col for col in values] for row in values]
+        return ConversionMatrixDTO(codes=codes, matrix=matrix)
+
+    def _cross_rates(
+        self, pairs: Sequence[tuple[str, str]]
+    ) -> dict[tuple[str, str], float]:
+        """Кросс-курсы пар (из, в) — сколько единиц «в» стоит единица «из».
+
+        Считаются через базовую валюту один раз на версию курсов: повторные
+        запросы тех же пар берут множитель из кэша.
+        """
+        _, cross = self._rates_caches()
+        missing = {pair for pair in pairs if pair not in cross}
+        if missing:
+            if len(cross) + len(missing) > self._cross_cache_max:
+                cross.clear()
+                missing = set(pairs)
+            snapshot = self._rates_snapshot(
+                list(dict.fromkeys(code for pair in missing for code in pair))
+            )
+            for src, dst in missing:
+                cross[src, dst] = snapshot[src] / snapshot[dst]
+        return cross
+
+    @traced("repo.convert_bulk")
+    def convert_bulk(self, dto: BulkConversionDTO) -> ConvertedAmountsDTO:
+        """Конвертировать колонки сумм за один проход по одному снимку курсов.
 
+        Множитель пары валют берется из кэша кросс-курсов (считается один
+        раз на версию курсов), дальше amounts перемножается с колонкой
+        множителей через map без промежуточных объектов на строку.
+        """
+        amounts, from_codes, to_codes = dto.amounts, dto.from_codes, dto.to_codes
+        if not len(amounts) == len(from_codes) == len(to_codes):
+            raise PortfolioError("Колонки amounts, from_codes и to_codes разной длины")
+        if not amounts:
+            return ConvertedAmountsDTO(amounts=[])
+
+        pairs = list(zip(from_codes, to_codes, strict=True))
+        factors = self._cross_rates(pairs)
+        converted = list(map(operator.mul, amounts, map(factors.__getitem__, pairs)))
+        return ConvertedAmountsDTO(amounts=converted)
+
+    @traced("repo.update_rates")
     def update_rates(self, dto: CurrencyListDTO) -> None:
         """Обновляет курсы валют в портфеле.
         :param dto: CurrencyListDTO с новыми курсами валют
@@ -291,7 +592,10 @@ class Portfolio(IPortfolio):
             required_keys=["code", "value"],
         )
 
-        required_currencies = {item["code"] for item in self._currencies["items"]}
+        # Курс базовой валюты к самой себе не нужен
+        required_currencies = {item["code"] for item in self._currencies["items"]} - {
+            self._base_currency
+        }
         updated_currencies = {item["code"] for item in new_rates["items"]}
 
         missing_currencies = required_currencies - updated_currencies
@@ -314,35 +618,92 @@ class Portfolio(IPortfolio):
         self._rates_index.update(
             {item["code"]: item["value"] for item in new_rates["items"]}
         )
-
-    def get_total(self, in_currency: str = "rub") -> TotalCurrencyDTO:
-        """Получить общую сумму портфеля в указанной валюте"""
+        self._rates_updated_at = time.time()
+        self._rates_version += 1
+
+    def restore_rates(self, dto: CurrencyListDTO, updated_at: float) -> None:
+        """Установить курсы из сохраненного снимка с временем их получения"""
+        self.data = dto
+        self._rates_updated_at = updated_at
+
+    @traced("repo.get_total")
+    @timed(PORTFOLIO_VALUATION_SECONDS.labels("get_total"))
+    def get_total(
+        self, in_currency: Optional[str] = None  # noqa: UP007
+    ) -> TotalCurrencyDTO:
+        """Получить общую сумму портфеля в указанной валюте (по умолчанию — в базовой)"""
         if self._rates_index is None:
             raise PortfolioError("Курсы валют не установлены")
 
-        in_currency = in_currency.upper()
-        if in_currency not in self._rates_index and in_currency != "RUB":
+        in_currency = (in_currency or self._base_currency).upper()
+        if in_currency not in self._rates_index and in_currency != self._base_currency:
             raise PortfolioError(f"Неизвестный курс для валюты {in_currency}")
 
+        if self._minor_units:
+            return self._get_total_minor(in_currency)
+
+        # Курсы сразу к целевой валюте: без деления на каждую валюту портфеля
+        rates = self._rebased_index(in_currency)
         total = 0.0
         for currency, amount in self._amount_index.items():
-            if currency == "RUB":
-                rub_amount = amount
-            else:
-                rate = self._rates_index.get(currency)
-                if rate is None:
-                    logger.info(f"Пропускаем валюту {currency} - курс не известен")
-                    continue
-                rub_amount = amount * rate
-
-            if in_currency == "RUB":
-                total += rub_amount
-            else:
-                total += rub_amount / self._rates_index[in_currency]
+            if currency == in_currency:
+                total += amount
+                continue
+            rate = rates.get(currency)
+            if rate is None:
+                logger.debug("Пропускаем валюту %s - курс не известен", currency)
+                continue
+            total += amount * rate
         return TotalCurrencyDTO(code=in_currency, total_amount=round(total, 2))
 
-    def get_portfolio_summary(self, in_currency: str = "rub") -> SummaryCurrencyDTO:
-        """Получить полную сводку по портфелю"""
+    def _rates_minor_index(self) -> dict[str, int]:
+        """Курсы в int с общим знаменателем 10**k, пересчет при новых курсах.
+
+        k — наибольшее число десятичных знаков среди курсов, поэтому каждый
+        курс представлен точно. Знаменатель сокращается при делении в
+        _get_total_minor и не хранится.
+        """
+        version, index = self._rates_minor
+        if version != self._rates_version:
+            ratios = {
+                code: decimal_ratio(rate) for code, rate in self._rates_index.items()
+            }
+            scale = max((den for _, den in ratios.values()), default=1)
+            index = {code: num * (scale // den) for code, (num, den) in ratios.items()}
+            index.setdefault(self._base_currency, scale)
+            self._rates_minor = (self._rates_version, index)
+        return index
+
+    def _get_total_minor(self, in_currency: str) -> TotalCurrencyDTO:
+        """Точный итог в целых числах: одно округление half-even в конце.
+
+        Σ units_i * rate_i — базовая валюта в единицах
+        10**-MAX_EXPONENT / scale, сумма int точна. Затем делим на курс
+        целевой валюты (с тем же scale) с округлением до ее минорных единиц.
+        """
+        rates = self._rates_minor_index()
+        total_scaled = 0
+        for currency, units in self._amount_minor.items():
+            rate = rates.get(currency)
+            if rate is None:
+                logger.debug("Пропускаем валюту %s - курс не известен", currency)
+                continue
+            total_scaled += units * rate
+
+        target_exponent = minor_exponent(in_currency)
+        total_units = div_round_half_even(
+            total_scaled * 10**target_exponent, rates[in_currency] * 10**MAX_EXPONENT
+        )
+        return TotalCurrencyDTO(
+            code=in_currency, total_amount=from_minor(total_units, target_exponent)
+        )
+
+    @traced("repo.get_portfolio_summary")
+    @timed(PORTFOLIO_VALUATION_SECONDS.labels("get_portfolio_summary"))
+    def get_portfolio_summary(
+        self, in_currency: Optional[str] = None  # noqa: UP007
+    ) -> SummaryCurrencyDTO:
+        """Получить полную сводку по портфелю: курсы и итог — в in_currency"""
         if self._exchange_rates is None:
             raise PortfolioError("Курсы валют не установлены")
 
@@ -352,13 +713,21 @@ class Portfolio(IPortfolio):
 
         filtered_amounts = []
         for item in self._amount["items"]:
-            if item["code"] == "RUB" or item["code"] in rates_index:
+            if item["code"] == self._base_currency or item["code"] in rates_index:
                 filtered_amounts.append(
                     CurrencyAmountDTO(code=item["code"], amount=item["amount"])
                 )
         amounts = AmountCurrencyListDTO(items=filtered_amounts)
-        rates = CurrencyListDTO.from_dict(self.data.to_dict())
         total = self.get_total(in_currency=in_currency)
+        if total.code == self._base_currency:
+            rates = CurrencyListDTO.from_dict(self.data.to_dict())
+        else:
+            rates = CurrencyListDTO(
+                items=[
+                    CurrencyDTO(code=code, value=value)
+                    for code, value in self._rebased_index(total.code).items()
+                ]
+            )
 
         return SummaryCurrencyDTO(
             amounts=amounts,
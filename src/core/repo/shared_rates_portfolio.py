@@ -0,0 +1,121 @@
+from collections.abc import Iterator, Sequence
+from typing import Optional
+
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    BatchRatesDTO,
+    BulkConversionDTO,
+    CodeCurrencyListDTO,
+    ConversionMatrixDTO,
+    ConvertedAmountsDTO,
+    CurrencyDTO,
+    CurrencyListDTO,
+    SummaryCurrencyDTO,
+    TotalCurrencyDTO,
+)
+from core.entity.currency_item import ExchangeRateData
+from core.interface.shared_rates import ISharedRates
+from core.repo.portfolio_repo import Portfolio
+
+
+class SharedRatesPortfolio(Portfolio):
+    """Portfolio воркера, курсы которого приходят из общего сегмента.
+
+    Перед каждым чтением курсов сверяется версия сегмента (одно чтение
+    заголовка); локальный индекс пересобирается, только если писатель
+    опубликовал новые курсы. Суммы валют локальны для процесса, поэтому API
+    воркеров их не изменяет: иначе воркеры расходились бы в суммах и ETag.
+    """
+
+    def __init__(
+        self,
+        initial_amounts: AmountCurrencyListDTO,
+        shared_rates: ISharedRates,
+        currencies: Optional[CodeCurrencyListDTO] = None,  # noqa: UP007
+        minor_units: bool = False,
+        base_currency: str = "RUB",
+    ) -> None:
+        super().__init__(
+            initial_amounts,
+            currencies,
+            minor_units=minor_units,
+            base_currency=base_currency,
+        )
+        self._shared_rates = shared_rates
+        self._shared_version = 0
+
+    def _sync_rates(self) -> None:
+        if self._shared_rates.version == self._shared_version:
+            return
+        version, updated_at, rates = self._shared_rates.snapshot()
+        self._shared_version = version
+        if not rates:
+            return
+        self._exchange_rates = ExchangeRateData(
+            items=[{"code": code, "value": value} for code, value in rates.items()]
+        )
+        self._rates_index = rates
+        self._rates_version += 1
+        # Время получения курсов писателем, а не момент чтения воркером
+        self._rates_updated_at = updated_at
+
+    @property
+    def rates_updated_at(self) -> Optional[float]:  # noqa: UP007
+        self._sync_rates()
+        return super().rates_updated_at
+
+    @property
+    def data(self) -> CurrencyListDTO:
+        self._sync_rates()
+        return super().data
+
+    @data.setter
+    def data(self, dto: CurrencyListDTO) -> None:
+        Portfolio.data.fset(self, dto)  # type: ignore[attr-defined]
+
+    def iter_rates(
+        self, base: Optional[str] = None  # noqa: UP007
+    ) -> Iterator[tuple[str, float]]:
+        self._sync_rates()
+        return super().iter_rates(base)
+
+    def get_rate(
+        self, currency: str, base: Optional[str] = None  # noqa: UP007
+    ) -> CurrencyDTO:
+        self._sync_rates()
+        return super().get_rate(currency, base)
+
+    def get_rates(
+        self, currencies: Sequence[str], base: Optional[str] = None  # noqa: UP007
+    ) -> CurrencyListDTO:
+        self._sync_rates()
+        return super().get_rates(currencies, base)
+
+    def get_conversion_matrix(self, currencies: Sequence[str]) -> ConversionMatrixDTO:
+        self._sync_rates()
+        return super().get_conversion_matrix(currencies)
+
+    def get_batch_rates(
+        self,
+        currencies: Sequence[str],
+        with_matrix: bool = False,
+        base: Optional[str] = None,  # noqa: UP007
+    ) -> BatchRatesDTO:
+        self._sync_rates()
+        return super().get_batch_rates(currencies, with_matrix, base)
+
+    def convert_bulk(self, dto: BulkConversionDTO) -> ConvertedAmountsDTO:
+        self._sync_rates()
+        return super().convert_bulk(dto)
+
+    def get_total(
+        self, in_currency: Optional[str] = None  # noqa: UP007
+    ) -> TotalCurrencyDTO:
+        self._sync_rates()
+        return super().get_total(in_currency)
+
+    def get_portfolio_summary(
+        self, in_currency: Optional[str] = None  # noqa: UP007
+    ) -> SummaryCurrencyDTO:
+        self._sync_rates()
+        return super().get_portfolio_summary(in_currency)
@@ -0,0 +1,114 @@
+import logging
+from collections.abc import Callable
+from datetime import datetime, time, timedelta
+from typing import Any, Optional
+from zoneinfo import ZoneInfo
+
+from core.interface.interval_policy import IIntervalPolicy
+
+
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class FixedIntervalPolicy(IIntervalPolicy):
+    """Постоянный интервал — поведение Scheduler по умолчанию."""
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+
+    def next_interval(self, result: Any, failed: bool = False) -> float:
+        return self._interval
+
+    def reset(self) -> None: ...
+
+
+class AdaptiveIntervalPolicy(IIntervalPolicy):
+    """Экспоненциальный backoff пока данные не меняются.
+
+    Пока результаты подряд совпадают, интервал растет в factor раз до
+    max_interval. Внутри окна публикации (время в tz источника) интервал не
+    превышает base_interval, а вне окна ожидание обрезается до начала
+    следующего окна — так обновление не приходит позже, чем при фиксированном
+    опросе. Первый же измененный результат сбрасывает backoff.
+    """
+
+    def __init__(
+        self,
+        base_interval: float,
+        max_interval: float,
+        *,
+        factor: float = 2.0,
+        window_start: Optional[time] = None,  # noqa: UP007
+        window_end: Optional[time] = None,  # noqa: UP007
+        tz: str = "Europe/Moscow",
+        now: Optional[Callable[[], datetime]] = None,  # noqa: UP007
+    ) -> None:
+        if base_interval <= 0:
+            raise ValueError("base_interval must be a positive number")
+        if max_interval < base_interval:
+            raise ValueError("max_interval must be >= base_interval")
+        if factor < 1:
+            raise ValueError("factor must be >= 1")
+        if (window_start is None) != (window_end is None):
+            raise ValueError("window_start and window_end must be set together")
+
+        self._base = base_interval
+        self._max = max_interval
+        self._factor = factor
+        self._window_start = window_start
+        self._window_end = window_end
+        self._tz = ZoneInfo(tz)
+        self._now = now or (lambda: datetime.now(self._tz))
+        self._unchanged_streak = 0
+        self._last_result: Any = _MISSING
+
+    @property
+    def unchanged_streak(self) -> int:
+        return self._unchanged_streak
+
+    def reset(self) -> None:
+        self._unchanged_streak = 0
+        self._last_result = _MISSING
+
+    def next_interval(self, result: Any, failed: bool = False) -> float:
+        if failed or result is None:
+            # Ошибка или пустой тик (например, процесс не лидер) — не "неизменные
+            # данные", повторяем в базовом темпе
+            return self._base
+
+        if self._last_result is not _MISSING and result == self._last_result:
+            self._unchanged_streak += 1
+        else:
+            if self._unchanged_streak:
+                logger.debug("Rates changed, adaptive backoff reset")
+            self._unchanged_streak = 0
+        self._last_result = result
+
+        interval = min(self._base * self._factor**self._unchanged_streak, self._max)
+        if self._window_start is None:
+            return interval
+
+        now = self._now().astimezone(self._tz)
+        if self._in_window(now):
+            return min(interval, self._base)
+        return max(min(interval, self._seconds_until_window(now)), self._base)
+
+    def _in_window(self, now: datetime) -> bool:
+        current = now.time()
+        if self._window_start <= self._window_end:
+            return self._window_start <= current < self._window_end
+        # Окно через полночь
+        return current >= self._window_start or current < self._window_end
+
+    def _seconds_until_window(self, now: datetime) -> float:
+        start = now.replace(
+            hour=self._window_start.hour,
+            minute=self._window_start.minute,
+            second=self._window_start.second,
+            microsecond=0,
+        )
+        if start <= now:
+            start += timedelta(days=1)
+        return (start - now).total_seconds()
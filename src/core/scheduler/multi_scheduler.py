@@ -0,0 +1,239 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from core.interface.interval_policy import IIntervalPolicy
+from core.interface.scheduler import IScheduler
+from shared.metrics import SCHEDULER_TASKS_RUNNING
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    """Периодическая задача MultiJobScheduler."""
+
+    name: str
+    task: Callable[..., Coroutine]
+    interval: float
+    priority: int = 0
+    max_concurrency: int = 1
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    policy: Optional[IIntervalPolicy] = None  # noqa: UP007
+    running: int = 0
+    last_result: Any = None
+    generation: int = 0
+
+
+class MultiJobScheduler(IScheduler):
+    """Один цикл на все периодические задачи.
+
+    Задачи лежат в куче по (deadline, priority, seq): цикл спит до ближайшего
+    дедлайна, а не держит по таймеру на задачу. Меньший priority запускается
+    раньше при равных дедлайнах. Если задача уже выполняется max_concurrency
+    раз, очередной запуск пропускается и переносится на следующий интервал.
+    Для задачи с IIntervalPolicy следующий дедлайн считается по завершении
+    запуска — политике нужен его результат.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._jobs: dict[str, Job] = {}
+        self._heap: list[tuple[float, int, int, str, int]] = []
+        self._seq = itertools.count()
+        # Общий счетчик: задача, добавленная заново под тем же именем, не
+        # совпадет по generation со старыми записями в куче
+        self._generations = itertools.count()
+        self._running_tasks: set[asyncio.Task] = set()
+        self._is_running = False
+        self._current_task: Optional[asyncio.Task] = None  # noqa: UP007
+        self._wakeup = asyncio.Event()
+
+    @property
+    def jobs(self) -> dict[str, Job]:
+        return dict(self._jobs)
+
+    def add_job(
+        self,
+        name: str,
+        task: Callable[..., Coroutine],
+        interval: float,
+        *,
+        priority: int = 0,
+        max_concurrency: int = 1,
+        kwargs: Optional[dict[str, Any]] = None,  # noqa: UP007
+        policy: Optional[IIntervalPolicy] = None,  # noqa: UP007
+        run_immediately: bool = True,
+    ) -> Job:
+        """Добавить задачу. Можно вызывать во время работы планировщика."""
+        if interval <= 0:
+            raise ValueError("Interval must be a positive number")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        if name in self._jobs:
+            raise ValueError(f"Job '{name}' already exists")
+
+        job = Job(
+            name=name,
+            task=task,
+            interval=interval,
+            priority=priority,
+            max_concurrency=max_concurrency,
+            kwargs=kwargs or {},
+            policy=policy,
+            generation=next(self._generations),
+        )
+        self._jobs[name] = job
+        delay = 0.0 if run_immediately else interval
+        self._push(job, self._clock() + delay)
+        return job
+
+    def remove_job(self, name: str) -> None:
+        """Удалить задачу. Уже запущенные экземпляры доработают до конца."""
+        job = self._jobs.pop(name, None)
+        if job is None:
+            raise KeyError(f"Job '{name}' not found")
+        # Записи в куче не чистим: они отбрасываются по generation при извлечении
+        job.generation = next(self._generations)
+        self._wakeup.set()
+
+    def next_run_at(self, name: str) -> Optional[float]:  # noqa: UP007
+        """Ближайший дедлайн задачи по часам планировщика."""
+        job = self._jobs.get(name)
+        if job is None:
+            return None
+        deadlines = [
+            entry[0]
+            for entry in self._heap
+            if entry[3] == name and entry[4] == job.generation
+        ]
+        return min(deadlines) if deadlines else None
+
+    def next_run_in(self) -> Optional[float]:  # noqa: UP007
+        """Секунд до ближайшего запуска любой задачи.
+
+        Данные могут обновить любые задачи (например, fetch_rates и
+        sync_rates), поэтому берется самый ранний дедлайн.
+        """
+        deadlines = [
+            entry[0]
+            for entry in self._heap
+            if (job := self._jobs.get(entry[3])) is not None
+            and entry[4] == job.generation
+        ]
+        if not deadlines:
+            return None
+        return max(min(deadlines) - self._clock(), 0.0)
+
+    def _push(self, job: Job, deadline: float) -> None:
+        heapq.heappush(
+            self._heap,
+            (deadline, job.priority, next(self._seq), job.name, job.generation),
+        )
+        self._wakeup.set()
+
+    async def start(self, *args, kwargs: Optional[dict] = None) -> None:  # noqa: UP007
+        """Запустить цикл планировщика и ждать его остановки."""
+        if self._is_running:
+            raise RuntimeError("Scheduler is already running")
+
+        self._is_running = True
+        self._current_task = asyncio.create_task(self._run())
+        try:
+            await self._current_task
+        except asyncio.CancelledError:
+            logger.debug("Multi-job scheduler task was cancelled")
+        except Exception as e:
+            logger.error(f"Error in multi-job scheduler: {e}")
+            raise
+
+    async def _run(self, *args, **kwargs) -> None:
+        """Единый цикл: извлекает просроченные задачи и спит до следующего дедлайна."""
+        try:
+            while self._is_running:
+                self._wakeup.clear()
+                now = self._clock()
+                while self._heap and self._heap[0][0] <= now:
+                    deadline, _, _, name, generation = heapq.heappop(self._heap)
+                    job = self._jobs.get(name)
+                    if job is None or job.generation != generation:
+                        continue
+                    started = self._dispatch(job)
+                    if job.policy is not None and started:
+                        continue
+                    # Считаем от дедлайна, чтобы интервал не "плыл" на время запуска
+                    next_deadline = deadline + job.interval
+                    if next_deadline <= now:
+                        next_deadline = now + job.interval
+                    heapq.heappush(
+                        self._heap,
+                        (
+                            next_deadline,
+                            job.priority,
+                            next(self._seq),
+                            job.name,
+                            job.generation,
+                        ),
+                    )
+
+                timeout = self._heap[0][0] - self._clock() if self._heap else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+                except TimeoutError:
+                    continue
+        finally:
+            self._is_running = False
+            logger.debug("Multi-job scheduler loop stopped")
+
+    def _dispatch(self, job: Job) -> bool:
+        if job.running >= job.max_concurrency:
+            logger.warning(
+                "Job %s skipped: %s instance(s) still running", job.name, job.running
+            )
+            return False
+        job.running += 1
+        task = asyncio.create_task(self._execute(job), name=f"job:{job.name}")
+        self._running_tasks.add(task)
+        task.add_done_callback(self._running_tasks.discard)
+        return True
+
+    async def _execute(self, job: Job) -> None:
+        failed = False
+        SCHEDULER_TASKS_RUNNING.inc()
+        try:
+            job.last_result = await job.task(**job.kwargs)
+        except asyncio.CancelledError:
+            logger.debug("Job %s was cancelled", job.name)
+            raise
+        except Exception as e:
+            failed = True
+            logger.error(f"Error executing job {job.name}: {e}")
+        finally:
+            job.running -= 1
+            SCHEDULER_TASKS_RUNNING.dec()
+        if job.policy is not None and self._jobs.get(job.name) is job:
+            interval = job.policy.next_interval(job.last_result, failed=failed)
+            self._push(job, self._clock() + interval)
+
+    def stop(self) -> None:
+        """Остановить цикл и отменить выполняющиеся задачи."""
+        self._is_running = False
+        self._wakeup.set()
+        for task in list(self._running_tasks):
+            task.cancel()
+
+    async def shutdown(self) -> None:
+        self.stop()
+        if self._current_task:
+            try:  # noqa: SIM105
+                await self._current_task
+            except asyncio.CancelledError:
+                logger.info("Multi-job scheduler was cancelled during shutdown.")
+        if self._running_tasks:
+            await asyncio.gather(*self._running_tasks, return_exceptions=True)
@@ -2,21 +2,37 @@
 import asyncio
 from collections.abc import Callable, Coroutine
 import logging
+import time
 from typing import Optional
 
+from core.interface.interval_policy import IIntervalPolicy
 from core.interface.scheduler import IScheduler
+from core.scheduler.interval_policy import FixedIntervalPolicy
+from shared.metrics import (
+    SCHEDULER_NEXT_INTERVAL_SECONDS,
+    SCHEDULER_RUNS,
+    SCHEDULER_TASK_SECONDS,
+    SCHEDULER_TASKS_RUNNING,
+)
 
 
 logger = logging.getLogger(__name__)
 
 
 class Scheduler(IScheduler):
-    def __init__(self, task: Callable, interval: int):
+    def __init__(
+        self,
+        task: Callable,
+        interval: int,
+        policy: Optional[IIntervalPolicy] = None,  # noqa: UP007
+    ):
         self._task = task
         self._interval = interval
+        self._policy = policy or FixedIntervalPolicy(interval)
         self._is_running = False
         self._current_task: Optional[asyncio.Task] = None  # noqa: UP007
         self._stop_event = asyncio.Event()
+        self._next_run_at: Optional[float] = None  # noqa: UP007
 
     async def start(self, *args, kwargs: dict) -> Optional[Coroutine]:  # noqa: UP007
         """Start the scheduler and return the last result when stopped."""
@@ -41,28 +57,45 @@ class Scheduler(IScheduler):
         last_result = None
         try:
             while self._is_running:
+                failed = False
+                started = time.perf_counter()
+                SCHEDULER_TASKS_RUNNING.inc()
                 try:
                     last_result = await self._task(*args, **kwargs)
                 except asyncio.CancelledError:
                     logger.debug("Task execution was cancelled")
                     raise
                 except Exception as e:
+                    failed = True
                     logger.error(f"Error executing scheduled task: {e}")
+                finally:
+                    SCHEDULER_TASKS_RUNNING.dec()
+                SCHEDULER_TASK_SECONDS.observe(time.perf_counter() - started)
+                SCHEDULER_RUNS.labels("error" if failed else "ok").inc()
+                interval = self._policy.next_interval(last_result, failed=failed)
+                SCHEDULER_NEXT_INTERVAL_SECONDS.set(interval)
+                logger.debug("Next scheduled run in %.1fs", interval)
+                self._next_run_at = time.monotonic() + interval
                 try:
-                    await asyncio.wait_for(
-                        self._stop_event.wait(), timeout=self._interval
-                    )
+                    await asyncio.wait_for(self._stop_event.wait(), timeout=interval)
                     break
                 except asyncio.CancelledError:
                     logger.debug("Wait was cancelled")
                     raise
                 except TimeoutError:
                     continue
+                finally:
+                    self._next_run_at = None
         finally:
             self._is_running = False
             logger.debug("Scheduler loop stopped")
         return last_result
 
+    def next_run_in(self) -> Optional[float]:  # noqa: UP007
+        if self._next_run_at is None:
+            return None
+        return max(self._next_run_at - time.monotonic(), 0.0)
+
     def stop(self) -> None:
         """Stop the scheduler gracefully."""
         if self._is_running and not self._stop_event.is_set():
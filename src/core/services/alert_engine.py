@@ -0,0 +1,164 @@
+import itertools
+import logging
+import math
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterator
+from typing import Optional
+
+from core.dto.alert_dto import AlertRuleDTO, AlertTriggerDTO
+from core.dto.currency_dto import CurrencyListDTO
+from core.events.hub import EventHub
+from core.exceptions import AlertError, AlertNotFoundError
+from core.interface.rates_listener import IRatesListener
+from shared.metrics import ALERT_EVALUATION_SECONDS, ALERT_RULES, ALERTS_TRIGGERED
+
+
+logger = logging.getLogger(__name__)
+
+TOPIC_ALERTS = "alerts"
+
+DIRECTION_ABOVE = "above"
+DIRECTION_BELOW = "below"
+DIRECTION_CROSS = "cross"
+DIRECTIONS = (DIRECTION_ABOVE, DIRECTION_BELOW, DIRECTION_CROSS)
+
+# Ключи (threshold, id) для bisect: до/после всех правил с тем же порогом
+_FIRST = -math.inf
+_LAST = math.inf
+
+
+class AlertEngine(IRatesListener):
+    """Оповещения о пересечении курсом порога.
+
+    Для каждой валюты два отсортированных списка (threshold, id): правила на
+    рост (above и cross) и на падение (below и cross). При изменении курса
+    old -> new сработавшие правила — непрерывный срез одного из списков:
+    рост — пороги в (old, new], падение — в [new, old). Срез находится двумя
+    bisect, поэтому стоимость обновления — O(log n + k), где k — число
+    сработавших правил, а не всех зарегистрированных.
+
+    Первый курс валюты только запоминается: пересечение определяется
+    относительно предыдущего курса. Правило не одноразовое — оно сработает
+    снова при следующем пересечении порога.
+    """
+
+    def __init__(
+        self,
+        hub: Optional[EventHub] = None,  # noqa: UP007
+        max_rules: int = 1_000_000,
+    ) -> None:
+        self._hub = hub
+        if hub is not None:
+            # Срабатывания не состояние, а события: второе не должно затирать первое
+            hub.queue_topic(TOPIC_ALERTS)
+        self._max_rules = max_rules
+        self._rules: dict[int, AlertRuleDTO] = {}
+        self._up: dict[str, list[tuple[float, int]]] = {}
+        self._down: dict[str, list[tuple[float, int]]] = {}
+        self._last_rates: dict[str, float] = {}
+        self._ids = itertools.count(1)
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def add(
+        self, code: str, threshold: float, direction: str = DIRECTION_CROSS
+    ) -> AlertRuleDTO:
+        if direction not in DIRECTIONS:
+            raise AlertError(f"Неизвестное направление: {direction}")
+        if not math.isfinite(threshold) or threshold <= 0:
+            raise AlertError("Порог должен быть положительным числом")
+        if len(self._rules) >= self._max_rules:
+            raise AlertError(f"Достигнут лимит правил: {self._max_rules}")
+        code = code.upper()
+        rule = AlertRuleDTO(
+            id=next(self._ids), code=code, threshold=threshold, direction=direction
+        )
+        self._rules[rule.id] = rule
+        for index in self._indexes(code, direction):
+            insort(index, (threshold, rule.id))
+        ALERT_RULES.set(len(self._rules))
+        return rule
+
+    def remove(self, alert_id: int) -> AlertRuleDTO:
+        rule = self._rules.pop(alert_id, None)
+        if rule is None:
+            raise AlertNotFoundError(f"Правило {alert_id} не найдено")
+        key = (rule.threshold, rule.id)
+        for index in self._indexes(rule.code, rule.direction):
+            del index[bisect_left(index, key)]
+        ALERT_RULES.set(len(self._rules))
+        return rule
+
+    def get(self, alert_id: int) -> AlertRuleDTO:
+        rule = self._rules.get(alert_id)
+        if rule is None:
+            raise AlertNotFoundError(f"Правило {alert_id} не найдено")
+        return rule
+
+    def iter_rules(
+        self, code: Optional[str] = None  # noqa: UP007
+    ) -> Iterator[AlertRuleDTO]:
+        """Правила в порядке создания; по копии, чтобы не мешать add/remove"""
+        code = code.upper() if code else None
+        for rule in list(self._rules.values()):
+            if code is None or rule.code == code:
+                yield rule
+
+    def on_rates_updated(self, dto: CurrencyListDTO) -> None:
+        triggered = self.evaluate(dto)
+        if triggered and self._hub is not None:
+            self._hub.publish(
+                TOPIC_ALERTS, {"triggered": [trigger.to_dict() for trigger in triggered]}
+            )
+
+    def evaluate(self, dto: CurrencyListDTO) -> list[AlertTriggerDTO]:
+        """Запоминает новые курсы и возвращает сработавшие правила"""
+        started = time.perf_counter()
+        triggered: list[AlertTriggerDTO] = []
+        for item in dto.items:
+            old = self._last_rates.get(item.code)
+            new = item.value
+            self._last_rates[item.code] = new
+            if old is None or old == new:
+                continue
+            if new > old:
+                index = self._up.get(item.code)
+                if not index:
+                    continue
+                crossed = index[
+                    bisect_right(index, (old, _LAST)) : bisect_right(index, (new, _LAST))
+                ]
+            else:
+                index = self._down.get(item.code)
+                if not index:
+                    continue
+                crossed = index[
+                    bisect_left(index, (new, _FIRST)) : bisect_left(index, (old, _FIRST))
+                ]
+            for _, alert_id in crossed:
+                rule = self._rules[alert_id]
+                triggered.append(
+                    AlertTriggerDTO(
+                        id=rule.id,
+                        code=rule.code,
+                        threshold=rule.threshold,
+                        direction=rule.direction,
+                        old_value=old,
+                        new_value=new,
+                    )
+                )
+                ALERTS_TRIGGERED.labels(rule.direction).inc()
+        ALERT_EVALUATION_SECONDS.observe(time.perf_counter() - started)
+        if triggered:
+            logger.info(f"Alerts triggered: {len(triggered)}")
+        return triggered
+
+    def _indexes(self, code: str, direction: str) -> list[list[tuple[float, int]]]:
+        indexes = []
+        if direction != DIRECTION_BELOW:
+            indexes.append(self._up.setdefault(code, []))
+        if direction != DIRECTION_ABOVE:
+            indexes.append(self._down.setdefault(code, []))
+        return indexes
@@ -1,22 +1,38 @@
 from datetime import datetime, timedelta
 import logging
 
-from collections.abc import Callable
+from collections.abc import Callable, Sequence
 from typing import Optional
 
-from core.dto.currency_dto import CurrencyListDTO
+from core.dto.currency_dto import CurrencyDTO, CurrencyListDTO
 from core.exceptions import ServiceError
 from core.interface.portfolio import IPortfolio
 from core.interface.base_http_service import IBASEHTTPService
+from core.interface.rates_listener import IRatesListener
+from core.services.rates_rebase import rebase_rates
+from shared.tracing import traced
 
 
 logger = logging.getLogger(__name__)
 
 
 class CurrencyServiceHTTPUSECASE:
-    def __init__(self, service: IBASEHTTPService, repo: IPortfolio) -> None:
+    def __init__(
+        self,
+        service: IBASEHTTPService,
+        repo: IPortfolio,
+        listeners: Sequence[IRatesListener] = (),
+        source_base: Optional[str] = None,  # noqa: UP007
+    ) -> None:
+        """
+        :param source_base: валюта, к которой котирует источник; если она
+            отличается от repo.base_currency, курсы пересчитываются один раз
+            при получении — repo и слушатели видят курсы к базе портфеля
+        """
         self._service = service
         self._repo = repo
+        self._listeners = list(listeners)
+        self._source_base = source_base.upper() if source_base else None
         self._last_print_time = None
         self._last_state = None
 
@@ -28,6 +44,10 @@ class CurrencyServiceHTTPUSECASE:
     def repo(self) -> IPortfolio:
         return self._repo
 
+    def add_listener(self, listener: IRatesListener) -> None:
+        self._listeners.append(listener)
+
+    @traced("service.fetch_rates")
     async def __call__(
         self,
         *,
@@ -46,7 +66,8 @@ class CurrencyServiceHTTPUSECASE:
                 field_map=field_map,
                 filter_func=effective_filter,
             )
-            self.repo.data = res
+            res = self._to_repo_base(res)
+            self.apply_rates(res)
             logger.info("Currency rates successfully updated")
             current_time = datetime.now()
             if self._should_print_state(current_time, debug):
@@ -60,6 +81,43 @@ class CurrencyServiceHTTPUSECASE:
                 logger.exception(f"Ошибка запроса на {url}")
             raise ServiceError("Ошибка в Service") from e
 
+    def _to_repo_base(self, dto: CurrencyListDTO) -> CurrencyListDTO:
+        base = self.repo.base_currency
+        if self._source_base is None or self._source_base == base:
+            return dto
+        rates = {item.code: item.value for item in dto.items}
+        # Если источник не котирует базу портфеля — берем ее из прошлых курсов
+        known = dict(self.repo.iter_rates()).get(self._source_base)
+        rebased = rebase_rates(
+            rates, self._source_base, base, pivot=1 / known if known else None
+        )
+        return CurrencyListDTO(
+            items=[CurrencyDTO(code=code, value=value) for code, value in rebased.items()]
+        )
+
+    def apply_rates(
+        self, dto: CurrencyListDTO, exclude: Sequence[IRatesListener] = ()
+    ) -> None:
+        """Записать курсы (уже к базе портфеля) в repo и оповестить слушателей.
+
+        Тот же путь используют курсы, полученные не из источника (например,
+        снимок лидера): exclude — слушатели, которым их передавать не нужно.
+        """
+        self.repo.data = dto
+        self._notify_listeners(dto, exclude)
+
+    def _notify_listeners(
+        self, dto: CurrencyListDTO, exclude: Sequence[IRatesListener] = ()
+    ) -> None:
+        """Ошибка слушателя не должна ломать обновление курсов"""
+        for listener in self._listeners:
+            if listener in exclude:
+                continue
+            try:
+                listener.on_rates_updated(dto)
+            except Exception:
+                logger.exception(f"Rates listener {type(listener).__name__} failed")
+
     def _should_print_state(self, current_time: datetime, debug) -> bool:
         if self._last_print_time is None:
             if debug:
@@ -84,7 +142,7 @@ class CurrencyServiceHTTPUSECASE:
         """Гибко выводит состояние портфеля для любых валют"""
         data = self.repo.get_portfolio_summary().to_dict()
         currencies = [item["code"] for item in data["amounts"]["items"]]
-        base_currency = data["total"]["code"]  # RUB в вашем примере
+        base_currency = self.repo.base_currency
         amounts = {item["code"]: item["amount"] for item in data["amounts"]["items"]}
         rates = {item["code"]: item["value"] for item in data["rates"]["items"]}
 
@@ -0,0 +1,55 @@
+import logging
+from typing import Any, Optional
+
+from core.dto.currency_dto import CurrencyListDTO
+from core.interface.leader import ILeaderElector, IRatesChannel
+from core.services.currency_service_http import CurrencyServiceHTTPUSECASE
+
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderAwareFetcher:
+    """Ходит во внешний источник только из процесса-лидера.
+
+    fetch() — периодическая задача получения курсов: лидер вызывает usecase
+    (канал подписан на него как IRatesListener и публикует результат),
+    остальные процессы ничего не делают, но на каждом тике пытаются
+    захватить лидерство (failover). sync() — частая
+    дешевая задача последователей: подхватывает опубликованный снимок и
+    применяет его через usecase, чтобы слушатели (SSE, история, алерты,
+    кэш) работали и в последователях.
+    """
+
+    def __init__(
+        self,
+        uc: CurrencyServiceHTTPUSECASE,
+        elector: ILeaderElector,
+        channel: IRatesChannel,
+    ) -> None:
+        self._uc = uc
+        self._elector = elector
+        self._channel = channel
+
+    @property
+    def is_leader(self) -> bool:
+        return self._elector.is_leader
+
+    async def fetch(self, **kwargs: Any) -> Optional[CurrencyListDTO]:  # noqa: UP007
+        if not self._elector.try_acquire():
+            return None
+        return await self._uc(**kwargs)
+
+    async def sync(self) -> Optional[CurrencyListDTO]:  # noqa: UP007
+        if self._elector.is_leader:
+            return None
+        dto = self._channel.poll()
+        if dto is None:
+            return None
+        # Канал — тоже слушатель usecase: свой же снимок обратно не публикуем
+        self._uc.apply_rates(dto, exclude=(self._channel,))
+        logger.info("Currency rates received from leader")
+        return dto
+
+    def close(self) -> None:
+        self._elector.release()
@@ -0,0 +1,52 @@
+import logging
+from typing import Optional
+
+from core.dto.currency_dto import CurrencyListDTO
+from core.events.hub import EventHub
+from core.exceptions import PortfolioError
+from core.interface.portfolio import IPortfolio
+from core.interface.rates_listener import IRatesListener
+
+
+logger = logging.getLogger(__name__)
+
+TOPIC_RATES = "rates"
+TOPIC_TOTAL = "total"
+
+
+class PortfolioNotifier(IRatesListener):
+    """Публикует в EventHub изменения курсов и итоговой суммы портфеля.
+
+    Тик планировщика с теми же курсами, что и в прошлый раз, ничего не
+    публикует: подписчики и webhook получают только изменения.
+    """
+
+    def __init__(self, repo: IPortfolio, hub: EventHub) -> None:
+        self._repo = repo
+        self._hub = hub
+        self._last_rates: Optional[dict] = None  # noqa: UP007
+        self._last_total: Optional[float] = None  # noqa: UP007
+
+    def on_rates_updated(self, dto: CurrencyListDTO) -> None:
+        rates = dto.to_dict()
+        if rates == self._last_rates:
+            return
+        self._last_rates = rates
+        self._hub.publish(TOPIC_RATES, rates)
+        self.notify_amounts_changed()
+
+    def notify_amounts_changed(self) -> None:
+        try:
+            total = self._repo.get_total()
+        except PortfolioError:
+            # Курсы еще не известны — сумму посчитать нельзя
+            return
+        if total.total_amount == self._last_total:
+            return
+        delta = (
+            None
+            if self._last_total is None
+            else round(total.total_amount - self._last_total, 2)
+        )
+        self._last_total = total.total_amount
+        self._hub.publish(TOPIC_TOTAL, {**total.to_dict(), "delta": delta})
@@ -0,0 +1,52 @@
+import time
+from collections import deque
+from collections.abc import Callable, Collection, Iterator
+from typing import Optional
+
+from core.dto.currency_dto import CurrencyListDTO
+from core.interface.rates_listener import IRatesListener
+
+
+class RatesHistory(IRatesListener):
+    """Ограниченная история курсов: последние max_snapshots изменившихся снимков.
+
+    Снимок сохраняется, только если курсы отличаются от предыдущего — при
+    адаптивном опросе одинаковые тики не вытесняют историю. Старые снимки
+    вытесняются deque(maxlen), память ограничена max_snapshots * число валют.
+    """
+
+    def __init__(
+        self, max_snapshots: int, clock: Callable[[], float] = time.time
+    ) -> None:
+        if max_snapshots < 1:
+            raise ValueError("max_snapshots must be >= 1")
+        self._snapshots: deque[tuple[float, tuple[tuple[str, float], ...]]] = deque(
+            maxlen=max_snapshots
+        )
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def on_rates_updated(self, dto: CurrencyListDTO) -> None:
+        rates = tuple((item.code, item.value) for item in dto.items)
+        if self._snapshots and self._snapshots[-1][1] == rates:
+            return
+        self._snapshots.append((self._clock(), rates))
+
+    def iter_records(
+        self,
+        since: Optional[float] = None,  # noqa: UP007
+        codes: Optional[Collection[str]] = None,  # noqa: UP007
+    ) -> Iterator[tuple[float, str, float]]:
+        """Записи (unix-время, код, курс) от старых к новым.
+
+        Итерация идет по копии списка ссылок на снимки, поэтому новые курсы,
+        пришедшие во время долгой выгрузки, ее не ломают.
+        """
+        for timestamp, rates in list(self._snapshots):
+            if since is not None and timestamp < since:
+                continue
+            for code, value in rates:
+                if codes is None or code in codes:
+                    yield timestamp, code, value
@@ -0,0 +1,28 @@
+from collections.abc import Mapping
+from typing import Optional
+
+from core.exceptions import CurrencyNotFoundError
+
+
+def rebase_rates(
+    rates: Mapping[str, float],
+    from_base: str,
+    to_base: str,
+    pivot: Optional[float] = None,  # noqa: UP007
+) -> dict[str, float]:
+    """Курсы к from_base ({code: сколько from_base стоит code}) -> курсы к to_base.
+
+    Делитель — цена to_base в from_base: берется из rates, а если to_base
+    там нет (источник котирует не все валюты) — из pivot. Сама from_base
+    попадает в результат с курсом 1 / pivot, to_base из результата исключается.
+    """
+    if from_base == to_base:
+        return dict(rates)
+    pivot = rates.get(to_base, pivot)
+    if pivot is None or pivot <= 0:
+        raise CurrencyNotFoundError(
+            f"Нет курса {to_base} к {from_base} для пересчета курсов"
+        )
+    rebased = {code: rate / pivot for code, rate in rates.items() if code != to_base}
+    rebased[from_base] = 1 / pivot
+    return rebased
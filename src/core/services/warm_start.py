@@ -0,0 +1,48 @@
+import logging
+import time
+from collections.abc import Callable, Sequence
+from typing import Optional
+
+from core.exceptions import PortfolioError
+from core.interface.portfolio import IPortfolio
+from core.interface.rates_cache import IRatesCache
+from core.interface.rates_listener import IRatesListener
+
+
+logger = logging.getLogger(__name__)
+
+
+def restore_cached_rates(
+    cache: IRatesCache,
+    repo: IPortfolio,
+    max_age: float,
+    listeners: Sequence[IRatesListener] = (),
+    clock: Callable[[], float] = time.time,
+) -> Optional[float]:  # noqa: UP007
+    """Загрузить сохраненные курсы в repo до первого тика планировщика.
+
+    Время получения снимка сохраняется в repo (Last-Modified/Age ответов
+    показывают настоящий возраст курсов). listeners — те, кто должен
+    получить курсы в этом же процессе (например, общий сегмент воркеров).
+    Возвращает возраст снимка в секундах или None, если он не использован.
+    """
+    loaded = cache.load()
+    if loaded is None:
+        return None
+    dto, fetched_at = loaded
+    age = max(clock() - fetched_at, 0.0)
+    if age > max_age:
+        logger.info("Cached rates are %.0fs old (limit %.0fs), ignored", age, max_age)
+        return None
+    try:
+        repo.restore_rates(dto, fetched_at)
+    except PortfolioError as e:
+        logger.warning(f"Cached rates rejected: {e}")
+        return None
+    for listener in listeners:
+        try:
+            listener.on_rates_updated(dto)
+        except Exception:
+            logger.exception(f"Rates listener {type(listener).__name__} failed")
+    logger.info("Warm start: %s cached rates, %.0fs old", len(dto.items), age)
+    return age
@@ -0,0 +1,184 @@
+import asyncio
+import contextlib
+import logging
+import time
+from collections import deque
+from collections.abc import Callable, Collection, Sequence
+from itertools import groupby
+
+from core.dto.webhook_dto import WebhookMessageDTO
+from core.events.hub import EventHub
+from core.exceptions import WebhookError
+from core.interface.webhooks import IWebhookOutbox, IWebhookSender
+from shared.metrics import WEBHOOK_EVENTS
+
+
+logger = logging.getLogger(__name__)
+
+
+class WebhookDispatcher:
+    """Доставка событий EventHub во внешние системы через webhook.
+
+    Путь обновления курсов webhook не ждет: публикация в EventHub только
+    кладет событие в очередь подписки, а dispatcher в своей задаче
+    переносит события в буфер в памяти (не больше max_buffer, при
+    переполнении вытесняются старые) и затем пачкой в outbox — в потоке,
+    чтобы запись на диск не блокировала event loop.
+
+    Из outbox события забираются на lease секунд, группируются по url и
+    уходят пачками до batch_size событий: не больше max_concurrency
+    POST одновременно, пачки одного url — по порядку. Неудачная пачка и
+    все следующие за ней события этого url повторяются с экспоненциальной
+    задержкой backoff_base * 2**attempts (не больше backoff_max); после
+    max_attempts попыток событие отбрасывается.
+
+    Тело пачки: {"events": [{"id", "topic", "created_at", "data"}, ...]},
+    id — ключ идемпотентности (доставка at-least-once).
+    """
+
+    def __init__(
+        self,
+        outbox: IWebhookOutbox,
+        sender: IWebhookSender,
+        urls: Sequence[str],
+        hub: EventHub,
+        *,
+        topics: Collection[str] = ("rates", "total", "alerts"),
+        batch_size: int = 100,
+        max_concurrency: int = 4,
+        max_attempts: int = 10,
+        backoff_base: float = 1.0,
+        backoff_max: float = 300.0,
+        poll_interval: float = 1.0,
+        lease: float = 60.0,
+        max_buffer: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if batch_size < 1 or max_concurrency < 1:
+            raise ValueError("batch_size and max_concurrency must be >= 1")
+        self._outbox = outbox
+        self._sender = sender
+        self._urls = tuple(dict.fromkeys(urls))
+        self._hub = hub
+        self._topics = frozenset(topics)
+        self._batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._claim_limit = batch_size * max_concurrency
+        self._max_attempts = max_attempts
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+        self._poll_interval = poll_interval
+        self._lease = lease
+        self._buffer: deque[tuple[str, str, str, float]] = deque()
+        self._max_buffer = max_buffer
+        self._clock = clock
+        self._wakeup = asyncio.Event()
+
+    def enqueue(self, topic: str, data: str) -> None:
+        """Поставить событие в очередь на все url; не блокирует и не ждет I/O"""
+        now = self._clock()
+        for url in self._urls:
+            if len(self._buffer) >= self._max_buffer:
+                self._buffer.popleft()
+                WEBHOOK_EVENTS.labels("dropped_buffer").inc()
+            self._buffer.append((url, topic, data, now))
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """Подписка на EventHub и цикл доставки; до отмены задачи"""
+        subscription = self._hub.subscribe(replay_last=False)
+
+        async def forward() -> None:
+            while True:
+                event = await subscription.get()
+                if event.topic in self._topics:
+                    self.enqueue(event.topic, event.data)
+
+        forward_task = asyncio.create_task(forward())
+        try:
+            while True:
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+                self._wakeup.clear()
+                try:
+                    # Полная выборка — в outbox есть еще готовые события
+                    while await self.flush() >= self._claim_limit:
+                        pass
+                except Exception:
+                    logger.exception("Webhook delivery failed")
+        finally:
+            forward_task.cancel()
+            self._hub.unsubscribe(subscription)
+
+    async def flush(self) -> int:
+        """Сохранить буфер в outbox и отправить готовые события; вернуть их число"""
+        await self._persist()
+        messages = await asyncio.to_thread(
+            self._outbox.claim, self._clock(), self._lease, self._claim_limit
+        )
+        if not messages:
+            return 0
+        by_url = groupby(sorted(messages, key=lambda m: (m.url, m.id)), lambda m: m.url)
+        await asyncio.gather(
+            *(self._deliver_url(url, list(group)) for url, group in by_url)
+        )
+        return len(messages)
+
+    async def aclose(self) -> None:
+        """Сохранить неотправленный буфер и закрыть клиент и outbox"""
+        try:
+            await self._persist()
+        finally:
+            await self._sender.aclose()
+            await asyncio.to_thread(self._outbox.close)
+
+    async def _persist(self) -> None:
+        if not self._buffer:
+            return
+        rows = list(self._buffer)
+        self._buffer.clear()
+        evicted = await asyncio.to_thread(self._outbox.add, rows)
+        if evicted:
+            WEBHOOK_EVENTS.labels("dropped_outbox").inc(evicted)
+
+    async def _deliver_url(self, url: str, messages: list[WebhookMessageDTO]) -> None:
+        for start in range(0, len(messages), self._batch_size):
+            batch = messages[start : start + self._batch_size]
+            try:
+                async with self._semaphore:
+                    await self._sender.send(url, self._encode(batch))
+            except WebhookError as e:
+                logger.warning(f"{e}; {len(messages) - start} events will be retried")
+                await self._retry(messages[start:])
+                return
+            await asyncio.to_thread(self._outbox.ack, [m.id for m in batch])
+            WEBHOOK_EVENTS.labels("delivered").inc(len(batch))
+
+    async def _retry(self, messages: list[WebhookMessageDTO]) -> None:
+        expired = [m.id for m in messages if m.attempts + 1 >= self._max_attempts]
+        if expired:
+            logger.error(f"Dropping {len(expired)} webhook events after max attempts")
+            await asyncio.to_thread(self._outbox.ack, expired)
+            WEBHOOK_EVENTS.labels("dropped_attempts").inc(len(expired))
+        now = self._clock()
+        expired_ids = set(expired)
+        pending = [m for m in messages if m.id not in expired_ids]
+        # Задержка растет с числом попыток каждого события
+        for attempts, group in groupby(
+            sorted(pending, key=lambda m: m.attempts), lambda m: m.attempts
+        ):
+            delay = min(self._backoff_base * 2**attempts, self._backoff_max)
+            await asyncio.to_thread(
+                self._outbox.retry, [m.id for m in group], now + delay
+            )
+        WEBHOOK_EVENTS.labels("retried").inc(len(pending))
+
+    @staticmethod
+    def _encode(batch: Sequence[WebhookMessageDTO]) -> bytes:
+        # data уже JSON: собираем тело без повторной сериализации
+        events = ",".join(
+            f'{{"id":{m.id},"topic":"{m.topic}","created_at":{m.created_at!r},'
+            f'"data":{m.data}}}'
+            for m in batch
+        )
+        return f'{{"events":[{events}]}}'.encode()
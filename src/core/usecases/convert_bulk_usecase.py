@@ -0,0 +1,21 @@
+import logging
+from core.dto.currency_dto import BulkConversionDTO, ConvertedAmountsDTO
+from core.exceptions import CurrencyNotFoundError, PortfolioError
+from core.interface.portfolio import IPortfolio
+from shared.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+class Usecase:
+    def __init__(self, repo: IPortfolio) -> None:
+        self._repo = repo
+
+    @traced("usecase.convert_bulk")
+    async def __call__(self, dto: BulkConversionDTO) -> ConvertedAmountsDTO:
+        try:
+            res = self._repo.convert_bulk(dto=dto)
+        except (CurrencyNotFoundError, PortfolioError) as e:
+            logger.warning(f"Bulk conversion failed for {len(dto.amounts)} rows: {e}")
+            raise e  # Пробрасываем специальное исключение
+        return res
@@ -1,7 +1,9 @@
 import logging
+from typing import Optional
 from core.dto.currency_dto import CurrencyDTO
 from core.exceptions import CurrencyNotFoundError
 from core.interface.portfolio import IPortfolio
+from shared.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -10,9 +12,12 @@ class Usecase:
     def __init__(self, repo: IPortfolio) -> None:
         self._repo = repo
 
-    async def __call__(self, currency: str) -> CurrencyDTO:
+    @traced("usecase.get_currency")
+    async def __call__(
+        self, currency: str, base: Optional[str] = None  # noqa: UP007
+    ) -> CurrencyDTO:
         try:
-            res = self._repo.get_rate(currency=currency)
+            res = self._repo.get_rate(currency=currency, base=base)
         except CurrencyNotFoundError as e:
             logger.warning(f"Currency not found: {currency}")
             raise e  # Пробрасываем специальное исключение
@@ -1,7 +1,9 @@
 import logging
+from typing import Optional
 from core.dto.currency_dto import SummaryCurrencyDTO
 from core.exceptions import PortfolioError
 from core.interface.portfolio import IPortfolio
+from shared.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -10,9 +12,12 @@ class Usecase:
     def __init__(self, repo: IPortfolio) -> None:
         self._repo = repo
 
-    async def __call__(self) -> SummaryCurrencyDTO:
+    @traced("usecase.get_full_amount")
+    async def __call__(
+        self, in_currency: Optional[str] = None  # noqa: UP007
+    ) -> SummaryCurrencyDTO:
         try:
-            res = self._repo.get_portfolio_summary()
+            res = self._repo.get_portfolio_summary(in_currency=in_currency)
         except PortfolioError as e:
             logger.exception("Ошибка Usecase")
             raise e  # Пробрасываем специальное исключение
@@ -0,0 +1,31 @@
+import logging
+from collections.abc import Sequence
+from typing import Optional
+from core.dto.currency_dto import BatchRatesDTO
+from core.exceptions import CurrencyNotFoundError
+from core.interface.portfolio import IPortfolio
+from shared.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+class Usecase:
+    def __init__(self, repo: IPortfolio) -> None:
+        self._repo = repo
+
+    @traced("usecase.get_rates")
+    async def __call__(
+        self,
+        currencies: Sequence[str],
+        with_matrix: bool = False,
+        base: Optional[str] = None,  # noqa: UP007
+    ) -> BatchRatesDTO:
+        try:
+            # Курсы и матрица — из одного чтения: иначе между ними могут
+            # обновиться курсы (например, в общем сегменте воркеров)
+            return self._repo.get_batch_rates(
+                currencies=currencies, with_matrix=with_matrix, base=base
+            )
+        except CurrencyNotFoundError as e:
+            logger.warning(f"Currencies not found: {currencies}")
+            raise e  # Пробрасываем специальное исключение
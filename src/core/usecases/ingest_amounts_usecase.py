@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterable, Callable
+from typing import Optional, Union
+
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    CurrencyAmountDTO,
+    IngestChunkResultDTO,
+    IngestLineErrorDTO,
+    IngestReportDTO,
+    UpdateCurrencyAmountDTO,
+    UpdateCurrencyAmountListDTO,
+)
+from core.exceptions import PortfolioError
+from core.interface.portfolio import IPortfolio
+from shared.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+MODE_SET = "set"
+MODE_MODIFY = "modify"
+
+Row = Union[CurrencyAmountDTO, UpdateCurrencyAmountDTO]  # noqa: UP007
+
+
+class Usecase:
+    """Потоковая загрузка изменений сумм порциями по chunk_size строк.
+
+    Каждая порция применяется одним вызовом репозитория (set_multiple_amounts
+    или modify_multiple_amounts) и либо применяется целиком, либо отклоняется
+    целиком. Нераспознанные строки пропускаются и попадают в ошибки порции
+    (не больше max_line_errors на порцию). В памяти — одна порция, и после
+    каждой порции управление отдается event loop.
+    """
+
+    def __init__(
+        self,
+        repo: IPortfolio,
+        chunk_size: int = 1000,
+        max_line_errors: int = 20,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be >= 1")
+        self._repo = repo
+        self._chunk_size = chunk_size
+        self._max_line_errors = max_line_errors
+
+    @traced("usecase.ingest_amounts")
+    async def __call__(
+        self,
+        lines: AsyncIterable[Optional[bytes]],  # noqa: UP007
+        parse: Callable[[bytes], Row],
+        mode: str = MODE_SET,
+    ) -> IngestReportDTO:
+        """
+        :param lines: строки NDJSON; None — строка отброшена как слишком длинная
+        :param parse: строка -> DTO строки; ValueError — строка некорректна
+        """
+        if mode not in (MODE_SET, MODE_MODIFY):
+            raise PortfolioError(f"Неизвестный режим загрузки: {mode}")
+
+        chunks: list[IngestChunkResultDTO] = []
+        rows: list[Row] = []
+        line_errors: list[IngestLineErrorDTO] = []
+        failed_lines = 0
+        first_line = line_no = 0
+
+        async for raw in lines:
+            line_no += 1
+            if not rows and not failed_lines:
+                first_line = line_no
+            if raw is not None and not raw.strip():
+                # Пустые строки (в т.ч. завершающий перевод строки) не ошибка
+                continue
+            try:
+                if raw is None:
+                    raise ValueError("Line is too long")
+                rows.append(parse(raw))
+            except ValueError as e:
+                failed_lines += 1
+                if len(line_errors) < self._max_line_errors:
+                    line_errors.append(IngestLineErrorDTO(line=line_no, error=str(e)))
+            if len(rows) + failed_lines >= self._chunk_size:
+                result = self._apply(len(chunks), first_line, line_no, rows, mode)
+                result.failed += failed_lines
+                result.line_errors = line_errors
+                chunks.append(result)
+                rows, line_errors, failed_lines = [], [], 0
+                await asyncio.sleep(0)
+
+        if rows or failed_lines:
+            result = self._apply(len(chunks), first_line, line_no, rows, mode)
+            result.failed += failed_lines
+            result.line_errors = line_errors
+            chunks.append(result)
+
+        return IngestReportDTO(
+            chunks=chunks,
+            lines=line_no,
+            applied=sum(chunk.applied for chunk in chunks),
+            failed=sum(chunk.failed for chunk in chunks),
+            version=self._repo.amount_version,
+        )
+
+    def _apply(
+        self, index: int, first_line: int, last_line: int, rows: list[Row], mode: str
+    ) -> IngestChunkResultDTO:
+        result = IngestChunkResultDTO(
+            chunk=index,
+            first_line=first_line,
+            last_line=last_line,
+            applied=0,
+            failed=0,
+            version=self._repo.amount_version,
+        )
+        if not rows:
+            return result
+        try:
+            if mode == MODE_SET:
+                self._repo.set_multiple_amounts(AmountCurrencyListDTO(items=rows))
+            else:
+                self._repo.modify_multiple_amounts(
+                    UpdateCurrencyAmountListDTO(items=rows)
+                )
+        except PortfolioError as e:
+            logger.info(f"Ingest chunk {index} rejected: {e}")
+            result.failed = len(rows)
+            result.error = str(e)
+            return result
+        result.applied = len(rows)
+        result.version = self._repo.amount_version
+        return result
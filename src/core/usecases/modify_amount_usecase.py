@@ -1,7 +1,9 @@
 import logging
+from typing import Optional
 from core.dto.currency_dto import AmountCurrencyListDTO, UpdateCurrencyAmountListDTO
-from core.exceptions import PortfolioError
+from core.exceptions import PortfolioError, VersionConflictError
 from core.interface.portfolio import IPortfolio
+from shared.tracing import traced
 
 logger = logging.getLogger(__name__)
 
@@ -10,9 +12,19 @@ class Usecase:
     def __init__(self, repo: IPortfolio) -> None:
         self._repo = repo
 
-    async def __call__(self, dto: UpdateCurrencyAmountListDTO) -> AmountCurrencyListDTO:
+    @traced("usecase.modify_amount")
+    async def __call__(
+        self,
+        dto: UpdateCurrencyAmountListDTO,
+        expected_version: Optional[int] = None,  # noqa: UP007
+    ) -> AmountCurrencyListDTO:
         try:
-            res = self._repo.modify_multiple_amounts(amounts=dto)
+            res = self._repo.modify_multiple_amounts(
+                amounts=dto, expected_version=expected_version
+            )
+        except VersionConflictError as e:
+            logger.info(f"Version conflict: {e}")
+            raise e
         except PortfolioError as e:
             logger.exception(f"Error: {dto.to_dict()}")
             raise e  # Пробрасываем специальное исключение
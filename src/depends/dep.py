@@ -1,12 +1,30 @@
 from collections.abc import Callable
+from pathlib import Path
 from typing import Optional
 
+from application.settings import Base
+from core.scheduler.interval_policy import AdaptiveIntervalPolicy
+from core.scheduler.multi_scheduler import MultiJobScheduler
 from core.scheduler.scheduler import Scheduler
 from core.dto.currency_dto import AmountCurrencyListDTO, CodeCurrencyListDTO
+from core.interface.interval_policy import IIntervalPolicy
+from core.interface.leader import ILeaderElector
+from core.interface.shared_rates import ISharedRates
 from core.interface.scheduler import IScheduler
 from core.repo.portfolio_repo import Portfolio
+from core.repo.shared_rates_portfolio import SharedRatesPortfolio
+from core.events.hub import EventHub
+from core.services.alert_engine import AlertEngine
+from core.services.rates_history import RatesHistory
+from core.services.webhook_dispatcher import WebhookDispatcher
 from core.interface.portfolio import IPortfolio
+from infra.cache.file_rates_cache import FileRatesCache
+from infra.leader.file_lock_elector import FileLockLeaderElector
+from infra.leader.file_rates_channel import FileRatesChannel
 from infra.services.currency.currency_service import CurrencyHTTP
+from infra.shm.rates_segment import SharedRatesSegment
+from infra.webhooks.http_sender import HttpxWebhookSender
+from infra.webhooks.sqlite_outbox import SqliteWebhookOutbox
 
 
 def json_keys() -> dict[str, str]:
@@ -24,9 +42,108 @@ def currency_http() -> CurrencyHTTP:
 def create_repo_portfolio(
     initial_amounts: AmountCurrencyListDTO,
     currencies: Optional[CodeCurrencyListDTO] = None,  # noqa: UP007
+    minor_units: bool = False,
+    base_currency: str = "RUB",
 ) -> IPortfolio:
-    return Portfolio(initial_amounts, currencies)
+    return Portfolio(
+        initial_amounts,
+        currencies,
+        minor_units=minor_units,
+        base_currency=base_currency,
+    )
 
 
-def create_scheduler(task: Callable, interval: int) -> IScheduler:
-    return Scheduler(task=task, interval=interval)
+def create_shared_rates_portfolio(
+    initial_amounts: AmountCurrencyListDTO,
+    shared_rates: ISharedRates,
+    currencies: Optional[CodeCurrencyListDTO] = None,  # noqa: UP007
+    minor_units: bool = False,
+    base_currency: str = "RUB",
+) -> IPortfolio:
+    return SharedRatesPortfolio(
+        initial_amounts,
+        shared_rates,
+        currencies,
+        minor_units=minor_units,
+        base_currency=base_currency,
+    )
+
+
+def create_rates_history(settings: Base) -> RatesHistory:
+    return RatesHistory(max_snapshots=settings.RATES_HISTORY_SIZE)
+
+
+def create_alert_engine(settings: Base, hub: EventHub) -> AlertEngine:
+    return AlertEngine(hub=hub, max_rules=settings.ALERTS_MAX_RULES)
+
+
+def create_webhook_dispatcher(settings: Base, hub: EventHub) -> WebhookDispatcher:
+    return WebhookDispatcher(
+        outbox=SqliteWebhookOutbox(
+            Path(settings.RUN_DIR) / "currency_rate.webhooks.sqlite3",
+            max_rows=settings.WEBHOOK_OUTBOX_MAX_ROWS,
+        ),
+        sender=HttpxWebhookSender(
+            timeout=settings.WEBHOOK_TIMEOUT,
+            max_connections=settings.WEBHOOK_MAX_CONCURRENCY,
+        ),
+        urls=settings.WEBHOOK_URLS,
+        hub=hub,
+        topics=settings.WEBHOOK_EVENTS,
+        batch_size=settings.WEBHOOK_BATCH_SIZE,
+        max_concurrency=settings.WEBHOOK_MAX_CONCURRENCY,
+        max_attempts=settings.WEBHOOK_MAX_ATTEMPTS,
+        backoff_base=settings.WEBHOOK_BACKOFF_BASE,
+        backoff_max=settings.WEBHOOK_BACKOFF_MAX,
+    )
+
+
+def create_rates_segment(settings: Base) -> SharedRatesSegment:
+    return SharedRatesSegment.create(capacity=settings.SHARED_RATES_CAPACITY)
+
+
+def attach_rates_segment(name: str) -> SharedRatesSegment:
+    return SharedRatesSegment.attach(name)
+
+
+def create_scheduler(
+    task: Callable,
+    interval: int,
+    policy: Optional[IIntervalPolicy] = None,  # noqa: UP007
+) -> IScheduler:
+    return Scheduler(task=task, interval=interval, policy=policy)
+
+
+def create_interval_policy(
+    period: int, settings: Base
+) -> Optional[IIntervalPolicy]:  # noqa: UP007
+    """Адаптивная политика опроса, если она включена в настройках"""
+    if not settings.ADAPTIVE_POLLING:
+        return None
+    return AdaptiveIntervalPolicy(
+        base_interval=period,
+        max_interval=max(settings.POLL_MAX_INTERVAL, period),
+        factor=settings.POLL_BACKOFF_FACTOR,
+        window_start=settings.PUBLISH_WINDOW_START,
+        window_end=settings.PUBLISH_WINDOW_END,
+        tz=settings.PUBLISH_TZ,
+    )
+
+
+def create_multi_scheduler() -> MultiJobScheduler:
+    return MultiJobScheduler()
+
+
+def create_leader_elector(settings: Base) -> ILeaderElector:
+    return FileLockLeaderElector(Path(settings.RUN_DIR) / "currency_rate.leader.lock")
+
+
+def create_rates_cache(settings: Base) -> FileRatesCache:
+    return FileRatesCache(
+        Path(settings.RUN_DIR) / "currency_rate.rates-cache.json",
+        base_currency=settings.BASE_CURRENCY,
+    )
+
+
+def create_rates_channel(settings: Base) -> FileRatesChannel:
+    return FileRatesChannel(Path(settings.RUN_DIR) / "currency_rate.rates.json")
@@ -0,0 +1,71 @@
+import json
+import logging
+import os
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Optional
+
+from core.dto.currency_dto import CurrencyDTO, CurrencyListDTO
+from core.interface.rates_cache import IRatesCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class FileRatesCache(IRatesCache):
+    """Снимок последних курсов в файле для быстрого старта.
+
+    Формат компактный: {"fetched_at": unix-время, "base": валюта курсов,
+    "rates": [[code, value], ...]}. Запись — через временный файл и
+    os.replace, поэтому при падении во время записи остается предыдущий
+    целый снимок. Снимок с другой базой (сменили BASE_CURRENCY) не
+    загружается.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        clock: Callable[[], float] = time.time,
+        base_currency: str = "RUB",
+    ) -> None:
+        self._path = path
+        self._clock = clock
+        self._base_currency = base_currency.upper()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def on_rates_updated(self, dto: CurrencyListDTO) -> None:
+        payload = {
+            "fetched_at": self._clock(),
+            "base": self._base_currency,
+            "rates": [[item.code, item.value] for item in dto.items],
+        }
+        tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, separators=(",", ":"))
+        os.replace(tmp_path, self._path)
+
+    def load(self) -> Optional[tuple[CurrencyListDTO, float]]:  # noqa: UP007
+        """Курсы и время их получения; None — снимка нет или он поврежден"""
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                payload = json.load(f)
+            base = payload.get("base", "RUB")
+            if base != self._base_currency:
+                logger.info(f"Ignoring rates cache quoted in {base}")
+                return None
+            dto = CurrencyListDTO(
+                items=[
+                    CurrencyDTO(code=code, value=float(value))
+                    for code, value in payload["rates"]
+                ]
+            )
+            return dto, float(payload["fetched_at"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable rates cache {self._path}: {e}")
+            return None
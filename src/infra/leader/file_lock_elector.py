@@ -0,0 +1,53 @@
+import fcntl
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from core.interface.leader import ILeaderElector
+
+
+logger = logging.getLogger(__name__)
+
+
+class FileLockLeaderElector(ILeaderElector):
+    """Выбор лидера через advisory-блокировку файла (flock).
+
+    Блокировку держит открытый дескриптор, поэтому при падении лидера ядро
+    освобождает ее само и следующий try_acquire другого процесса проходит.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._fd: Optional[int] = None  # noqa: UP007
+
+    @property
+    def is_leader(self) -> bool:
+        return self._fd is not None
+
+    def try_acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+
+        fd = os.open(self._path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        logger.info("Process %s became leader (lock %s)", os.getpid(), self._path)
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+        logger.info("Process %s released leadership", os.getpid())
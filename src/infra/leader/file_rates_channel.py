@@ -0,0 +1,56 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional
+
+from core.dto.currency_dto import CurrencyListDTO
+from core.interface.leader import IRatesChannel
+from core.interface.rates_listener import IRatesListener
+
+
+logger = logging.getLogger(__name__)
+
+
+class FileRatesChannel(IRatesChannel, IRatesListener):
+    """Публикация курсов лидером через файл с атомарной заменой.
+
+    Лидер пишет снимок во временный файл и делает os.replace, поэтому
+    читатели никогда не видят частично записанный файл. poll() стоит один
+    stat(), пока снимок не изменился.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._last_seen: Optional[tuple[int, int, int]] = None  # noqa: UP007
+
+    def publish(self, dto: CurrencyListDTO) -> None:
+        tmp_path = self._path.with_name(f"{self._path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(dto.to_dict(), f, separators=(",", ":"))
+        os.replace(tmp_path, self._path)
+        self._last_seen = self._stat_key()
+
+    def on_rates_updated(self, dto: CurrencyListDTO) -> None:
+        self.publish(dto)
+
+    def poll(self) -> Optional[CurrencyListDTO]:  # noqa: UP007
+        """Вернуть новый снимок курсов или None, если он не менялся."""
+        key = self._stat_key()
+        if key is None or key == self._last_seen:
+            return None
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read published rates: {e}")
+            return None
+        self._last_seen = key
+        return CurrencyListDTO.from_dict(data)
+
+    def _stat_key(self) -> Optional[tuple[int, int, int]]:  # noqa: UP007
+        try:
+            st = os.stat(self._path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
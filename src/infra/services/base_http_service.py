@@ -1,11 +1,16 @@
 import logging
-import httpx
 from collections.abc import Callable
 from typing import Generic, Optional
 
 from core.exceptions import ServiceError
-from src.core.interface.base_http_service import IBASEHTTPService
-from src.core.dto.base_dto import ListDTO
+from core.interface.base_http_service import IBASEHTTPService
+from core.dto.base_dto import ListDTO
+from shared.metrics import (
+    UPSTREAM_PARSE_SECONDS,
+    UPSTREAM_REQUEST_SECONDS,
+    UPSTREAM_REQUESTS,
+)
+from shared.tracing import span, traced
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +35,7 @@ class BASEHTTPService(IBASEHTTPService, Generic[ListDTO]):
             return self._url
         raise NotImplementedError("URL not configured")
 
+    @traced("upstream.execute")
     async def execute(
         self,
         *,
@@ -38,6 +44,9 @@ class BASEHTTPService(IBASEHTTPService, Generic[ListDTO]):
         filter_func: Optional[Callable[[dict], bool]] = None,  # noqa: UP007
     ) -> ListDTO:
         """Выполняет HTTP-запрос с логированием в debug-режиме"""
+        # httpx импортируется при первом запросе: он заметно удлиняет холодный старт
+        import httpx
+
         try:
             async with httpx.AsyncClient() as client:
                 # Логируем запрос если в debug-режиме
@@ -45,7 +54,11 @@ class BASEHTTPService(IBASEHTTPService, Generic[ListDTO]):
                     logger.debug("Making GET request to: %s", self.url)
                     logger.debug("Request headers: %s", client.headers)
 
-                response = await client.get(self.url)
+                with (
+                    span("upstream.request", url=self.url),
+                    UPSTREAM_REQUEST_SECONDS.time(),
+                ):
+                    response = await client.get(self.url)
 
                 # Логируем ответ если в debug-режиме
                 if self._debug:
@@ -55,7 +68,8 @@ class BASEHTTPService(IBASEHTTPService, Generic[ListDTO]):
                         "Response body (first 200 chars): %.200s...", response.text
                     )
 
-                data = response.json()
+                with span("upstream.parse"), UPSTREAM_PARSE_SECONDS.time():
+                    data = response.json()
 
                 # Логируем полученные данные
                 logger.info("Currency rates successfully received")
@@ -63,16 +77,19 @@ class BASEHTTPService(IBASEHTTPService, Generic[ListDTO]):
                     logger.debug("Full response data: %s", data)
 
                 # Преобразуем в DTO
-                dto = self.list_dto.from_dict(
-                    data=data,
-                    items_key=items_key,
-                    field_map=field_map,
-                    filter_func=filter_func,
-                )
+                with span("upstream.to_dto"):
+                    dto = self.list_dto.from_dict(
+                        data=data,
+                        items_key=items_key,
+                        field_map=field_map,
+                        filter_func=filter_func,
+                    )
 
+                UPSTREAM_REQUESTS.labels("ok").inc()
                 return dto
 
         except httpx.HTTPError as e:
+            UPSTREAM_REQUESTS.labels("http_error").inc()
             error_msg = f"HTTP request failed to {self.url}"
             if self._debug:
                 logger.exception(error_msg)
@@ -80,6 +97,7 @@ class BASEHTTPService(IBASEHTTPService, Generic[ListDTO]):
                 logger.error("%s: %s", error_msg, str(e))
             raise
         except Exception as e:
+            UPSTREAM_REQUESTS.labels("error").inc()
             logger.error("Unexpected error during request processing")
             if self._debug:
                 logger.exception("Error details:")
@@ -0,0 +1,124 @@
+import logging
+import struct
+import time
+from multiprocessing import shared_memory
+from typing import Optional
+
+from core.dto.currency_dto import CurrencyListDTO
+from core.interface.portfolio import IPortfolio
+from core.interface.rates_listener import IRatesListener
+from core.interface.shared_rates import ISharedRates
+
+
+logger = logging.getLogger(__name__)
+
+# seq (u64) | updated_at (f64, unix time получения курсов) | count (u32) | capacity (u32)
+_HEADER = struct.Struct("<QdII")
+# code (8 байт ASCII, дополняется \0) | value (f64)
+_ENTRY = struct.Struct("<8sd")
+
+
+class SharedRatesSegment(ISharedRates):
+    """Курсы валют в multiprocessing.shared_memory под seqlock.
+
+    Писатель один (процесс с планировщиком): делает seq нечетным, пишет
+    записи и время получения курсов и делает seq четным. Читатели разбирают
+    записи прямо из буфера сегмента и повторяют чтение, если seq был
+    нечетным или изменился.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool) -> None:
+        self._shm = shm
+        self._buf = shm.buf
+        self._owner = owner
+        self._capacity = _HEADER.unpack_from(self._buf, 0)[3]
+
+    @classmethod
+    def create(
+        cls, capacity: int = 256, name: Optional[str] = None  # noqa: UP007
+    ) -> "SharedRatesSegment":
+        size = _HEADER.size + capacity * _ENTRY.size
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        _HEADER.pack_into(shm.buf, 0, 0, 0.0, 0, capacity)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedRatesSegment":
+        # Воркеры запускаются через spawn и делят resource_tracker с владельцем,
+        # поэтому сегмент удаляется только владельцем в close()
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def version(self) -> int:
+        return _HEADER.unpack_from(self._buf, 0)[0] // 2
+
+    def write(
+        self, rates: dict[str, float], updated_at: Optional[float] = None  # noqa: UP007
+    ) -> None:
+        """Опубликовать курсы; updated_at — когда они получены (по умолчанию — сейчас)"""
+        if updated_at is None:
+            updated_at = time.time()
+        if len(rates) > self._capacity:
+            raise ValueError(
+                f"Too many rates for segment: {len(rates)} > {self._capacity}"
+            )
+        buf = self._buf
+        seq = _HEADER.unpack_from(buf, 0)[0]
+        _HEADER.pack_into(buf, 0, seq + 1, updated_at, 0, self._capacity)
+        offset = _HEADER.size
+        for code, value in rates.items():
+            _ENTRY.pack_into(buf, offset, code.encode("ascii"), value)
+            offset += _ENTRY.size
+        _HEADER.pack_into(buf, 0, seq + 2, updated_at, len(rates), self._capacity)
+
+    def snapshot(self) -> tuple[int, float, dict[str, float]]:
+        """Согласованный снимок (version, updated_at, {code: value}).
+
+        updated_at — 0.0, пока курсы не публиковались.
+        """
+        buf = self._buf
+        while True:
+            seq, updated_at, count, _ = _HEADER.unpack_from(buf, 0)
+            if seq % 2:
+                continue
+            rates = {
+                code.rstrip(b"\0").decode("ascii"): value
+                for code, value in _ENTRY.iter_unpack(
+                    buf[_HEADER.size : _HEADER.size + count * _ENTRY.size]
+                )
+            }
+            if _HEADER.unpack_from(buf, 0)[0] == seq:
+                return seq // 2, updated_at, rates
+
+    def close(self) -> None:
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class SharedRatesPublisher(IRatesListener):
+    """Пишет каждое обновление курсов в общий сегмент.
+
+    Время получения курсов берется из repo (для теплого старта — время
+    снимка в кэше), без repo — момент публикации.
+    """
+
+    def __init__(
+        self,
+        segment: SharedRatesSegment,
+        repo: Optional[IPortfolio] = None,  # noqa: UP007
+    ) -> None:
+        self._segment = segment
+        self._repo = repo
+
+    def on_rates_updated(self, dto: CurrencyListDTO) -> None:
+        updated_at = self._repo.rates_updated_at if self._repo is not None else None
+        self._segment.write(
+            {item.code: float(item.value) for item in dto.items}, updated_at
+        )
@@ -0,0 +1,63 @@
+import logging
+from typing import Any, Optional
+
+from core.exceptions import WebhookError
+from core.interface.webhooks import IWebhookSender
+from shared.metrics import WEBHOOK_DELIVERY_SECONDS
+
+
+logger = logging.getLogger(__name__)
+
+
+class HttpxWebhookSender(IWebhookSender):
+    """POST пачек через один httpx.AsyncClient с пулом соединений.
+
+    Клиент создается при первой отправке и переиспользуется: keep-alive
+    соединения к каждому получателю не открываются заново на каждую пачку.
+    Успех — любой 2xx, остальное — WebhookError (пачка уйдет повторно).
+    """
+
+    def __init__(
+        self,
+        timeout: float = 5.0,
+        max_connections: int = 4,
+        transport: Optional[Any] = None,  # noqa: UP007
+    ) -> None:
+        self._timeout = timeout
+        self._max_connections = max_connections
+        self._transport = transport
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            # httpx импортируется при первой отправке: он удлиняет холодный старт
+            import httpx
+
+            self._client = httpx.AsyncClient(
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def send(self, url: str, body: bytes) -> None:
+        import httpx
+
+        client = self._get_client()
+        try:
+            with WEBHOOK_DELIVERY_SECONDS.time():
+                response = await client.post(
+                    url, content=body, headers={"Content-Type": "application/json"}
+                )
+        except httpx.HTTPError as e:
+            raise WebhookError(f"Webhook {url} failed: {e!r}") from e
+        if not response.is_success:
+            raise WebhookError(f"Webhook {url} responded {response.status_code}")
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,129 @@
+import sqlite3
+import threading
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+
+from core.dto.webhook_dto import WebhookMessageDTO
+from core.interface.webhooks import IWebhookOutbox
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS webhook_outbox_due ON webhook_outbox (next_attempt_at, id);
+"""
+
+
+class SqliteWebhookOutbox(IWebhookOutbox):
+    """Очередь webhook-событий в sqlite (stdlib), переживает перезапуск.
+
+    claim продлевает next_attempt_at на lease секунд в той же транзакции,
+    поэтому несколько процессов с общим RUN_DIR не отправят одну пачку
+    дважды, а пачка процесса, упавшего во время отправки, уйдет повторно
+    после истечения lease. Пока у url есть выданные или отложенные до
+    повтора строки, его более новые строки не выдаются — события одного
+    url уходят по порядку. Размер очереди ограничен max_rows: при
+    переполнении вытесняются самые старые события.
+    """
+
+    def __init__(self, path: Path, max_rows: int = 100_000) -> None:
+        self._path = path
+        self._max_rows = max_rows
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count()
+
+    def add(self, rows: Sequence[tuple[str, str, str, float]]) -> int:
+        if not rows:
+            return 0
+        with self._lock, self._transaction():
+            self._conn.executemany(
+                "INSERT INTO webhook_outbox (url, topic, data, created_at)"
+                " VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            # id растут монотонно, поэтому строк не больше last - first + 1:
+            # COUNT(*) нужен, только если эта граница выше max_rows
+            first, last = self._conn.execute(
+                "SELECT (SELECT MIN(id) FROM webhook_outbox),"
+                " (SELECT MAX(id) FROM webhook_outbox)"
+            ).fetchone()
+            if last - first + 1 <= self._max_rows:
+                return 0
+            overflow = self._count() - self._max_rows
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM webhook_outbox WHERE id IN"
+                    " (SELECT id FROM webhook_outbox ORDER BY id LIMIT ?)",
+                    (overflow,),
+                )
+            return max(overflow, 0)
+
+    def claim(self, now: float, lease: float, limit: int) -> list[WebhookMessageDTO]:
+        with self._lock, self._transaction():
+            # url, у которого есть отложенные (повтор) или выданные строки,
+            # пропускается целиком: новые события не обгоняют старые
+            rows = self._conn.execute(
+                "SELECT id, url, topic, data, created_at, attempts FROM webhook_outbox"
+                " WHERE next_attempt_at <= ? AND url NOT IN"
+                " (SELECT url FROM webhook_outbox WHERE next_attempt_at > ?)"
+                " ORDER BY id LIMIT ?",
+                (now, now, limit),
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE webhook_outbox SET next_attempt_at = ? WHERE id = ?",
+                [(now + lease, row[0]) for row in rows],
+            )
+        return [WebhookMessageDTO(*row) for row in rows]
+
+    def ack(self, ids: Sequence[int]) -> None:
+        with self._lock, self._transaction():
+            self._conn.executemany(
+                "DELETE FROM webhook_outbox WHERE id = ?", [(id_,) for id_ in ids]
+            )
+
+    def retry(self, ids: Sequence[int], next_attempt_at: float) -> None:
+        with self._lock, self._transaction():
+            self._conn.executemany(
+                "UPDATE webhook_outbox SET attempts = attempts + 1, next_attempt_at = ?"
+                " WHERE id = ?",
+                [(next_attempt_at, id_) for id_ in ids],
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM webhook_outbox").fetchone()[0]
+
+    @contextmanager
+    def _transaction(self) -> Iterator[None]:
+        # BEGIN IMMEDIATE: блокировка записи берется сразу, а не при первом UPDATE
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
@@ -1,8 +1,7 @@
 import asyncio
 import logging
-import uvicorn
 
-from application.settings import settings
+from application.settings import get_settings
 
 
 logger = logging.getLogger(__name__)
@@ -10,10 +9,18 @@ logger = logging.getLogger(__name__)
 
 async def run_api_server(stop_event: asyncio.Event):
     """Запускает FastAPI сервер"""
+    settings = get_settings()
+    if settings.API_WORKERS > 1:
+        await _run_api_workers(stop_event)
+        return
+
+    import uvicorn
+
     config = uvicorn.Config(
-        "src.application.app:create_app",
-        host="0.0.0.0",
-        port=8000,
+        "application.app:create_app",
+        factory=True,
+        host=settings.API_HOST,
+        port=settings.API_PORT,
         log_level="debug" if settings.DEBUG else "info",
         reload=settings.DEBUG,
         lifespan="off",
@@ -41,3 +48,15 @@ async def run_api_server(stop_event: asyncio.Event):
         logger.info("run_api_server cancelled.")
     except Exception as e:
         logger.error(f"Unexpected error in run_api_server: {e}")
+
+
+async def _run_api_workers(stop_event: asyncio.Event):
+    """Несколько процессов API, читающих курсы из shared memory"""
+    from application.workers import run_workers
+
+    try:
+        await run_workers(stop_event, workers=get_settings().API_WORKERS)
+    except asyncio.CancelledError:
+        logger.info("run_api_server cancelled.")
+    except Exception as e:
+        logger.error(f"Unexpected error in run_api_server: {e}")
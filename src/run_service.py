@@ -2,10 +2,32 @@ import asyncio
 import logging
 
 from application.logger_settings import logging_setup
-from application.settings import settings
+from application.settings import get_settings
 from core.services.currency_service_http import CurrencyServiceHTTPUSECASE
-from depends.dep import create_repo_portfolio, create_scheduler, currency_http, json_keys
+from core.events.hub import EventHub
+from core.interface.scheduler import IScheduler
+from core.services.leader_fetcher import LeaderAwareFetcher
+from core.services.portfolio_notifier import PortfolioNotifier
+from core.services.warm_start import restore_cached_rates
+from depends.dep import (
+    create_alert_engine,
+    create_interval_policy,
+    create_leader_elector,
+    create_multi_scheduler,
+    create_rates_cache,
+    create_rates_history,
+    create_rates_channel,
+    create_rates_segment,
+    create_repo_portfolio,
+    create_scheduler,
+    create_webhook_dispatcher,
+    currency_http,
+    json_keys,
+)
+from infra.shm.rates_segment import SharedRatesPublisher
 from shared.arg_parse import mapper_args, parse_args
+from shared.loop_monitor import monitor_loop_lag
+from shared.tracing import recorder
 from application.state import app_state
 
 
@@ -15,21 +37,51 @@ logger = logging.getLogger(__name__)
 async def run_currency_service(stop_event: asyncio.Event):
     """Запускает сервис обновления курсов валют"""
     amounts_dict, currencies_dict, period, debug = parse_args()
+    settings = get_settings()
     settings.DEBUG = debug
     logging_setup(settings=settings)
+    recorder.configure(size=settings.TRACE_BUFFER_SIZE, enabled=settings.TRACING_ENABLED)
     logger.info("Currency service starting with debug=%s", debug)
 
     dto_amount, dto_currency = mapper_args(amounts_dict, currencies_dict)
     app_state.repo_portfolio = create_repo_portfolio(
-        initial_amounts=dto_amount, currencies=dto_currency
+        initial_amounts=dto_amount,
+        currencies=dto_currency,
+        minor_units=settings.AMOUNT_MINOR_UNITS,
+        base_currency=settings.BASE_CURRENCY,
     )
 
     currency_service = currency_http()
     uc = CurrencyServiceHTTPUSECASE(
         currency_service,
         app_state.repo_portfolio,
+        source_base=settings.RATES_SOURCE_BASE,
     )
-    scheduler = create_scheduler(task=uc.__call__, interval=period)
+    app_state.event_hub = EventHub(queue_size=settings.STREAM_QUEUE_SIZE)
+    app_state.notifier = PortfolioNotifier(app_state.repo_portfolio, app_state.event_hub)
+    uc.add_listener(app_state.notifier)
+    app_state.rates_history = create_rates_history(settings)
+    uc.add_listener(app_state.rates_history)
+    app_state.alert_engine = create_alert_engine(settings, app_state.event_hub)
+    uc.add_listener(app_state.alert_engine)
+    # Курсы из кэша задают базу для алертов: пересечение считается от них
+    local_listeners = [app_state.alert_engine]
+    if settings.API_WORKERS > 1:
+        segment = create_rates_segment(settings)
+        publisher = SharedRatesPublisher(segment, app_state.repo_portfolio)
+        local_listeners.append(publisher)
+        uc.add_listener(publisher)
+        app_state.shared_rates = segment
+    if settings.RATES_CACHE_ENABLED:
+        # Курсы с прошлого запуска отдаются сразу, первый тик обновит их в фоне
+        rates_cache = create_rates_cache(settings)
+        restore_cached_rates(
+            rates_cache,
+            app_state.repo_portfolio,
+            max_age=settings.RATES_CACHE_MAX_AGE,
+            listeners=local_listeners,
+        )
+        uc.add_listener(rates_cache)
 
     kwargs = {
         "url": settings.URL,
@@ -38,8 +90,30 @@ async def run_currency_service(stop_event: asyncio.Event):
         "field_map": json_keys(),
     }
 
+    if settings.LEADER_ELECTION:
+        scheduler = _create_leader_scheduler(uc, period, kwargs)
+    else:
+        scheduler = create_scheduler(
+            task=uc.__call__,
+            interval=period,
+            policy=create_interval_policy(period, settings),
+        )
+
+    app_state.scheduler = scheduler
     scheduler_task = asyncio.create_task(scheduler.start(kwargs=kwargs))
     stop_task = asyncio.create_task(stop_event.wait())
+    # Webhook отправляются в своей задаче: тик планировщика их не ждет
+    webhooks = (
+        create_webhook_dispatcher(settings, app_state.event_hub)
+        if settings.WEBHOOK_URLS
+        else None
+    )
+    webhook_task = asyncio.create_task(webhooks.run()) if webhooks else None
+    lag_task = (
+        asyncio.create_task(monitor_loop_lag(settings.LOOP_LAG_INTERVAL))
+        if settings.LOOP_LAG_INTERVAL > 0
+        else None
+    )
     try:
         done, _ = await asyncio.wait(
             [scheduler_task, stop_task],
@@ -56,7 +130,45 @@ async def run_currency_service(stop_event: asyncio.Event):
         logger.info("run_currency_service cancelled.")
     except Exception as e:
         logger.error(f"Unexpected error in run_cureency_service: {e}")
+    finally:
+        if lag_task is not None:
+            lag_task.cancel()
+        if webhooks is not None:
+            webhook_task.cancel()
+            await asyncio.gather(webhook_task, return_exceptions=True)
+            await webhooks.aclose()
+        if settings.API_WORKERS > 1:
+            segment.close()
 
     if stop_task in done:
         logger.info("Stop event received, shutting down scheduler...")
         await scheduler.shutdown()
+
+
+def _create_leader_scheduler(
+    uc: CurrencyServiceHTTPUSECASE, period: int, kwargs: dict
+) -> IScheduler:
+    """Курсы получает только процесс-лидер, остальные читают его публикации"""
+    settings = get_settings()
+    channel = create_rates_channel(settings)
+    uc.add_listener(channel)
+    fetcher = LeaderAwareFetcher(
+        uc=uc,
+        elector=create_leader_elector(settings),
+        channel=channel,
+    )
+    scheduler = create_multi_scheduler()
+    scheduler.add_job(
+        "fetch_rates",
+        fetcher.fetch,
+        interval=period,
+        kwargs=kwargs,
+        policy=create_interval_policy(period, settings),
+    )
+    scheduler.add_job(
+        "sync_rates",
+        fetcher.sync,
+        interval=settings.LEADER_SYNC_INTERVAL,
+        priority=1,
+    )
+    return scheduler
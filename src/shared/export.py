@@ -0,0 +1,50 @@
+import asyncio
+import csv
+import io
+import json
+from collections.abc import AsyncIterator, Iterable, Sequence
+from typing import Any
+
+NDJSON = "ndjson"
+CSV = "csv"
+MEDIA_TYPES = {
+    NDJSON: "application/x-ndjson",
+    CSV: "text/csv; charset=utf-8",
+}
+
+
+async def encode_rows(
+    rows: Iterable[Sequence[Any]],
+    fields: Sequence[str],
+    fmt: str,
+    chunk_rows: int = 1000,
+) -> AsyncIterator[bytes]:
+    """Строки выгрузки порциями по chunk_rows в NDJSON или CSV.
+
+    Первая порция (для CSV — заголовок) отдается сразу, в памяти одна
+    порция. Между порциями управление отдается event loop, чтобы длинная
+    выгрузка не задерживала остальные запросы.
+    """
+    buffer = io.StringIO()
+    if fmt == CSV:
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(fields)
+        write = writer.writerow
+    else:
+
+        def write(row: Sequence[Any]) -> None:
+            buffer.write(json.dumps(dict(zip(fields, row, strict=True))))
+            buffer.write("\n")
+
+    pending = 0
+    for row in rows:
+        write(row)
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+            await asyncio.sleep(0)
+    if buffer.tell():
+        yield buffer.getvalue().encode()
@@ -0,0 +1,25 @@
+import asyncio
+import logging
+
+from shared.metrics import EVENT_LOOP_LAG_SECONDS, SCHEDULER_TASKS_RUNNING
+
+
+logger = logging.getLogger(__name__)
+
+
+async def monitor_loop_lag(interval: float, warn_threshold: float = 0.5) -> None:
+    """Замеряет задержку event loop: насколько позже заказанного просыпается sleep.
+
+    Задержка пишется в event_loop_lag_seconds с меткой phase="tick", если в
+    этот момент выполняется задача планировщика, иначе phase="idle".
+    """
+    loop = asyncio.get_running_loop()
+    tick = EVENT_LOOP_LAG_SECONDS.labels("tick")
+    idle = EVENT_LOOP_LAG_SECONDS.labels("idle")
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - started - interval)
+        (tick if SCHEDULER_TASKS_RUNNING.value > 0 else idle).observe(lag)
+        if lag > warn_threshold:
+            logger.warning("Event loop lag %.3fs", lag)
@@ -0,0 +1,351 @@
+import math
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Generator, Iterable, Sequence
+from contextlib import contextmanager
+from functools import wraps
+from inspect import iscoroutinefunction
+from typing import Optional, Union
+
+# Секунды: от 100 мкс (разбор DTO, оценка портфеля) до 10 с (запрос к ЦБ)
+DEFAULT_BUCKETS = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)  # fmt: skip
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: dict[tuple[str, ...], object] = {}
+        if not self.labelnames:
+            self._children[()] = self._new_child()
+
+    def _new_child(self) -> object:
+        raise NotImplementedError
+
+    def labels(self, *values: str):
+        """Дочерняя серия для значений меток (создается один раз)"""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values}"
+                )
+            # setdefault атомарен под GIL: при гонке обе стороны получат одну серию
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    @property
+    def family(self) -> str:
+        return self.name
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.family} {self.documentation}"
+        yield f"# TYPE {self.family} {self.kind}"
+        for values, child in list(self._children.items()):
+            yield from self._render_child(values, child)
+
+    def _render_child(self, values: tuple[str, ...], child: object) -> Iterable[str]:
+        raise NotImplementedError
+
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class Counter(_Metric):
+    """Монотонный счетчик"""
+
+    kind = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    @property
+    def family(self) -> str:
+        return f"{self.name}_total"
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def _render_child(self, values, child) -> Iterable[str]:
+        labels = _format_labels(self.labelnames, values)
+        yield f"{self.family}{labels} {_format_value(child.value)}"
+
+
+class _GaugeChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+
+class Gauge(_Metric):
+    """Текущее значение (последняя запись побеждает)"""
+
+    kind = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    @property
+    def value(self) -> float:
+        return self._children[()].value
+
+    def set(self, value: float) -> None:
+        self._children[()].set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._children[()].inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._children[()].dec(amount)
+
+    def _render_child(self, values, child) -> Iterable[str]:
+        labels = _format_labels(self.labelnames, values)
+        yield f"{self.name}{labels} {_format_value(child.value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("_bounds", "counts", "sum")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self._bounds = bounds
+        # Последняя ячейка — +Inf; счетчики не накопительные, сумма при выводе
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self._bounds, value)] += 1
+        self.sum += value
+
+    @contextmanager
+    def time(self) -> Generator[None, None, None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+
+class Histogram(_Metric):
+    """Гистограмма с фиксированными границами ячеек (поиск через bisect)"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self._bounds = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self._bounds)
+
+    def observe(self, value: float) -> None:
+        self._children[()].observe(value)
+
+    def time(self):
+        return self._children[()].time()
+
+    def _render_child(self, values, child) -> Iterable[str]:
+        counts = list(child.counts)
+        cumulative = 0
+        for bound, count in zip((*self._bounds, math.inf), counts, strict=True):
+            cumulative += count
+            labels = _format_labels(
+                (*self.labelnames, "le"), (*values, _format_value(bound))
+            )
+            yield f"{self.name}_bucket{labels} {cumulative}"
+        labels = _format_labels(self.labelnames, values)
+        yield f"{self.name}_sum{labels} {_format_value(child.sum)}"
+        yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """Набор метрик процесса и вывод в текстовом формате Prometheus.
+
+    Запись не берет блокировок: каждое изменение — одна операция над
+    атрибутом, которую в рамках event loop никто не прерывает. Из потоков
+    возможна потеря единичного инкремента, что для метрик допустимо.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:  # noqa: UP007
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def timed(
+    histogram: Union[Histogram, _HistogramChild],  # noqa: UP007
+) -> Callable:
+    """Декоратор: длительность вызова (sync/async) в гистограмму"""
+
+    def decorator(func: Callable) -> Callable:
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - started)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+
+        return wrapper
+
+    return decorator
+
+
+# Метрики сервиса. Объявлены здесь, чтобы core и infra не зависели друг от друга
+UPSTREAM_REQUEST_SECONDS = registry.histogram(
+    "upstream_request_seconds", "Latency of the upstream rates HTTP request"
+)
+UPSTREAM_PARSE_SECONDS = registry.histogram(
+    "upstream_parse_seconds", "Time spent decoding the upstream JSON body"
+)
+UPSTREAM_REQUESTS = registry.counter(
+    "upstream_requests", "Upstream rates requests by outcome", ("outcome",)
+)
+DTO_CONVERT_SECONDS = registry.histogram(
+    "dto_convert_seconds", "Time spent building list DTOs from dicts", ("dto",)
+)
+DTO_ITEMS = registry.counter("dto_items", "Items converted into list DTOs", ("dto",))
+PORTFOLIO_VALUATION_SECONDS = registry.histogram(
+    "portfolio_valuation_seconds", "Portfolio valuation latency", ("method",)
+)
+SCHEDULER_TASK_SECONDS = registry.histogram(
+    "scheduler_task_seconds", "Duration of one scheduled task run"
+)
+SCHEDULER_RUNS = registry.counter(
+    "scheduler_runs", "Scheduled task runs by outcome", ("outcome",)
+)
+SCHEDULER_NEXT_INTERVAL_SECONDS = registry.gauge(
+    "scheduler_next_interval_seconds", "Delay before the next scheduled run"
+)
+SCHEDULER_TASKS_RUNNING = registry.gauge(
+    "scheduler_tasks_running", "Scheduled tasks currently executing"
+)
+EVENT_LOOP_LAG_SECONDS = registry.histogram(
+    "event_loop_lag_seconds",
+    "Event loop scheduling delay, split by whether a scheduler task is running",
+    ("phase",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+HTTP_REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+HTTP_REQUESTS = registry.counter(
+    "http_requests", "HTTP requests by status", ("method", "route", "status")
+)
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "HTTP requests admitted and not yet finished"
+)
+ADMISSION_REJECTED = registry.counter(
+    "admission_rejected", "Requests rejected by admission control", ("reason", "kind")
+)
+ALERT_RULES = registry.gauge("alert_rules", "Registered rate alert rules")
+ALERTS_TRIGGERED = registry.counter(
+    "alerts_triggered", "Rate alert rules fired by a rates update", ("direction",)
+)
+ALERT_EVALUATION_SECONDS = registry.histogram(
+    "alert_evaluation_seconds", "Time spent finding crossed alert rules per update"
+)
+WEBHOOK_EVENTS = registry.counter(
+    "webhook_events", "Webhook events by outcome", ("outcome",)
+)
+WEBHOOK_DELIVERY_SECONDS = registry.histogram(
+    "webhook_delivery_seconds", "Latency of one webhook batch POST"
+)
@@ -0,0 +1,92 @@
+"""Суммы в целых минорных единицах (копейки, центы) без Decimal.
+
+Количество валюты хранится как int: amount * 10**exponent, где exponent —
+число знаков после запятой по ISO 4217. Курсы — точные десятичные дроби
+numerator / 10**k по кратчайшей записи float, без потери знаков у малых
+курсов. Произведения и суммы таких чисел в int точны, а округление
+выполняется один раз — при делении в конце, по правилу half-even
+(банковское округление).
+"""
+
+# Валюты с exponent, отличным от 2 (ISO 4217)
+_EXPONENTS = {
+    "BHD": 3,
+    "BIF": 0,
+    "CLP": 0,
+    "DJF": 0,
+    "GNF": 0,
+    "IQD": 3,
+    "ISK": 0,
+    "JOD": 3,
+    "JPY": 0,
+    "KMF": 0,
+    "KRW": 0,
+    "KWD": 3,
+    "LYD": 3,
+    "OMR": 3,
+    "PYG": 0,
+    "RWF": 0,
+    "TND": 3,
+    "UGX": 0,
+    "UYI": 0,
+    "VND": 0,
+    "VUV": 0,
+    "XAF": 0,
+    "XOF": 0,
+    "XPF": 0,
+}
+DEFAULT_EXPONENT = 2
+# Общий масштаб хранения: любая сумма кратна 10**-MAX_EXPONENT
+MAX_EXPONENT = 3
+
+
+def minor_exponent(code: str) -> int:
+    return _EXPONENTS.get(code.upper(), DEFAULT_EXPONENT)
+
+
+def to_minor(amount: float, exponent: int) -> int:
+    """Число -> целые минорные единицы, half-even по точному значению float.
+
+    round(amount, exponent) округляет по точному двоичному значению (0.285 —
+    это 0.28499..., поэтому 28), умножение на 10**exponent дает почти целое,
+    которое второй round() доводит до int без потерь.
+    """
+    return round(round(amount, exponent) * 10**exponent)
+
+
+def from_minor(units: int, exponent: int) -> float:
+    return units / 10**exponent
+
+
+def to_scaled(amount: float, code: str) -> int:
+    """Сумма, округленная до знаков валюты, в единицах 10**-MAX_EXPONENT.
+
+    Общий масштаб позволяет складывать суммы разных валют без поправочных
+    множителей в цикле.
+    """
+    exponent = minor_exponent(code)
+    return to_minor(amount, exponent) * 10 ** (MAX_EXPONENT - exponent)
+
+
+def decimal_ratio(value: float) -> tuple[int, int]:
+    """float -> (numerator, 10**k) по кратчайшей десятичной записи (repr).
+
+    0.00314159265 -> (314159265, 10**11): все значащие цифры курса, в отличие
+    от округления до фиксированного числа знаков.
+    """
+    mantissa, _, exp = repr(value).partition("e")
+    whole, _, fraction = mantissa.partition(".")
+    digits = len(fraction) - int(exp or 0)
+    numerator = int(whole + fraction)
+    if digits < 0:
+        return numerator * 10**-digits, 1
+    return numerator, 10**digits
+
+
+def div_round_half_even(numerator: int, denominator: int) -> int:
+    """Целочисленное деление с округлением half-even (denominator > 0)"""
+    quotient, remainder = divmod(numerator, denominator)
+    twice = 2 * remainder
+    if twice > denominator or (twice == denominator and quotient % 2):
+        quotient += 1
+    return quotient
@@ -0,0 +1,39 @@
+from collections.abc import AsyncIterable, AsyncIterator
+from typing import Optional
+
+
+async def iter_lines(
+    chunks: AsyncIterable[bytes], max_line_bytes: int
+) -> AsyncIterator[Optional[bytes]]:  # noqa: UP007
+    """Строки NDJSON из потока байтов без накопления всего тела.
+
+    В памяти держится не больше одной строки. Строка длиннее max_line_bytes
+    отбрасывается целиком, вместо нее отдается None — номер строки
+    сохраняется, и вызывающий может сообщить об ошибке. Пустые строки
+    тоже отдаются (b""), чтобы нумерация совпадала с исходным файлом.
+    """
+    buffer = bytearray()
+    oversized = False
+    async for chunk in chunks:
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end == -1:
+                if not oversized:
+                    buffer += chunk[start:]
+                    if len(buffer) > max_line_bytes:
+                        oversized = True
+                        buffer.clear()
+                break
+            if oversized or len(buffer) + end - start > max_line_bytes:
+                yield None
+            else:
+                buffer += chunk[start:end]
+                yield bytes(buffer).rstrip(b"\r")
+            buffer.clear()
+            oversized = False
+            start = end + 1
+    if oversized:
+        yield None
+    elif buffer:
+        yield bytes(buffer).rstrip(b"\r")
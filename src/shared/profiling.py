@@ -0,0 +1,201 @@
+import gc
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from collections.abc import Iterable
+from types import FrameType
+from typing import Any, Optional
+
+
+class ProfilerBusyError(RuntimeError):
+    """Профилирование уже запущено"""
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", code.co_filename)
+    return f"{module}:{code.co_name}"
+
+
+def _collapse(frame: Optional[FrameType]) -> str:  # noqa: UP007
+    stack = []
+    while frame is not None:
+        stack.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(stack))
+
+
+class SamplingProfiler:
+    """Сэмплирующий профайлер стека одного потока (обычно — event loop).
+
+    Отдельный поток раз в interval секунд читает текущий кадр целевого
+    потока через sys._current_frames() и считает одинаковые стеки. Целевой
+    поток не останавливается и не трассируется, поэтому накладные расходы
+    есть только пока идет профилирование. Результат — collapsed stacks
+    (`a;b;c count`), формат flamegraph.pl / speedscope.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    @property
+    def busy(self) -> bool:
+        return self._lock.locked()
+
+    def run(
+        self, thread_id: int, duration: float, interval: float = 0.005
+    ) -> Counter[str]:
+        """Блокирующий сбор сэмплов; вызывать из отдельного потока"""
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("Profiler is already running")
+        try:
+            samples: Counter[str] = Counter()
+            deadline = time.monotonic() + duration
+            while time.monotonic() < deadline:
+                frame = sys._current_frames().get(thread_id)
+                if frame is None:
+                    break
+                samples[_collapse(frame)] += 1
+                del frame
+                time.sleep(interval)
+            return samples
+        finally:
+            self._lock.release()
+
+    @staticmethod
+    def format_collapsed(samples: Counter[str]) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
+
+
+class AllocationProfiler:
+    """tracemalloc по запросу: снимки, разница со снимком-базой и перепись DTO.
+
+    DTO считаются по классу объекта (type_prefixes). Сущности core.entity —
+    TypedDict, их экземпляры — обычные dict, поэтому они считаются через
+    владельцев: у объектов из container_prefixes вызывается iter_entities().
+    Пока не вызван start(), tracemalloc выключен и ничего не стоит.
+    Каждый snapshot() сравнивается с предыдущим и становится новой базой.
+    start(), snapshot() и stop() обходят всю кучу — из event loop их
+    вызывают через asyncio.to_thread.
+    """
+
+    def __init__(
+        self,
+        type_prefixes: Iterable[str] = ("core.dto",),
+        container_prefixes: Iterable[str] = ("core.repo",),
+    ):
+        self._type_prefixes = tuple(type_prefixes)
+        self._container_prefixes = tuple(container_prefixes)
+        self._baseline: Optional[tracemalloc.Snapshot] = None  # noqa: UP007
+        self._baseline_types: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        with self._lock:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(frames)
+            self._baseline = self._take_snapshot()
+            self._baseline_types = self.type_census()
+
+    def stop(self) -> None:
+        with self._lock:
+            tracemalloc.stop()
+            self._baseline = None
+            self._baseline_types = {}
+
+    def snapshot(self, limit: int = 20) -> dict[str, Any]:
+        """Топ аллокаций по модулям и строкам + перепись DTO, с разницей к базе"""
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not started")
+        with self._lock:
+            snapshot = self._take_snapshot()
+            types = self.type_census()
+            baseline, baseline_types = self._baseline, self._baseline_types
+            self._baseline, self._baseline_types = snapshot, types
+
+        current, peak = tracemalloc.get_traced_memory()
+        result: dict[str, Any] = {
+            "traced_bytes": current,
+            "peak_bytes": peak,
+            "top_lines": [self._stat(s) for s in snapshot.statistics("lineno")[:limit]],
+            "types": self._types_diff(types, baseline_types),
+        }
+        if baseline is not None:
+            diff = snapshot.compare_to(baseline, "lineno")
+            result["diff_lines"] = [self._stat_diff(s) for s in diff[:limit]]
+        return result
+
+    @staticmethod
+    def _take_snapshot() -> tracemalloc.Snapshot:
+        """Снимок без собственных аллокаций tracemalloc и профилировщика"""
+        return tracemalloc.take_snapshot().filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+
+    def type_census(self) -> dict[str, dict[str, int]]:
+        """Число и неглубокий размер живых экземпляров классов DTO/сущностей"""
+        counts: Counter[str] = Counter()
+        sizes: Counter[str] = Counter()
+        for obj in gc.get_objects():
+            cls = type(obj)
+            module = cls.__module__
+            if module.startswith(self._type_prefixes):
+                name = f"{module}.{cls.__qualname__}"
+                counts[name] += 1
+                sizes[name] += sys.getsizeof(obj)
+            elif module.startswith(self._container_prefixes) and hasattr(
+                obj, "iter_entities"
+            ):
+                for entity_type, entity in obj.iter_entities():
+                    name = f"{entity_type.__module__}.{entity_type.__qualname__}"
+                    counts[name] += 1
+                    sizes[name] += sys.getsizeof(entity)
+        return {name: {"count": counts[name], "bytes": sizes[name]} for name in counts}
+
+    @staticmethod
+    def _types_diff(
+        current: dict[str, dict[str, int]], baseline: dict[str, dict[str, int]]
+    ) -> dict[str, dict[str, int]]:
+        result = {}
+        for name in current.keys() | baseline.keys():
+            now = current.get(name, {"count": 0, "bytes": 0})
+            before = baseline.get(name, {"count": 0, "bytes": 0})
+            result[name] = {
+                **now,
+                "count_diff": now["count"] - before["count"],
+                "bytes_diff": now["bytes"] - before["bytes"],
+            }
+        return dict(sorted(result.items(), key=lambda kv: -kv[1]["bytes"]))
+
+    @staticmethod
+    def _stat(stat: tracemalloc.Statistic) -> dict[str, Any]:
+        frame = stat.traceback[0]
+        return {
+            "where": f"{frame.filename}:{frame.lineno}",
+            "bytes": stat.size,
+            "count": stat.count,
+        }
+
+    @staticmethod
+    def _stat_diff(stat: tracemalloc.StatisticDiff) -> dict[str, Any]:
+        frame = stat.traceback[0]
+        return {
+            "where": f"{frame.filename}:{frame.lineno}",
+            "bytes": stat.size,
+            "bytes_diff": stat.size_diff,
+            "count": stat.count,
+            "count_diff": stat.count_diff,
+        }
+
+
+sampling_profiler = SamplingProfiler()
+allocation_profiler = AllocationProfiler()
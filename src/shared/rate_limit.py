@@ -0,0 +1,88 @@
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+
+class TokenBucket:
+    """Корзина токенов: rate токенов в секунду, не больше burst.
+
+    Пополнение ленивое — по времени, прошедшему с прошлого обращения,
+    поэтому корзина не требует фоновой задачи.
+    """
+
+    __slots__ = ("rate", "burst", "_tokens", "_updated", "_clock")
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be a positive number")
+        if burst < 1:
+            raise ValueError("burst must be >= 1")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, cost: float = 1.0) -> float:
+        """Списать cost токенов.
+
+        Возвращает 0, если запрос пропущен, иначе через сколько секунд
+        токенов станет достаточно (ничего не списывается). Cost больше burst
+        считается равным burst, иначе такой запрос не прошел бы никогда.
+        """
+        cost = min(cost, self.burst)
+        self._refill()
+        if self._tokens >= cost:
+            self._tokens -= cost
+            return 0.0
+        return (cost - self._tokens) / self.rate
+
+
+class KeyedRateLimiter:
+    """Корзины по ключу клиента с вытеснением давно неактивных (LRU).
+
+    Вытесненный клиент при следующем запросе получает полную корзину — это
+    не хуже, чем если бы он простоял без запросов burst / rate секунд.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        max_keys: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._rate = rate
+        self._burst = burst
+        self._max_keys = max_keys
+        self._clock = clock
+        self._buckets: OrderedDict[Hashable, TokenBucket] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def try_acquire(self, key: Hashable, cost: float = 1.0) -> float:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = TokenBucket(self._rate, self._burst, self._clock)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self._max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket.try_acquire(cost)
@@ -0,0 +1,155 @@
+import itertools
+import json
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from inspect import iscoroutinefunction
+from pathlib import Path
+from typing import Any, Optional
+
+from shared.logutils import ctx_request_id
+
+
+@dataclass(slots=True)
+class Span:
+    trace_id: str
+    span_id: int
+    parent_id: Optional[int]  # noqa: UP007
+    name: str
+    start: float
+    duration_us: int = 0
+    error: Optional[str] = None  # noqa: UP007
+    attrs: dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class SpanRecorder:
+    """Кольцевой буфер завершенных span'ов в памяти процесса."""
+
+    def __init__(self, size: int = 10_000, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._spans: deque[Span] = deque(maxlen=size)
+
+    def configure(self, size: int, enabled: bool) -> None:
+        self.enabled = enabled
+        if size != self._spans.maxlen:
+            self._spans = deque(self._spans, maxlen=size)
+
+    def record(self, span: Span) -> None:
+        self._spans.append(span)
+
+    def spans(
+        self,
+        limit: Optional[int] = None,  # noqa: UP007
+        trace_id: Optional[str] = None,  # noqa: UP007
+    ) -> list[Span]:
+        spans = list(self._spans)
+        if trace_id is not None:
+            spans = [s for s in spans if s.trace_id == trace_id]
+        return spans[-limit:] if limit else spans
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """count/p50/p95/p99/max длительности (мс) по имени span'а"""
+        by_name: dict[str, list[int]] = {}
+        for s in list(self._spans):
+            by_name.setdefault(s.name, []).append(s.duration_us)
+
+        result = {}
+        for name, durations in by_name.items():
+            durations.sort()
+            n = len(durations)
+            result[name] = {
+                "count": n,
+                "p50_ms": durations[int(n * 0.50)] / 1000,
+                "p95_ms": durations[min(int(n * 0.95), n - 1)] / 1000,
+                "p99_ms": durations[min(int(n * 0.99), n - 1)] / 1000,
+                "max_ms": durations[-1] / 1000,
+            }
+        return result
+
+    def dump(self, path: Path) -> int:
+        """Выгрузить буфер в файл NDJSON, вернуть число span'ов"""
+        spans = list(self._spans)
+        with open(path, "w", encoding="utf-8") as f:
+            for s in spans:
+                f.write(json.dumps(s.to_dict(), ensure_ascii=False))
+                f.write("\n")
+        return len(spans)
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+recorder = SpanRecorder()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar(  # noqa: UP007
+    "CurrentSpan", default=None
+)
+_span_ids = itertools.count(1)
+
+
+def new_trace_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Generator[Optional[Span], None, None]:  # noqa: UP007
+    """Замер участка кода; вложенные span'ы связываются через contextvar."""
+    if not recorder.enabled:
+        yield None
+        return
+
+    parent = _current_span.get()
+    if parent is not None:
+        trace_id = parent.trace_id
+    else:
+        trace_id = ctx_request_id.get() or new_trace_id()
+    current = Span(
+        trace_id=trace_id,
+        span_id=next(_span_ids),
+        parent_id=parent.span_id if parent else None,
+        name=name,
+        start=time.time(),
+        attrs=attrs,
+    )
+    token = _current_span.set(current)
+    started = time.perf_counter_ns()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = type(e).__name__
+        raise
+    finally:
+        current.duration_us = (time.perf_counter_ns() - started) // 1000
+        _current_span.reset(token)
+        recorder.record(current)
+
+
+def traced(name: str) -> Callable:
+    """Декоратор span'а для обычных и async функций"""
+
+    def decorator(func: Callable) -> Callable:
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(name):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,48 @@
+import os
+
+import pytest
+from application.state import app_state
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    CodeCurrencyDTO,
+    CodeCurrencyListDTO,
+    CurrencyAmountDTO,
+    CurrencyDTO,
+    CurrencyListDTO,
+)
+from core.repo.portfolio_repo import Portfolio
+from starlette.testclient import TestClient
+
+os.environ.setdefault("PROJ_ENV", "test")
+
+
+@pytest.fixture
+def repo():
+    repo = Portfolio(
+        AmountCurrencyListDTO(
+            items=[
+                CurrencyAmountDTO(code="USD", amount=100.0),
+                CurrencyAmountDTO(code="EUR", amount=200.0),
+                CurrencyAmountDTO(code="RUB", amount=5000.0),
+            ]
+        ),
+        CodeCurrencyListDTO(
+            items=[CodeCurrencyDTO(code=code) for code in ("USD", "EUR", "RUB")]
+        ),
+    )
+    repo.data = CurrencyListDTO(
+        items=[CurrencyDTO(code="USD", value=90.0), CurrencyDTO(code="EUR", value=100.0)]
+    )
+    previous, app_state.repo_portfolio = app_state.repo_portfolio, repo
+    yield repo
+    app_state.repo_portfolio = previous
+
+
+@pytest.fixture
+def api(repo):
+    """Клиент приложения и префикс маршрутов"""
+    from application.app import create_app
+    from application.settings import settings
+
+    with TestClient(create_app()) as client:
+        yield client, settings.GLOBAL_PREFIX_URL
@@ -0,0 +1,101 @@
+import asyncio
+
+import httpx
+import pytest
+from application.middleware.admission import AdmissionMiddleware
+from shared.rate_limit import KeyedRateLimiter, TokenBucket
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=3, clock=clock)
+
+    assert [bucket.try_acquire() for _ in range(3)] == [0, 0, 0]
+    assert bucket.try_acquire() == pytest.approx(0.5)
+
+    clock.now = 0.5
+    assert bucket.try_acquire() == 0
+    # Стоимость больше burst ограничивается burst
+    clock.now = 10
+    assert bucket.try_acquire(cost=100) == 0
+
+
+def test_keyed_limiter_is_per_client_and_bounded():
+    clock = FakeClock()
+    limiter = KeyedRateLimiter(rate=1, burst=1, max_keys=2, clock=clock)
+
+    assert limiter.try_acquire("a") == 0
+    assert limiter.try_acquire("a") > 0
+    assert limiter.try_acquire("b") == 0
+    limiter.try_acquire("c")
+    assert len(limiter) == 2
+    # "a" вытеснен как самый давний и начинает с полной корзины
+    assert limiter.try_acquire("a") == 0
+
+
+def make_app(gate: asyncio.Event, **options):
+    async def slow(request):
+        await gate.wait()
+        return PlainTextResponse("ok")
+
+    async def health(request):
+        return PlainTextResponse("healthy")
+
+    app = Starlette(
+        routes=[
+            Route("/slow", slow, methods=["GET", "POST"]),
+            Route("/health", health),
+        ]
+    )
+    return AdmissionMiddleware(app, exempt_paths=("/health",), **options)
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_returns_429_with_retry_after():
+    gate = asyncio.Event()
+    gate.set()
+    app = make_app(gate, rate=1, burst=5, write_cost=5)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        assert (await client.post("/slow")).status_code == 200
+        rejected = await client.get("/slow")
+        assert rejected.status_code == 429
+        assert int(rejected.headers["Retry-After"]) >= 1
+        assert (await client.get("/health")).status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_sheds_writes_before_reads_and_spares_health():
+    gate = asyncio.Event()
+    app = make_app(gate, max_concurrency=3, read_reserve=1)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        held = [asyncio.create_task(client.post("/slow")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        assert app.in_flight == 2
+
+        write = await client.post("/slow")
+        assert write.status_code == 503
+        assert write.headers["Retry-After"] == "1"
+
+        read = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.01)
+        assert app.in_flight == 3
+        assert (await client.get("/slow")).status_code == 503
+        assert (await client.get("/health")).status_code == 200
+
+        gate.set()
+        responses = await asyncio.gather(*held, read)
+        assert [r.status_code for r in responses] == [200, 200, 200]
+        assert app.in_flight == 0
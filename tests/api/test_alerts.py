@@ -0,0 +1,50 @@
+import pytest
+from application.state import app_state
+from core.services.alert_engine import AlertEngine
+
+
+@pytest.fixture
+def engine():
+    engine = AlertEngine(max_rules=3)
+    previous, app_state.alert_engine = app_state.alert_engine, engine
+    yield engine
+    app_state.alert_engine = previous
+
+
+def test_alert_crud(api, engine):
+    client, prefix = api
+    response = client.post(
+        f"{prefix}/alerts", json={"code": "usd", "threshold": 95, "direction": "above"}
+    )
+    assert response.status_code == 201
+    rule = response.json()
+    assert rule["code"] == "USD"
+    assert (rule["threshold"], rule["direction"]) == (95, "above")
+    client.post(f"{prefix}/alerts", json={"code": "EUR", "threshold": 110})
+
+    assert client.get(f"{prefix}/alerts/{rule['id']}").json() == rule
+    listed = client.get(f"{prefix}/alerts", params={"code": "usd"}).json()
+    assert listed == {"items": [rule]}
+
+    assert client.delete(f"{prefix}/alerts/{rule['id']}").status_code == 204
+    assert client.get(f"{prefix}/alerts/{rule['id']}").status_code == 404
+    assert client.delete(f"{prefix}/alerts/{rule['id']}").status_code == 404
+
+
+def test_alert_validation_and_limit(api, engine):
+    client, prefix = api
+    bad = client.post(f"{prefix}/alerts", json={"code": "USD", "threshold": -1})
+    assert bad.status_code == 422
+    for _ in range(3):
+        client.post(f"{prefix}/alerts", json={"code": "USD", "threshold": 1})
+    over = client.post(f"{prefix}/alerts", json={"code": "USD", "threshold": 1})
+    assert over.status_code == 422
+
+
+def test_alerts_unavailable_without_engine(api):
+    client, prefix = api
+    previous, app_state.alert_engine = app_state.alert_engine, None
+    try:
+        assert client.get(f"{prefix}/alerts").status_code == 503
+    finally:
+        app_state.alert_engine = previous
@@ -0,0 +1,38 @@
+import pytest
+from application.state import app_state
+from starlette.websockets import WebSocketDisconnect
+
+
+@pytest.fixture
+def worker():
+    previous, app_state.is_api_worker = app_state.is_api_worker, True
+    yield
+    app_state.is_api_worker = previous
+
+
+def test_worker_rejects_amount_writes_but_serves_reads(api, repo, worker):
+    client, prefix = api
+    amount = client.get(f"{prefix}/amount/get")
+    assert amount.status_code == 200
+
+    writes = [
+        client.post(
+            f"{prefix}/amount/set", json={"items": [{"code": "USD", "amount": 1.0}]}
+        ),
+        client.put(
+            f"{prefix}/amount/modify", json={"items": [{"code": "USD", "delta": 1.0}]}
+        ),
+        client.post(f"{prefix}/amount/ingest", content=b'{"code": "USD", "amount": 1}\n'),
+    ]
+    assert [response.status_code for response in writes] == [503, 503, 503]
+    assert repo.get_amount_one("USD") == 100.0
+    assert client.get(f"{prefix}/amount/get").headers["ETag"] == amount.headers["ETag"]
+
+
+def test_worker_has_no_event_stream(api, worker):
+    client, prefix = api
+    assert client.get(f"{prefix}/stream/sse").status_code == 503
+    with pytest.raises(WebSocketDisconnect) as e:
+        with client.websocket_connect(f"{prefix}/stream/ws") as ws:
+            ws.receive_text()
+    assert e.value.code == 1013
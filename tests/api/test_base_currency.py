@@ -0,0 +1,33 @@
+def test_rates_and_summary_in_requested_base(api, repo):
+    client, prefix = api
+
+    assert client.get(f"{prefix}/USD", params={"base": "EUR"}).json() == {
+        "code": "USD",
+        "value": 0.9,
+    }
+    batch = client.get(
+        f"{prefix}/rates/batch", params={"codes": "USD,RUB", "base": "usd"}
+    ).json()
+    assert batch["base"] == "USD"
+    assert [item["value"] for item in batch["rates"]["items"]] == [1.0, 1 / 90]
+
+    summary = client.get(f"{prefix}/amount/get", params={"base": "EUR"}).json()
+    assert summary["total"] == {"code": "EUR", "total_amount": 340.0}
+
+    assert client.get(f"{prefix}/USD", params={"base": "GBP"}).status_code == 404
+    assert client.get(f"{prefix}/export/rates", params={"base": "GBP"}).status_code == 404
+
+
+def test_rate_of_base_currency_is_one(api):
+    client, prefix = api
+
+    for path, params in (
+        ("/RUB", {}),
+        ("/RUB", {"base": "RUB"}),
+        ("/USD", {"base": "USD"}),
+    ):
+        response = client.get(f"{prefix}{path}", params=params)
+        assert response.status_code == 200
+        assert response.json()["value"] == 1.0
+    batch = client.get(f"{prefix}/rates/batch", params={"codes": "USD", "base": "USD"})
+    assert batch.json()["rates"]["items"] == [{"code": "USD", "value": 1.0}]
@@ -0,0 +1,90 @@
+import asyncio
+from email.utils import formatdate
+
+import pytest
+from application.api.cache import is_not_modified, set_rates_cache_headers
+from application.state import app_state
+from core.scheduler.scheduler import Scheduler
+from fastapi import Response
+
+
+class FixedScheduler:
+    def __init__(self, next_run_in):
+        self._next_run_in = next_run_in
+
+    def next_run_in(self):
+        return self._next_run_in
+
+
+@pytest.fixture
+def scheduler():
+    previous, app_state.scheduler = app_state.scheduler, FixedScheduler(120.0)
+    yield app_state.scheduler
+    app_state.scheduler = previous
+
+
+def test_max_age_covers_age_and_time_to_next_fetch():
+    response = Response()
+    set_rates_cache_headers(response, updated_at=1000.0, next_run_in=50.0, now=1030.0)
+
+    assert response.headers["Age"] == "30"
+    assert response.headers["Cache-Control"] == "public, max-age=80"
+    assert response.headers["Last-Modified"] == formatdate(1000.0, usegmt=True)
+
+
+def test_unknown_next_run_requires_revalidation():
+    response = Response()
+    set_rates_cache_headers(response, updated_at=1000.0, next_run_in=None, now=1000.0)
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    response = Response()
+    set_rates_cache_headers(response, updated_at=None, next_run_in=10.0)
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert "Last-Modified" not in response.headers
+
+
+def test_is_not_modified():
+    stamp = formatdate(1000.0, usegmt=True)
+    assert is_not_modified(stamp, 1000.5)
+    assert not is_not_modified(stamp, 1001.0)
+    assert not is_not_modified("garbage", 1000.0)
+    assert not is_not_modified(None, 1000.0)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_reports_next_run():
+    async def task():
+        return None
+
+    scheduler = Scheduler(task=task, interval=30)
+    assert scheduler.next_run_in() is None
+    runner = asyncio.create_task(scheduler.start(kwargs={}))
+    await asyncio.sleep(0.01)
+    assert 29 < scheduler.next_run_in() <= 30
+    await scheduler.shutdown()
+    await runner
+    assert scheduler.next_run_in() is None
+
+
+def test_rate_endpoint_headers_and_conditional_get(api, scheduler):
+    client, prefix = api
+    response = client.get(f"{prefix}/USD")
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"].startswith("public, max-age=")
+    assert int(response.headers["Cache-Control"].rsplit("=", 1)[1]) >= 120
+    last_modified = response.headers["Last-Modified"]
+
+    cached = client.get(f"{prefix}/USD", headers={"If-Modified-Since": last_modified})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["Last-Modified"] == last_modified
+
+
+def test_batch_without_scheduler_is_revalidated(api):
+    client, prefix = api
+    response = client.get(f"{prefix}/rates/batch?codes=USD,EUR")
+
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert "Last-Modified" in response.headers
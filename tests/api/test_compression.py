@@ -0,0 +1,122 @@
+import gzip
+import zlib
+
+import pytest
+from application.api.encoding import (
+    JSON_MEDIA_TYPE,
+    MSGPACK_MEDIA_TYPE,
+    available_media_types,
+    negotiate_media_type,
+)
+from application.middleware.compression import CompressionMiddleware
+from fastapi import HTTPException
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+BIG = "x" * 5000
+
+
+async def big(request):
+    return PlainTextResponse(BIG)
+
+
+async def small(request):
+    return PlainTextResponse("ok")
+
+
+async def ndjson(request):
+    async def lines():
+        for i in range(3):
+            yield f'{{"i": {i}}}\n' * 100
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+async def events(request):
+    async def lines():
+        yield "data: 1\n\n"
+
+    return StreamingResponse(lines(), media_type="text/event-stream")
+
+
+@pytest.fixture
+def client():
+    app = Starlette(
+        routes=[
+            Route("/big", big),
+            Route("/small", small),
+            Route("/ndjson", ndjson),
+            Route("/events", events),
+        ]
+    )
+    return TestClient(CompressionMiddleware(app, minimum_size=1024))
+
+
+def raw_get(client, path, encoding="gzip"):
+    # decode_content=False: проверяем байты как они пришли по сети
+    with client.stream("GET", path, headers={"Accept-Encoding": encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_large_response_is_gzipped_with_length_and_vary(client):
+    response, body = raw_get(client, "/big")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) == len(body) < len(BIG)
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert gzip.decompress(body).decode() == BIG
+
+
+def test_small_response_and_identity_are_not_compressed(client):
+    response, body = raw_get(client, "/small")
+    assert "content-encoding" not in response.headers
+    assert body == b"ok"
+
+    response, body = raw_get(client, "/big", encoding="identity")
+    assert "content-encoding" not in response.headers
+
+
+def test_streaming_response_is_compressed_incrementally(client):
+    response, body = raw_get(client, "/ndjson")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    text = zlib.decompress(body, 31).decode()
+    assert text.count("\n") == 300
+
+
+def test_event_stream_is_never_compressed(client):
+    response, body = raw_get(client, "/events")
+    assert "content-encoding" not in response.headers
+    assert body == b"data: 1\n\n"
+
+
+def test_negotiation_prefers_highest_q_and_wildcards_to_json():
+    assert negotiate_media_type(None) == JSON_MEDIA_TYPE
+    assert negotiate_media_type("text/html, */*;q=0.1") == JSON_MEDIA_TYPE
+    if MSGPACK_MEDIA_TYPE in available_media_types():
+        accept = "application/json;q=0.5, application/x-msgpack"
+        assert negotiate_media_type(accept) == MSGPACK_MEDIA_TYPE
+
+
+def test_negotiation_rejects_unsupported_types():
+    with pytest.raises(HTTPException) as exc:
+        negotiate_media_type("text/html, application/json;q=0")
+    assert exc.value.status_code == 406
+
+
+def test_compressed_response_gets_its_own_strong_etag():
+    async def tagged(request):
+        return PlainTextResponse(BIG, headers={"ETag": '"5"'})
+
+    async def weak(request):
+        return PlainTextResponse(BIG, headers={"ETag": 'W/"5"'})
+
+    app = Starlette(routes=[Route("/tagged", tagged), Route("/weak", weak)])
+    client = TestClient(CompressionMiddleware(app, minimum_size=1024))
+
+    assert raw_get(client, "/tagged")[0].headers["etag"] == '"5-gzip"'
+    assert raw_get(client, "/tagged", encoding="identity")[0].headers["etag"] == '"5"'
+    assert raw_get(client, "/weak")[0].headers["etag"] == 'W/"5"'
@@ -0,0 +1,13 @@
+from application.settings import settings
+
+
+def test_spans_require_admin_token(api, monkeypatch):
+    client, prefix = api
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", None)
+    assert client.get(f"{prefix}/diagnostics/spans").status_code == 403
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    for path in ("/diagnostics/spans", "/diagnostics/spans/summary"):
+        assert client.get(f"{prefix}{path}").status_code == 401
+        response = client.get(f"{prefix}{path}", headers={"X-Admin-Token": "secret"})
+        assert response.status_code == 200
@@ -0,0 +1,53 @@
+import pytest
+
+MODIFY = {"items": [{"code": "USD", "delta": 1.0}]}
+
+
+def modify(client, prefix, if_match):
+    return client.put(
+        f"{prefix}/amount/modify", json=MODIFY, headers={"If-Match": if_match}
+    )
+
+
+def test_amount_get_and_writes_return_etag(api):
+    client, prefix = api
+    etag = client.get(f"{prefix}/amount/get").headers["ETag"]
+
+    response = modify(client, prefix, etag)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert client.get(f"{prefix}/amount/get").headers["ETag"] == response.headers["ETag"]
+
+
+def test_stale_if_match_is_rejected(api, repo):
+    client, prefix = api
+    stale = client.get(f"{prefix}/amount/get").headers["ETag"]
+    assert modify(client, prefix, stale).status_code == 200
+
+    response = modify(client, prefix, stale)
+
+    assert response.status_code == 412
+    assert repo.get_amount_one("USD") == 101.0
+
+
+@pytest.mark.parametrize(
+    ("template", "status"),
+    [
+        ("{etag}", 200),
+        ('"999", {etag}', 200),
+        ("*", 200),
+        ("W/{etag}", 412),
+        ('"{version}-gzip"', 200),
+        ('"{version}-deflate"', 412),
+        ('"999"', 412),
+        ("1", 400),
+        ('"1" junk', 400),
+    ],
+)
+def test_if_match_parsing(api, template, status):
+    client, prefix = api
+    etag = client.get(f"{prefix}/amount/get").headers["ETag"]
+    if_match = template.format(etag=etag, version=etag.strip('"'))
+
+    assert modify(client, prefix, if_match).status_code == status
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from application.state import app_state
+from core.dto.currency_dto import CurrencyDTO, CurrencyListDTO
+from core.services.rates_history import RatesHistory
+
+
+def rates(usd, eur):
+    return CurrencyListDTO(
+        items=[CurrencyDTO(code="USD", value=usd), CurrencyDTO(code="EUR", value=eur)]
+    )
+
+
+@pytest.fixture
+def history():
+    clock = iter([1000.0, 2000.0, 3000.0, 4000.0])
+    history = RatesHistory(max_snapshots=2, clock=lambda: next(clock))
+    previous, app_state.rates_history = app_state.rates_history, history
+    yield history
+    app_state.rates_history = previous
+
+
+def test_history_keeps_only_changed_snapshots_within_bound(history):
+    history.on_rates_updated(rates(90, 100))
+    history.on_rates_updated(rates(90, 100))
+    history.on_rates_updated(rates(91, 100))
+    history.on_rates_updated(rates(92, 101))
+
+    assert len(history) == 2
+    assert list(history.iter_records(codes={"USD"})) == [
+        (2000.0, "USD", 91),
+        (3000.0, "USD", 92),
+    ]
+
+
+def test_export_holdings_csv(api):
+    client, prefix = api
+    response = client.get(f"{prefix}/export/holdings?format=csv")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines() == [
+        "code,amount",
+        "USD,100.0",
+        "EUR,200.0",
+        "RUB,5000.0",
+    ]
+
+
+def test_export_rates_ndjson(api):
+    client, prefix = api
+    response = client.get(f"{prefix}/export/rates")
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == [{"code": "USD", "value": 90.0}, {"code": "EUR", "value": 100.0}]
+
+
+def test_export_history_filters(api, history):
+    history.on_rates_updated(rates(90, 100))
+    history.on_rates_updated(rates(91, 101))
+    client, prefix = api
+
+    response = client.get(
+        f"{prefix}/export/history",
+        params={"since": "1970-01-01T00:20:00", "codes": "eur"},
+    )
+
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert rows == [
+        {"timestamp": "1970-01-01T00:33:20+00:00", "code": "EUR", "value": 101}
+    ]
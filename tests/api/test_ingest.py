@@ -0,0 +1,65 @@
+import json
+
+import pytest
+from shared.ndjson import iter_lines
+
+
+async def collect(chunks, max_line_bytes=16):
+    async def source():
+        for chunk in chunks:
+            yield chunk
+
+    return [line async for line in iter_lines(source(), max_line_bytes)]
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_splits_across_chunks_and_drops_long_lines():
+    lines = await collect([b'{"a"', b':1}\r\n\n{"b":2}\n', b"x" * 40, b"\nlast"])
+    assert lines == [b'{"a":1}', b"", b'{"b":2}', None, b"last"]
+
+
+def ndjson(rows):
+    return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+def test_ingest_applies_chunks_and_reports_line_errors(api, repo):
+    client, prefix = api
+    body = ndjson([{"code": "USD", "amount": i} for i in range(5)])
+    body += b"not json\n" + ndjson([{"code": "EUR", "amount": 7}])
+
+    response = client.post(f"{prefix}/amount/ingest?chunk_size=3", content=body)
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["lines"], report["applied"], report["failed"]) == (7, 6, 1)
+    # Порция — chunk_size строк файла, включая нераспознанные
+    assert [c["applied"] for c in report["chunks"]] == [3, 2, 1]
+    assert report["chunks"][1]["failed"] == 1
+    assert report["chunks"][1]["line_errors"][0]["line"] == 6
+    assert (report["chunks"][1]["first_line"], report["chunks"][1]["last_line"]) == (4, 6)
+    assert report["version"] == repo.amount_version
+    assert repo.get_amount_one("USD") == 4
+    assert repo.get_amount_one("EUR") == 7
+
+
+def test_ingest_modify_rejects_whole_chunk(api, repo):
+    client, prefix = api
+    body = ndjson(
+        [
+            {"code": "USD", "delta": 10},
+            {"code": "EUR", "delta": -500},
+            {"code": "USD", "delta": 1},
+        ]
+    )
+
+    response = client.post(
+        f"{prefix}/amount/ingest?mode=modify&chunk_size=2", content=body
+    )
+
+    first, second = response.json()["chunks"]
+    assert first["failed"] == 2
+    assert "EUR" in first["error"]
+    assert second["applied"] == 1
+    # Первая порция не применена даже частично
+    assert repo.get_amount_one("USD") == 101
+    assert repo.get_amount_one("EUR") == 200
@@ -0,0 +1,144 @@
+"""Бенчмарки горячих путей.
+
+Выключены по умолчанию. Запуск:
+
+    BENCHMARK=1 PYTHONPATH=src pytest tests/benchmarks -q
+
+Результат сравнивается с baselines.json: тест падает, если лучшее из
+повторов время хуже базы больше чем на BENCHMARK_THRESHOLD (по умолчанию 0.25 = 25%).
+BENCHMARK_UPDATE=1 перезаписывает базы текущими значениями; без него файл не
+меняется, а замеры без базы только перечисляются в отчете. Базы зависят от
+машины — обновляйте их на той же машине, где сравниваете.
+"""
+
+import json
+import os
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+# Конфигурация для create_app и настроек в бенчмарках API
+os.environ.setdefault("PROJ_ENV", "test")
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+SIZES = (10, 100, 1_000, 10_000, 100_000)
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("BENCHMARK"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks are opt-in: set BENCHMARK=1")
+    for item in items:
+        if "benchmarks" in item.nodeid.split("::")[0]:
+            item.add_marker(skip)
+
+
+class Bench:
+    """Замер времени одной операции (лучшее из repeat серий) и сравнение с базой"""
+
+    def __init__(
+        self, baselines: dict[str, float], threshold: float, update: bool
+    ) -> None:
+        self._baselines = baselines
+        self._threshold = threshold
+        self._update = update
+        self.results: dict[str, float] = {}
+
+    @staticmethod
+    def _number(single: float, budget: float = 0.05) -> int:
+        # Повторов столько, чтобы одна серия длилась ~budget секунд
+        return max(1, min(10_000, int(budget / max(single, 1e-7))))
+
+    def __call__(
+        self, name: str, func: Callable[..., Any], *args: Any, repeat: int = 7
+    ) -> float:
+        started = time.perf_counter()
+        func(*args)
+        number = self._number(time.perf_counter() - started)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                func(*args)
+            timings.append((time.perf_counter() - started) / number)
+        return self._check(name, min(timings))
+
+    async def run_async(
+        self, name: str, func: Callable[[], Awaitable[Any]], repeat: int = 7
+    ) -> float:
+        started = time.perf_counter()
+        await func()
+        number = self._number(time.perf_counter() - started)
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(number):
+                await func()
+            timings.append((time.perf_counter() - started) / number)
+        return self._check(name, min(timings))
+
+    def _check(self, name: str, seconds: float) -> float:
+        self.results[name] = seconds
+        baseline = self._baselines.get(name)
+        if self._update or baseline is None:
+            return seconds
+        limit = baseline * (1 + self._threshold)
+        assert seconds <= limit, (
+            f"{name}: {seconds * 1e6:.1f}us per op, baseline "
+            f"{baseline * 1e6:.1f}us (+{self._threshold:.0%} allowed)"
+        )
+        return seconds
+
+
+@pytest.fixture(scope="session")
+def bench():
+    baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    update = bool(os.environ.get("BENCHMARK_UPDATE"))
+    runner = Bench(
+        baselines=baselines,
+        threshold=float(os.environ.get("BENCHMARK_THRESHOLD", "0.25")),
+        update=update,
+    )
+    yield runner
+
+    # baselines.json отслеживается git: без BENCHMARK_UPDATE файл не меняется
+    if update and runner.results:
+        baselines.update({k: round(v, 9) for k, v in runner.results.items()})
+        BASELINES_PATH.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+    missing = sorted(name for name in runner.results if name not in baselines)
+    print()
+    for name, seconds in sorted(runner.results.items()):
+        print(f"{name:<60} {seconds * 1e6:>12.2f} us")
+    if missing:
+        print(f"No baseline for {len(missing)} benchmark(s), set BENCHMARK_UPDATE=1:")
+        for name in missing:
+            print(f"  {name}")
+
+
+def currency_codes(n: int) -> list[str]:
+    """n синтетических кодов валют; первые три — реальные RUB/USD/EUR"""
+    base = ["RUB", "USD", "EUR"]
+    return (base + [f"X{i:05d}" for i in range(max(0, n - len(base)))])[:n]
+
+
+def cbr_payload(n: int) -> dict[str, Any]:
+    """Ответ в формате cbr-xml-daily.ru с n валютами"""
+    return {
+        "Date": "2025-01-01T11:30:00+03:00",
+        "Valute": {
+            code: {
+                "ID": f"R{i:05d}",
+                "NumCode": f"{i:03d}",
+                "CharCode": code,
+                "Nominal": 1,
+                "Name": code,
+                "Value": 10.0 + i * 0.01,
+                "Previous": 10.0 + i * 0.01,
+            }
+            for i, code in enumerate(currency_codes(n))
+            if code != "RUB"
+        },
+    }
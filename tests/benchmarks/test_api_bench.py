@@ -0,0 +1,54 @@
+import httpx
+import pytest
+from application.state import app_state
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    CodeCurrencyDTO,
+    CodeCurrencyListDTO,
+    CurrencyAmountDTO,
+)
+from core.repo.portfolio_repo import Portfolio
+
+from .conftest import currency_codes
+from .test_portfolio_bench import rates_dto
+
+
+@pytest.fixture(scope="module")
+def app():
+    from application.app import create_app
+
+    return create_app()
+
+
+@pytest.fixture(params=(10, 1_000, 100_000), ids=lambda n: f"n={n}")
+def size(request):
+    codes = currency_codes(request.param)
+    repo = Portfolio(
+        AmountCurrencyListDTO(
+            items=[CurrencyAmountDTO(code=code, amount=100.0) for code in codes]
+        ),
+        CodeCurrencyListDTO(items=[CodeCurrencyDTO(code=code) for code in codes]),
+    )
+    repo.data = rates_dto(codes)
+    previous, app_state.repo_portfolio = app_state.repo_portfolio, repo
+    yield request.param
+    app_state.repo_portfolio = previous
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path",
+    ("/USD", "/amount/get", "/rates/batch?codes=USD,EUR&matrix=true"),
+)
+async def test_endpoint_latency(bench, app, size, path):
+    from application.settings import settings
+
+    url = settings.GLOBAL_PREFIX_URL + path
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def call():
+            response = await client.get(url)
+            assert response.status_code == 200
+
+        await bench.run_async(f"api.GET {path}[n={size}]", call)
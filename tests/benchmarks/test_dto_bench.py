@@ -0,0 +1,46 @@
+import json
+
+import pytest
+from core.dto.currency_dto import CurrencyListDTO
+from depends.dep import json_keys
+
+from .conftest import SIZES, cbr_payload
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"n={n}")
+def payload(request) -> dict:
+    return cbr_payload(request.param)
+
+
+def _size(payload: dict) -> int:
+    # + RUB, которого нет в ответе ЦБ
+    return len(payload["Valute"]) + 1
+
+
+def test_list_dto_from_dict(bench, payload):
+    data = {
+        "items": [
+            {"code": v["CharCode"], "value": v["Value"]}
+            for v in payload["Valute"].values()
+        ]
+    }
+    bench(f"dto.from_dict[n={_size(payload)}]", CurrencyListDTO.from_dict, data)
+
+
+def test_list_dto_to_dict(bench, payload):
+    dto = CurrencyListDTO.from_dict(payload, items_key="Valute", field_map=json_keys())
+    bench(f"dto.to_dict[n={_size(payload)}]", dto.to_dict)
+
+
+def test_cbr_payload_parsing(bench, payload):
+    """Тело ответа ЦБ -> CurrencyListDTO, как в BASEHTTPService.execute"""
+    body = json.dumps(payload).encode()
+    field_map = json_keys()
+
+    def parse():
+        return CurrencyListDTO.from_dict(
+            json.loads(body), items_key="Valute", field_map=field_map
+        )
+
+    assert len(parse().items) == len(payload["Valute"])
+    bench(f"cbr.parse[n={_size(payload)}]", parse)
@@ -0,0 +1,106 @@
+import pytest
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    BulkConversionDTO,
+    CodeCurrencyDTO,
+    CodeCurrencyListDTO,
+    CurrencyAmountDTO,
+    CurrencyDTO,
+    CurrencyListDTO,
+    UpdateCurrencyAmountDTO,
+    UpdateCurrencyAmountListDTO,
+)
+from core.repo.portfolio_repo import Portfolio
+
+from .conftest import SIZES, currency_codes
+
+
+def rates_dto(codes: list[str]) -> CurrencyListDTO:
+    return CurrencyListDTO(
+        items=[
+            CurrencyDTO(code=code, value=10.0 + i * 0.01)
+            for i, code in enumerate(codes)
+            if code != "RUB"
+        ]
+    )
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"n={n}")
+def portfolio(request) -> Portfolio:
+    codes = currency_codes(request.param)
+    repo = Portfolio(
+        AmountCurrencyListDTO(
+            items=[CurrencyAmountDTO(code=code, amount=100.0) for code in codes]
+        ),
+        CodeCurrencyListDTO(items=[CodeCurrencyDTO(code=code) for code in codes]),
+    )
+    repo.data = rates_dto(codes)
+    return repo
+
+
+def _size(portfolio: Portfolio) -> int:
+    return len(portfolio._amount_index)
+
+
+def test_get_total(bench, portfolio):
+    bench(f"portfolio.get_total[n={_size(portfolio)}]", portfolio.get_total, "usd")
+
+
+def test_get_total_minor_units(bench, portfolio):
+    codes = list(portfolio._amount_index)
+    repo = Portfolio(
+        AmountCurrencyListDTO(
+            items=[CurrencyAmountDTO(code=code, amount=100.0) for code in codes]
+        ),
+        CodeCurrencyListDTO(items=[CodeCurrencyDTO(code=code) for code in codes]),
+        minor_units=True,
+    )
+    repo.data = rates_dto(codes)
+    bench(f"portfolio.get_total_minor_units[n={len(codes)}]", repo.get_total, "usd")
+
+
+def test_get_portfolio_summary(bench, portfolio):
+    bench(
+        f"portfolio.get_portfolio_summary[n={_size(portfolio)}]",
+        portfolio.get_portfolio_summary,
+    )
+
+
+def test_set_rates(bench, portfolio):
+    dto = rates_dto(list(portfolio._amount_index))
+    bench(
+        f"portfolio.data_setter[n={_size(portfolio)}]",
+        Portfolio.data.fset,
+        portfolio,
+        dto,
+    )
+
+
+def test_get_rates_batch(bench, portfolio):
+    codes = list(portfolio._rates_index)[:100]
+    bench(f"portfolio.get_rates[n={_size(portfolio)},k=100]", portfolio.get_rates, codes)
+
+
+def test_modify_multiple_amounts(bench, portfolio):
+    codes = list(portfolio._amount_index)[:100]
+    dto = UpdateCurrencyAmountListDTO(
+        items=[UpdateCurrencyAmountDTO(code=code, delta=0.0) for code in codes]
+    )
+    bench(
+        f"portfolio.modify_multiple_amounts[n={_size(portfolio)},k=100]",
+        portfolio.modify_multiple_amounts,
+        dto,
+    )
+
+
+@pytest.mark.parametrize("rows", SIZES, ids=lambda n: f"rows={n}")
+def test_convert_bulk(bench, rows):
+    codes = currency_codes(100)
+    repo = Portfolio(AmountCurrencyListDTO(items=[CurrencyAmountDTO("RUB", 1.0)]))
+    repo.data = rates_dto(codes)
+    dto = BulkConversionDTO(
+        amounts=[float(i) for i in range(rows)],
+        from_codes=[codes[i % 100] for i in range(rows)],
+        to_codes=[codes[(i * 7) % 100] for i in range(rows)],
+    )
+    bench(f"portfolio.convert_bulk[rows={rows}]", repo.convert_bulk, dto)
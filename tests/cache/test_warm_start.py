@@ -0,0 +1,67 @@
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    CurrencyAmountDTO,
+    CurrencyDTO,
+    CurrencyListDTO,
+)
+from core.interface.rates_listener import IRatesListener
+from core.repo.portfolio_repo import Portfolio
+from core.services.warm_start import restore_cached_rates
+from infra.cache.file_rates_cache import FileRatesCache
+
+RATES = CurrencyListDTO(
+    items=[CurrencyDTO(code="USD", value=90.5), CurrencyDTO(code="EUR", value=99.25)]
+)
+
+
+class Recorder(IRatesListener):
+    def __init__(self):
+        self.received = []
+
+    def on_rates_updated(self, dto):
+        self.received.append(dto)
+
+
+def make_repo():
+    return Portfolio(AmountCurrencyListDTO(items=[CurrencyAmountDTO("USD", 10.0)]))
+
+
+def test_cache_roundtrip_is_atomic_and_compact(tmp_path):
+    cache = FileRatesCache(tmp_path / "rates.json", clock=lambda: 1000.0)
+    cache.on_rates_updated(RATES)
+
+    assert cache.load() == (RATES, 1000.0)
+    assert list(tmp_path.iterdir()) == [tmp_path / "rates.json"]
+    assert b" " not in (tmp_path / "rates.json").read_bytes()
+
+
+def test_missing_or_corrupted_cache_is_ignored(tmp_path):
+    cache = FileRatesCache(tmp_path / "rates.json")
+    assert cache.load() is None
+
+    cache.path.write_text('{"fetched_at": 1, "rates": [["USD"]]}')
+    assert cache.load() is None
+
+
+def test_restore_serves_cached_rates_with_original_age(tmp_path):
+    cache = FileRatesCache(tmp_path / "rates.json", clock=lambda: 1000.0)
+    cache.on_rates_updated(RATES)
+    repo, listener = make_repo(), Recorder()
+
+    age = restore_cached_rates(
+        cache, repo, max_age=3600, listeners=[listener], clock=lambda: 1060.0
+    )
+
+    assert age == 60
+    assert repo.get_rate("USD").value == 90.5
+    assert repo.rates_updated_at == 1000.0
+    assert listener.received == [RATES]
+
+
+def test_stale_cache_is_not_used(tmp_path):
+    cache = FileRatesCache(tmp_path / "rates.json", clock=lambda: 1000.0)
+    cache.on_rates_updated(RATES)
+    repo = make_repo()
+
+    assert restore_cached_rates(cache, repo, max_age=10, clock=lambda: 2000.0) is None
+    assert repo.rates_updated_at is None
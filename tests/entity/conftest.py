@@ -1,6 +1,6 @@
 import pytest
 from core.repo.portfolio_repo import Portfolio
-from src.core.dto.currency_dto import (
+from core.dto.currency_dto import (
     AmountCurrencyListDTO,
     CodeCurrencyDTO,
     CodeCurrencyListDTO,
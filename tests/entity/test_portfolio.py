@@ -1,5 +1,5 @@
 import pytest
-from src.core.dto.currency_dto import (
+from core.dto.currency_dto import (
     AmountCurrencyListDTO,
     CurrencyAmountDTO,
     CurrencyDTO,
@@ -9,7 +9,7 @@ from src.core.dto.currency_dto import (
     UpdateCurrencyAmountDTO,
     UpdateCurrencyAmountListDTO,
 )
-from src.core.exceptions import PortfolioError
+from core.exceptions import PortfolioError
 from core.repo.portfolio_repo import Portfolio
 
 
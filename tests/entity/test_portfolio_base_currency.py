@@ -0,0 +1,123 @@
+import pytest
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    BulkConversionDTO,
+    CurrencyAmountDTO,
+    CurrencyDTO,
+    CurrencyListDTO,
+)
+from core.exceptions import CurrencyNotFoundError, ServiceError
+from core.interface.base_http_service import IBASEHTTPService
+from core.repo.portfolio_repo import Portfolio
+from core.services.currency_service_http import CurrencyServiceHTTPUSECASE
+from core.services.rates_rebase import rebase_rates
+
+
+def rates(**values):
+    return CurrencyListDTO(
+        items=[CurrencyDTO(code=code, value=value) for code, value in values.items()]
+    )
+
+
+@pytest.fixture
+def rub_portfolio(initial_amounts, exchange_rates):
+    portfolio = Portfolio(initial_amounts)
+    portfolio.data = exchange_rates  # USD 90, EUR 100
+    return portfolio
+
+
+def test_rebase_rates_uses_quoted_or_known_pivot():
+    assert rebase_rates({"USD": 90.0, "EUR": 100.0}, "RUB", "USD") == {
+        "EUR": 100.0 / 90.0,
+        "RUB": 1 / 90.0,
+    }
+    assert rebase_rates({"EUR": 1.1}, "USD", "RUB", pivot=1 / 90.0) == pytest.approx(
+        {"EUR": 99.0, "USD": 90.0}
+    )
+    with pytest.raises(CurrencyNotFoundError):
+        rebase_rates({"EUR": 1.1}, "USD", "RUB")
+
+
+def test_rates_and_total_in_requested_base(rub_portfolio):
+    assert rub_portfolio.get_rate("USD", base="eur").value == 0.9
+    assert rub_portfolio.get_rates(["RUB", "USD"], base="USD").items == [
+        CurrencyDTO(code="RUB", value=1 / 90.0),
+        CurrencyDTO(code="USD", value=1.0),
+    ]
+    # 100 USD + 200 EUR + 5000 RUB = 34000 RUB
+    assert rub_portfolio.get_total().total_amount == 34000.0
+    assert rub_portfolio.get_total("EUR").total_amount == 340.0
+    summary = rub_portfolio.get_portfolio_summary("USD")
+    assert summary.total.code == "USD"
+    assert {item.code for item in summary.rates.items} == {"EUR", "RUB"}
+    with pytest.raises(CurrencyNotFoundError):
+        rub_portfolio.get_rate("USD", base="GBP")
+
+
+def test_portfolio_with_usd_base(initial_amounts):
+    portfolio = Portfolio(initial_amounts, base_currency="usd")
+    portfolio.data = rates(EUR=1.25, RUB=0.01)
+
+    assert portfolio.base_currency == "USD"
+    assert portfolio.get_total().total_amount == 100 + 250 + 50
+    assert portfolio.get_total("RUB").total_amount == 40000.0
+    assert portfolio.get_rate("EUR", base="RUB").value == 125.0
+    assert portfolio.get_rate("USD").value == 1.0
+    assert portfolio.get_rate("RUB", base="RUB").value == 1.0
+
+
+def test_rebased_rates_and_cross_rates_are_cached_per_rates_version(rub_portfolio):
+    first = rub_portfolio._rebased_index("USD")
+    assert rub_portfolio._rebased_index("USD") is first
+    conversion = BulkConversionDTO(
+        amounts=[1.0, 2.0], from_codes=["USD", "USD"], to_codes=["EUR", "EUR"]
+    )
+    assert rub_portfolio.convert_bulk(conversion).amounts == [0.9, 1.8]
+    assert rub_portfolio._cross == {("USD", "EUR"): 0.9}
+
+    rub_portfolio.update_rates(rates(USD=80.0, EUR=100.0))
+
+    assert rub_portfolio._rebased_index("USD") is not first
+    assert rub_portfolio.convert_bulk(conversion).amounts == [0.8, 1.6]
+
+
+class FakeService(IBASEHTTPService):
+    def __init__(self, dto):
+        self.dto = dto
+
+    def configure(self, url, debug):
+        pass
+
+    @property
+    def url(self):
+        return "http://feed"
+
+    async def execute(self, **kwargs):
+        return self.dto
+
+
+@pytest.mark.asyncio
+async def test_source_quoted_in_other_base_is_rebased_once():
+    repo = Portfolio(AmountCurrencyListDTO(items=[CurrencyAmountDTO("USD", 1.0)]))
+    received = []
+
+    class Listener:
+        def on_rates_updated(self, dto):
+            received.append(dto)
+
+    feed = FakeService(rates(RUB=1 / 90.0, EUR=1.1))
+    uc = CurrencyServiceHTTPUSECASE(feed, repo, listeners=[Listener()], source_base="USD")
+    await uc(debug=False, url="http://feed", filter_func=lambda item: True)
+
+    assert dict(repo.iter_rates()) == pytest.approx({"EUR": 99.0, "USD": 90.0})
+    assert received[0].items == repo.data.items
+
+    # Источник без курса базы портфеля: пересчет через уже известный курс USD
+    feed.dto = rates(EUR=1.2)
+    await uc(debug=False, url="http://feed", filter_func=lambda item: True)
+    assert dict(repo.iter_rates()) == pytest.approx({"EUR": 108.0, "USD": 90.0})
+
+    empty = Portfolio(AmountCurrencyListDTO(items=[CurrencyAmountDTO("USD", 1.0)]))
+    uc = CurrencyServiceHTTPUSECASE(feed, empty, source_base="USD")
+    with pytest.raises(ServiceError):
+        await uc(debug=False, url="http://feed", filter_func=lambda item: True)
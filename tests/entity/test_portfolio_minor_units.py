@@ -0,0 +1,93 @@
+import pytest
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    CodeCurrencyDTO,
+    CodeCurrencyListDTO,
+    CurrencyAmountDTO,
+    CurrencyDTO,
+    CurrencyListDTO,
+    UpdateCurrencyAmountDTO,
+    UpdateCurrencyAmountListDTO,
+)
+from core.repo.portfolio_repo import Portfolio
+from shared.money import decimal_ratio, div_round_half_even, to_minor
+
+
+def make_portfolio(amounts, rates, minor_units=True):
+    portfolio = Portfolio(
+        AmountCurrencyListDTO(
+            items=[CurrencyAmountDTO(code=c, amount=a) for c, a in amounts.items()]
+        ),
+        CodeCurrencyListDTO(items=[CodeCurrencyDTO(code=c) for c in amounts]),
+        minor_units=minor_units,
+    )
+    portfolio.data = CurrencyListDTO(
+        items=[CurrencyDTO(code=c, value=v) for c, v in rates.items()]
+    )
+    return portfolio
+
+
+@pytest.mark.parametrize(
+    "numerator, denominator, expected",
+    [(5, 2, 2), (7, 2, 4), (-5, 2, -2), (-7, 2, -4), (10, 3, 3), (11, 3, 4)],
+)
+def test_div_round_half_even(numerator, denominator, expected):
+    assert div_round_half_even(numerator, denominator) == expected
+
+
+def test_to_minor_uses_currency_exponent():
+    assert to_minor(1.005, 2) == 100  # 1.005 в float — это 1.00499...
+    assert to_minor(0.125, 2) == 12  # точная половина -> к четному
+    assert to_minor(1234.5, 0) == 1234
+
+
+def test_deltas_do_not_drift():
+    portfolio = make_portfolio({"USD": 0.0, "RUB": 0.0}, {"USD": 90.0})
+    for _ in range(10):
+        portfolio.modify_amount_one(UpdateCurrencyAmountDTO(code="USD", delta=0.1))
+
+    assert portfolio.get_amount_one("USD") == 1.0
+    assert portfolio.get_total().total_amount == 90.0
+
+
+def test_amounts_are_rounded_to_iso_exponent():
+    portfolio = make_portfolio(
+        {"JPY": 100.6, "KWD": 1.23456, "USD": 1.239},
+        {"JPY": 0.6, "KWD": 290.0, "USD": 90.0},
+    )
+
+    assert portfolio.get_amount_one("JPY") == 101
+    assert portfolio.get_amount_one("KWD") == 1.235
+    assert portfolio.get_amount_one("USD") == 1.24
+
+
+def test_total_is_exact_and_rounded_half_even():
+    portfolio = make_portfolio({"RUB": 0.0, "USD": 0.1}, {"USD": 0.3})
+    # 0.1 * 0.3 в float — 0.030000000000000002; в целых — ровно 0.03
+    assert portfolio.get_total().total_amount == 0.03
+
+    portfolio = make_portfolio({"RUB": 0.0, "USD": 0.01}, {"USD": 0.5})
+    # 0.005 руб. -> 0.00 (к четному); в USD — 0.01
+    assert portfolio.get_total().total_amount == 0.0
+    assert portfolio.get_total("usd").total_amount == 0.01
+
+
+def test_total_keeps_all_digits_of_small_rates():
+    assert decimal_ratio(0.00314159265) == (314159265, 10**11)
+    assert decimal_ratio(1e22) == (10**22, 1)
+
+    portfolio = make_portfolio({"RUB": 0.0, "VND": 1e9}, {"VND": 0.00314159265})
+
+    assert portfolio.get_total().total_amount == 3141592.65
+    assert portfolio.get_total("VND").total_amount == 1e9
+
+
+def test_multiple_deltas_are_checked_in_minor_units():
+    portfolio = make_portfolio({"RUB": 0.0, "USD": 0.3}, {"USD": 90.0})
+    # 0.3 - 0.1 - 0.1 - 0.1 в float — -5.5e-17; в целых — ровно 0
+    deltas = [UpdateCurrencyAmountDTO(code="USD", delta=-0.1)] * 3
+
+    result = portfolio.modify_multiple_amounts(UpdateCurrencyAmountListDTO(items=deltas))
+
+    assert result.items[-1].amount == 0.0
+    assert portfolio.get_amount_one("USD") == 0.0
@@ -0,0 +1,59 @@
+import pytest
+from core.dto.currency_dto import BulkConversionDTO, CurrencyDTO, CurrencyListDTO
+from core.exceptions import CurrencyNotFoundError, PortfolioError
+
+
+@pytest.fixture(scope="function")
+def rated_portfolio(portfolio):
+    portfolio.data = CurrencyListDTO(
+        items=[CurrencyDTO(code="USD", value=90.0), CurrencyDTO(code="EUR", value=100.0)]
+    )
+    return portfolio
+
+
+def test_get_rates(rated_portfolio):
+    rates = rated_portfolio.get_rates(["EUR", "RUB", "USD"])
+
+    assert [(r.code, r.value) for r in rates.items] == [
+        ("EUR", 100.0),
+        ("RUB", 1.0),
+        ("USD", 90.0),
+    ]
+
+
+def test_get_rates_reports_all_missing(rated_portfolio):
+    with pytest.raises(CurrencyNotFoundError, match="GBP, JPY"):
+        rated_portfolio.get_rates(["USD", "GBP", "JPY"])
+
+
+def test_get_conversion_matrix(rated_portfolio):
+    res = rated_portfolio.get_conversion_matrix(["USD", "EUR", "RUB"])
+
+    assert res.codes == ["USD", "EUR", "RUB"]
+    assert res.matrix[0] == pytest.approx([1.0, 0.9, 90.0])
+    assert res.matrix[2][1] == pytest.approx(0.01)
+    for i in range(3):
+        assert res.matrix[i][i] == 1.0
+
+
+def test_convert_bulk(rated_portfolio):
+    res = rated_portfolio.convert_bulk(
+        BulkConversionDTO(
+            amounts=[1.0, 2.0, 900.0, 5.0],
+            from_codes=["USD", "EUR", "RUB", "USD"],
+            to_codes=["RUB", "USD", "USD", "USD"],
+        )
+    )
+
+    assert res.amounts == pytest.approx([90.0, 2.0 * 100.0 / 90.0, 10.0, 5.0])
+
+
+def test_convert_bulk_validates_columns(rated_portfolio):
+    with pytest.raises(PortfolioError):
+        rated_portfolio.convert_bulk(
+            BulkConversionDTO(amounts=[1.0], from_codes=["USD", "EUR"], to_codes=["RUB"])
+        )
+    with pytest.raises(CurrencyNotFoundError):
+        rated_portfolio.convert_bulk(
+            BulkConversionDTO(amounts=[1.0], from_codes=["GBP"], to_codes=["RUB"])
+        )
@@ -0,0 +1,36 @@
+import pytest
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    CurrencyAmountDTO,
+    UpdateCurrencyAmountDTO,
+    UpdateCurrencyAmountListDTO,
+)
+from core.exceptions import VersionConflictError
+
+
+def test_version_grows_on_every_write(portfolio):
+    start = portfolio.amount_version
+
+    portfolio.set_amount_one(CurrencyAmountDTO(code="USD", amount=1.0))
+    portfolio.modify_amount_one(UpdateCurrencyAmountDTO(code="USD", delta=1.0))
+
+    assert portfolio.amount_version == start + 2
+
+
+def test_write_with_stale_version_is_rejected(portfolio):
+    version = portfolio.amount_version
+    modifications = UpdateCurrencyAmountListDTO(
+        items=[UpdateCurrencyAmountDTO(code="USD", delta=10.0)]
+    )
+
+    portfolio.modify_multiple_amounts(modifications, expected_version=version)
+    amount = portfolio.get_amount_one("USD")
+
+    with pytest.raises(VersionConflictError):
+        portfolio.modify_multiple_amounts(modifications, expected_version=version)
+    with pytest.raises(VersionConflictError):
+        portfolio.set_multiple_amounts(
+            AmountCurrencyListDTO(items=[CurrencyAmountDTO(code="USD", amount=0.0)]),
+            expected_version=version,
+        )
+    assert portfolio.get_amount_one("USD") == amount
@@ -0,0 +1,117 @@
+import json
+
+import pytest
+from core.dto.currency_dto import CurrencyDTO, CurrencyListDTO
+from core.events.hub import EventHub
+from core.exceptions import AlertError, AlertNotFoundError
+from core.services.alert_engine import TOPIC_ALERTS, AlertEngine
+
+
+def usd(value):
+    return CurrencyListDTO(items=[CurrencyDTO(code="USD", value=value)])
+
+
+def fired(engine, value):
+    return sorted(trigger.id for trigger in engine.evaluate(usd(value)))
+
+
+def test_only_crossed_rules_fire_by_direction():
+    engine = AlertEngine()
+    above_91 = engine.add("usd", 91, "above").id
+    below_89 = engine.add("USD", 89, "below").id
+    cross_95 = engine.add("USD", 95).id
+    engine.add("EUR", 91, "above")
+
+    assert fired(engine, 90) == []  # первый курс — только база
+    assert fired(engine, 91) == [above_91]  # порог включен в (old, new]
+    assert fired(engine, 91) == []
+    assert fired(engine, 96) == [cross_95]
+    assert fired(engine, 88) == [below_89, cross_95]
+    assert fired(engine, 92) == [above_91]
+
+
+def test_reaching_threshold_counts_as_crossing_once():
+    engine = AlertEngine()
+    rule = engine.add("USD", 90, "cross").id
+    engine.evaluate(usd(89))
+
+    assert fired(engine, 90) == [rule]
+    assert fired(engine, 91) == []
+    assert fired(engine, 90) == [rule]
+    assert fired(engine, 89) == []
+
+
+def test_remove_and_limits():
+    engine = AlertEngine(max_rules=2)
+    first = engine.add("USD", 91, "cross")
+    engine.add("USD", 91, "above")
+    with pytest.raises(AlertError):
+        engine.add("USD", 92)
+
+    engine.remove(first.id)
+    engine.evaluate(usd(90))
+    assert [t.direction for t in engine.evaluate(usd(92))] == ["above"]
+    assert engine.evaluate(usd(80)) == []
+    with pytest.raises(AlertNotFoundError):
+        engine.remove(first.id)
+    with pytest.raises(AlertError):
+        engine.add("USD", 0)
+    with pytest.raises(AlertError):
+        engine.add("USD", 1, "sideways")
+
+
+def test_evaluation_scans_only_crossed_range():
+    engine = AlertEngine()
+    for i in range(100_000):
+        engine.add("USD", 50 + i / 4)  # пороги 50, 50.25 .. 25049.75
+    engine.evaluate(usd(60.1))
+
+    assert len(engine.evaluate(usd(62.6))) == 10  # 60.25 .. 62.5
+    assert len(engine.evaluate(usd(59.9))) == 11  # 60 .. 62.5
+
+
+def test_triggers_are_published_to_hub():
+    hub = EventHub()
+    sub = hub.subscribe()
+    engine = AlertEngine(hub=hub)
+    rule = engine.add("USD", 95)
+
+    engine.on_rates_updated(usd(90))
+    engine.on_rates_updated(usd(100))
+
+    event = hub._last[TOPIC_ALERTS]
+    assert sub.coalesced == 0
+    assert json.loads(event.data) == {
+        "triggered": [
+            {
+                "id": rule.id,
+                "code": "USD",
+                "threshold": 95,
+                "direction": "cross",
+                "old_value": 90,
+                "new_value": 100,
+            }
+        ]
+    }
+
+
+@pytest.mark.asyncio
+async def test_unread_triggers_are_not_overwritten():
+    hub = EventHub()
+    sub = hub.subscribe()
+    engine = AlertEngine(hub=hub)
+    engine.add("USD", 95)
+    engine.add("USD", 105)
+
+    engine.on_rates_updated(usd(90))
+    engine.on_rates_updated(usd(100))
+    engine.on_rates_updated(usd(110))
+
+    thresholds = [
+        [
+            trigger["threshold"]
+            for trigger in json.loads((await sub.get()).data)["triggered"]
+        ]
+        for _ in range(2)
+    ]
+    assert thresholds == [[95], [105]]
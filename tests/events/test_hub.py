@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from core.events.hub import EventHub
+
+
+@pytest.mark.asyncio
+async def test_subscriber_receives_events_in_order():
+    hub = EventHub()
+    sub = hub.subscribe()
+
+    hub.publish("rates", {"v": 1})
+    hub.publish("total", {"v": 2})
+
+    assert (await sub.get()).topic == "rates"
+    assert (await sub.get()).data == '{"v":2}'
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_only_latest_event_per_topic():
+    hub = EventHub()
+    sub = hub.subscribe()
+
+    for i in range(100):
+        hub.publish("rates", {"v": i})
+
+    event = await sub.get()
+    assert event.data == '{"v":99}'
+    assert sub.coalesced == 99
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(sub.get(), timeout=0.01)
+
+
+def test_queue_is_bounded():
+    hub = EventHub(queue_size=2)
+    sub = hub.subscribe()
+
+    for topic in ("a", "b", "c"):
+        hub.publish(topic, {})
+
+    assert sub.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_new_subscriber_gets_last_state_and_unsubscribe():
+    hub = EventHub()
+    hub.publish("rates", {"v": 1})
+    hub.publish("rates", {"v": 2})
+
+    sub = hub.subscribe()
+    assert (await sub.get()).data == '{"v":2}'
+
+    hub.unsubscribe(sub)
+    assert hub.subscribers_count == 0
+
+
+@pytest.mark.asyncio
+async def test_queued_topic_delivers_every_event():
+    hub = EventHub(queue_size=3)
+    sub = hub.subscribe()
+    hub.queue_topic("alerts")
+
+    hub.publish("alerts", {"v": 1})
+    hub.publish("rates", {"v": 1})
+    hub.publish("alerts", {"v": 2})
+
+    assert [(await sub.get()).data for _ in range(3)] == ['{"v":1}', '{"v":1}', '{"v":2}']
+    assert sub.coalesced == 0
+
+    for i in range(4):
+        hub.publish("alerts", {"v": i})
+    assert sub.dropped == 1
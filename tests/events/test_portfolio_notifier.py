@@ -0,0 +1,47 @@
+import pytest
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    CurrencyAmountDTO,
+    CurrencyDTO,
+    CurrencyListDTO,
+)
+from core.events.hub import EventHub
+from core.repo.portfolio_repo import Portfolio
+from core.services.portfolio_notifier import TOPIC_RATES, TOPIC_TOTAL, PortfolioNotifier
+
+
+def usd(value: float) -> CurrencyListDTO:
+    return CurrencyListDTO(items=[CurrencyDTO(code="USD", value=value)])
+
+
+@pytest.fixture
+def repo():
+    return Portfolio(
+        AmountCurrencyListDTO(
+            items=[
+                CurrencyAmountDTO(code="RUB", amount=0.0),
+                CurrencyAmountDTO(code="USD", amount=10.0),
+            ]
+        )
+    )
+
+
+def tick(repo, notifier, dto):
+    repo.data = dto
+    notifier.on_rates_updated(dto)
+
+
+def test_unchanged_tick_publishes_nothing(repo):
+    hub = EventHub()
+    notifier = PortfolioNotifier(repo, hub)
+
+    tick(repo, notifier, usd(90.0))
+    published = dict(hub._last)
+    tick(repo, notifier, usd(90.0))
+
+    assert set(published) == {TOPIC_RATES, TOPIC_TOTAL}
+    assert hub._last == published
+
+    tick(repo, notifier, usd(91.0))
+    assert hub._last[TOPIC_RATES].seq > published[TOPIC_RATES].seq
+    assert hub._last[TOPIC_TOTAL].data.endswith('"delta":10.0}')
@@ -0,0 +1,106 @@
+import pytest
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    CurrencyAmountDTO,
+    CurrencyDTO,
+    CurrencyListDTO,
+)
+from core.interface.rates_listener import IRatesListener
+from core.repo.portfolio_repo import Portfolio
+from core.services.currency_service_http import CurrencyServiceHTTPUSECASE
+from core.services.leader_fetcher import LeaderAwareFetcher
+from infra.leader.file_lock_elector import FileLockLeaderElector
+from infra.leader.file_rates_channel import FileRatesChannel
+
+
+class FakeUsecase(CurrencyServiceHTTPUSECASE):
+    def __init__(self, dto, repo, listeners):
+        super().__init__(service=None, repo=repo, listeners=listeners)
+        self.dto = dto
+        self.calls = 0
+
+    async def __call__(self, **kwargs):
+        self.calls += 1
+        self.apply_rates(self.dto)
+        return self.dto
+
+
+class RecordingListener(IRatesListener):
+    def __init__(self):
+        self.received = []
+
+    def on_rates_updated(self, dto):
+        self.received.append(dto)
+
+
+def make_repo():
+    return Portfolio(
+        initial_amounts=AmountCurrencyListDTO(
+            items=[CurrencyAmountDTO(code="USD", amount=1.0)]
+        )
+    )
+
+
+def test_only_one_elector_holds_lock_and_failover(tmp_path):
+    lock = tmp_path / "leader.lock"
+    first = FileLockLeaderElector(lock)
+    second = FileLockLeaderElector(lock)
+
+    assert first.try_acquire()
+    assert not second.try_acquire()
+
+    first.release()
+    assert second.try_acquire()
+    assert second.is_leader
+    second.release()
+
+
+def test_channel_poll_returns_only_new_snapshots(tmp_path):
+    path = tmp_path / "rates.json"
+    writer = FileRatesChannel(path)
+    reader = FileRatesChannel(path)
+    dto = CurrencyListDTO(items=[CurrencyDTO(code="USD", value=90.0)])
+
+    assert reader.poll() is None
+    writer.publish(dto)
+    assert reader.poll() == dto
+    assert reader.poll() is None
+
+
+@pytest.mark.asyncio
+async def test_follower_receives_rates_from_leader(tmp_path):
+    dto = CurrencyListDTO(
+        items=[CurrencyDTO(code="USD", value=90.0), CurrencyDTO(code="EUR", value=100.0)]
+    )
+    leader_channel = FileRatesChannel(tmp_path / "rates.json")
+    leader_uc = FakeUsecase(dto, make_repo(), [leader_channel])
+    leader = LeaderAwareFetcher(
+        uc=leader_uc,
+        elector=FileLockLeaderElector(tmp_path / "leader.lock"),
+        channel=leader_channel,
+    )
+    follower_channel = FileRatesChannel(tmp_path / "rates.json")
+    follower_listener = RecordingListener()
+    follower_repo = make_repo()
+    follower_uc = FakeUsecase(dto, follower_repo, [follower_channel, follower_listener])
+    follower = LeaderAwareFetcher(
+        uc=follower_uc,
+        elector=FileLockLeaderElector(tmp_path / "leader.lock"),
+        channel=follower_channel,
+    )
+
+    assert await leader.fetch() == dto
+    assert await follower.fetch() is None
+    assert follower_uc.calls == 0
+
+    published = (tmp_path / "rates.json").stat().st_ino
+    assert await follower.sync() == dto
+    assert follower_repo.get_rate("USD").value == 90.0
+    # Слушатели последователя получают снимок, канал его не перепубликует
+    assert follower_listener.received == [dto]
+    assert (tmp_path / "rates.json").stat().st_ino == published
+
+    leader.close()
+    assert await follower.fetch() == dto
+    assert follower.is_leader
+    follower.close()
@@ -0,0 +1,52 @@
+from datetime import datetime, time
+from zoneinfo import ZoneInfo
+
+from core.scheduler.interval_policy import AdaptiveIntervalPolicy
+
+MSK = ZoneInfo("Europe/Moscow")
+
+
+def test_backoff_grows_while_unchanged_and_resets_on_change():
+    policy = AdaptiveIntervalPolicy(base_interval=10, max_interval=100)
+
+    assert policy.next_interval("a") == 10
+    assert policy.next_interval("a") == 20
+    assert policy.next_interval("a") == 40
+    assert policy.next_interval("a") == 80
+    assert policy.next_interval("a") == 100
+    assert policy.next_interval("b") == 10
+
+
+def test_failure_does_not_back_off():
+    policy = AdaptiveIntervalPolicy(base_interval=10, max_interval=100)
+    policy.next_interval("a")
+    policy.next_interval("a")
+
+    assert policy.next_interval(None, failed=True) == 10
+    assert policy.next_interval("a") == 40
+
+
+def test_dense_polling_inside_publication_window():
+    now = datetime(2024, 5, 6, 12, 0, tzinfo=MSK)
+    policy = AdaptiveIntervalPolicy(
+        base_interval=10,
+        max_interval=10_000,
+        window_start=time(11, 0),
+        window_end=time(16, 0),
+        now=lambda: now,
+    )
+    for _ in range(10):
+        assert policy.next_interval("a") == 10
+
+
+def test_backoff_is_capped_by_next_window_start():
+    now = datetime(2024, 5, 6, 10, 59, 0, tzinfo=MSK)
+    policy = AdaptiveIntervalPolicy(
+        base_interval=10,
+        max_interval=10_000,
+        window_start=time(11, 0),
+        window_end=time(16, 0),
+        now=lambda: now,
+    )
+    for _ in range(10):
+        assert policy.next_interval("a") <= 60
@@ -0,0 +1,136 @@
+import asyncio
+
+import pytest
+from core.scheduler.multi_scheduler import MultiJobScheduler
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_with_own_intervals():
+    scheduler = MultiJobScheduler()
+    calls = {"fast": 0, "slow": 0}
+
+    async def fast():
+        calls["fast"] += 1
+
+    async def slow():
+        calls["slow"] += 1
+
+    scheduler.add_job("fast", fast, interval=0.01)
+    scheduler.add_job("slow", slow, interval=1)
+
+    runner = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(0.1)
+    await scheduler.shutdown()
+    await runner
+
+    assert calls["fast"] > 3
+    assert calls["slow"] == 1
+
+
+@pytest.mark.asyncio
+async def test_priority_orders_jobs_with_same_deadline():
+    clock_value = [0.0]
+    scheduler = MultiJobScheduler(clock=lambda: clock_value[0])
+    order = []
+
+    async def make(name):
+        order.append(name)
+
+    scheduler.add_job("low", make, interval=10, priority=5, kwargs={"name": "low"})
+    scheduler.add_job("high", make, interval=10, priority=0, kwargs={"name": "high"})
+
+    runner = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(0.01)
+    await scheduler.shutdown()
+    await runner
+
+    assert order == ["high", "low"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_skips_overlapping_runs():
+    scheduler = MultiJobScheduler()
+    active = []
+    peak = [0]
+
+    async def long_job():
+        active.append(1)
+        peak[0] = max(peak[0], len(active))
+        await asyncio.sleep(0.05)
+        active.pop()
+
+    scheduler.add_job("long", long_job, interval=0.005, max_concurrency=1)
+
+    runner = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(0.1)
+    await scheduler.shutdown()
+    await runner
+
+    assert peak[0] == 1
+
+
+@pytest.mark.asyncio
+async def test_add_and_remove_jobs_at_runtime():
+    scheduler = MultiJobScheduler()
+    calls = []
+
+    async def job():
+        calls.append(1)
+
+    runner = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(0.01)
+    scheduler.add_job("late", job, interval=0.01)
+    await asyncio.sleep(0.05)
+    scheduler.remove_job("late")
+    count = len(calls)
+    await asyncio.sleep(0.05)
+    await scheduler.shutdown()
+    await runner
+
+    assert count > 0
+    assert len(calls) == count
+    with pytest.raises(KeyError):
+        scheduler.remove_job("late")
+
+
+@pytest.mark.asyncio
+async def test_next_run_in_is_earliest_job_deadline():
+    clock_value = [100.0]
+    scheduler = MultiJobScheduler(clock=lambda: clock_value[0])
+
+    async def noop():
+        return None
+
+    scheduler.add_job("slow", noop, interval=60, run_immediately=False)
+    scheduler.add_job("fast", noop, interval=5, run_immediately=False)
+    assert scheduler.next_run_in() == 5
+
+    clock_value[0] = 103.0
+    assert scheduler.next_run_in() == 2
+
+    scheduler.remove_job("fast")
+    assert scheduler.next_run_in() == 57
+
+
+@pytest.mark.asyncio
+async def test_readded_job_ignores_stale_heap_entries(caplog):
+    clock_value = [0.0]
+    scheduler = MultiJobScheduler(clock=lambda: clock_value[0])
+    calls = []
+
+    async def job():
+        calls.append(1)
+
+    scheduler.add_job("a", job, interval=10, run_immediately=False)
+    scheduler.remove_job("a")
+    scheduler.add_job("a", job, interval=10, run_immediately=False)
+
+    clock_value[0] = 10.0
+    runner = asyncio.create_task(scheduler.start())
+    await asyncio.sleep(0.01)
+    await scheduler.shutdown()
+    await runner
+
+    assert calls == [1]
+    assert "skipped" not in caplog.text
+    assert scheduler.next_run_at("a") == 20.0
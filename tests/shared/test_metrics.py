@@ -0,0 +1,41 @@
+import pytest
+from shared.metrics import MetricsRegistry
+
+
+def test_histogram_buckets_are_cumulative_in_exposition():
+    registry = MetricsRegistry()
+    hist = registry.histogram("op_seconds", "op latency", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value)
+
+    text = registry.render()
+
+    assert 'op_seconds_bucket{le="0.1"} 2' in text
+    assert 'op_seconds_bucket{le="1"} 3' in text
+    assert 'op_seconds_bucket{le="+Inf"} 4' in text
+    assert "op_seconds_count 4" in text
+    assert "op_seconds_sum 3.65" in text
+
+
+def test_labeled_counter_keeps_series_per_label_values():
+    registry = MetricsRegistry()
+    counter = registry.counter("calls", "calls by outcome", ("outcome",))
+    counter.labels("ok").inc()
+    counter.labels("ok").inc()
+    counter.labels("error").inc()
+
+    text = registry.render()
+
+    assert "# TYPE calls_total counter" in text
+    assert 'calls_total{outcome="ok"} 2' in text
+    assert 'calls_total{outcome="error"} 1' in text
+
+
+def test_labels_arity_is_checked_and_names_are_unique():
+    registry = MetricsRegistry()
+    counter = registry.counter("calls", "calls", ("outcome",))
+
+    with pytest.raises(ValueError):
+        counter.labels("ok", "extra")
+    with pytest.raises(ValueError):
+        registry.counter("calls", "duplicate")
@@ -0,0 +1,93 @@
+import gc
+import threading
+import time
+import tracemalloc
+
+import pytest
+from core.dto.currency_dto import AmountCurrencyListDTO, CurrencyAmountDTO, CurrencyDTO
+from core.repo.portfolio_repo import Portfolio
+from shared.profiling import AllocationProfiler, ProfilerBusyError, SamplingProfiler
+
+
+def _busy_loop(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_sampling_profiler_collects_target_thread_stacks():
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_loop, args=(stop,))
+    worker.start()
+    try:
+        samples = SamplingProfiler().run(worker.ident, duration=0.1, interval=0.001)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert samples
+    assert all("test_profiling:_busy_loop" in stack for stack in samples)
+    text = SamplingProfiler.format_collapsed(samples)
+    assert text.splitlines()[0].rsplit(" ", 1)[1].isdigit()
+
+
+def test_sampling_profiler_rejects_concurrent_runs():
+    profiler = SamplingProfiler()
+    thread = threading.Thread(
+        target=profiler.run, args=(threading.get_ident(), 0.2, 0.01)
+    )
+    thread.start()
+    time.sleep(0.05)
+    try:
+        with pytest.raises(ProfilerBusyError):
+            profiler.run(threading.get_ident(), 0.01)
+    finally:
+        thread.join()
+
+
+def test_allocation_snapshot_reports_dto_census_diff():
+    profiler = AllocationProfiler()
+    gc.collect()
+    profiler.start()
+    try:
+        held = [CurrencyDTO(code="USD", value=float(i)) for i in range(100)]
+        report = profiler.snapshot(limit=5)
+    finally:
+        profiler.stop()
+
+    census = report["types"]["core.dto.currency_dto.CurrencyDTO"]
+    assert census["count"] >= len(held)
+    assert census["count_diff"] > 0
+    assert "diff_lines" in report
+    assert not profiler.tracing
+
+
+def test_allocation_baseline_excludes_tracemalloc_frames():
+    profiler = AllocationProfiler()
+    profiler.start()
+    try:
+        profiler.snapshot()
+        profiler.start()
+        filenames = {
+            frame.filename
+            for trace in profiler._baseline.traces
+            for frame in trace.traceback
+        }
+    finally:
+        profiler.stop()
+
+    assert tracemalloc.__file__ not in filenames
+
+
+def test_type_census_counts_entities_through_portfolio():
+    portfolio = Portfolio(
+        AmountCurrencyListDTO(
+            items=[CurrencyAmountDTO(code=code, amount=1.0) for code in ("USD", "EUR")]
+        )
+    )
+
+    census = AllocationProfiler().type_census()
+
+    assert census["core.entity.currency_item.AmountData"]["count"] >= 1
+    assert census["core.entity.currency_item.CurrencyAmountItem"]["count"] >= len(
+        portfolio.amount.items
+    )
@@ -0,0 +1,59 @@
+import pytest
+from shared.logutils import ctx_request_id
+from shared.tracing import SpanRecorder, recorder, span, traced
+
+
+@pytest.fixture(autouse=True)
+def clean_recorder():
+    recorder.configure(size=100, enabled=True)
+    recorder.clear()
+    yield
+    recorder.clear()
+
+
+def test_nested_spans_share_trace_and_link_parent():
+    token = ctx_request_id.set("req-1")
+    try:
+        with span("outer"):
+            with span("inner", code="USD"):
+                pass
+    finally:
+        ctx_request_id.reset(token)
+
+    inner, outer = recorder.spans()
+    assert inner.trace_id == outer.trace_id == "req-1"
+    assert inner.parent_id == outer.span_id
+    assert inner.attrs == {"code": "USD"}
+
+
+@pytest.mark.asyncio
+async def test_traced_records_error_for_async_function():
+    @traced("failing")
+    async def failing():
+        raise ValueError
+
+    with pytest.raises(ValueError):
+        await failing()
+
+    (recorded,) = recorder.spans()
+    assert recorded.name == "failing"
+    assert recorded.error == "ValueError"
+
+
+def test_disabled_recorder_skips_spans():
+    recorder.configure(size=100, enabled=False)
+    with span("skipped") as current:
+        assert current is None
+    assert recorder.spans() == []
+
+
+def test_ring_buffer_keeps_latest_spans_and_summary():
+    local = SpanRecorder(size=3)
+    for i in range(5):
+        with span(f"s{i}"):
+            pass
+    for s in recorder.spans():
+        local.record(s)
+
+    assert [s.name for s in local.spans()] == ["s2", "s3", "s4"]
+    assert local.summary()["s4"]["count"] == 1
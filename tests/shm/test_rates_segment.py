@@ -0,0 +1,102 @@
+import pytest
+from core.dto.currency_dto import (
+    AmountCurrencyListDTO,
+    CurrencyAmountDTO,
+    CurrencyDTO,
+    CurrencyListDTO,
+)
+from core.exceptions import CurrencyNotFoundError
+from core.interface.shared_rates import ISharedRates
+from core.repo.portfolio_repo import Portfolio
+from core.repo.shared_rates_portfolio import SharedRatesPortfolio
+from infra.shm.rates_segment import SharedRatesPublisher, SharedRatesSegment
+
+
+@pytest.fixture
+def segment():
+    seg = SharedRatesSegment.create(capacity=4)
+    yield seg
+    seg.close()
+
+
+def test_write_and_snapshot(segment):
+    assert segment.snapshot() == (0, 0.0, {})
+
+    segment.write({"USD": 90.5, "EUR": 100.25}, updated_at=1000.0)
+
+    assert segment.version == 1
+    assert segment.snapshot() == (1, 1000.0, {"USD": 90.5, "EUR": 100.25})
+
+
+def test_attached_segment_sees_writes(segment):
+    reader = SharedRatesSegment.attach(segment.name)
+    try:
+        segment.write({"USD": 91.0}, updated_at=1000.0)
+        assert reader.snapshot() == (1, 1000.0, {"USD": 91.0})
+    finally:
+        reader.close()
+
+
+def test_capacity_is_enforced(segment):
+    with pytest.raises(ValueError):
+        segment.write({f"C{i}": 1.0 for i in range(5)})
+
+
+def test_portfolio_reads_rates_from_segment(segment):
+    portfolio = SharedRatesPortfolio(
+        initial_amounts=AmountCurrencyListDTO(
+            items=[
+                CurrencyAmountDTO(code="USD", amount=10.0),
+                CurrencyAmountDTO(code="RUB", amount=100.0),
+            ]
+        ),
+        shared_rates=segment,
+    )
+    with pytest.raises(CurrencyNotFoundError):
+        portfolio.get_rate("USD")
+
+    # Время получения курсов — из repo писателя, например снимок из кэша
+    writer = Portfolio(AmountCurrencyListDTO(items=[]))
+    dto = CurrencyListDTO(
+        items=[CurrencyDTO(code="USD", value=90.0), CurrencyDTO(code="EUR", value=100.0)]
+    )
+    writer.restore_rates(dto, updated_at=1000.0)
+    SharedRatesPublisher(segment, writer).on_rates_updated(dto)
+
+    assert portfolio.get_rate("USD").value == 90.0
+    assert portfolio.get_total().total_amount == 1000.0
+    assert portfolio.rates_updated_at == 1000.0
+
+
+class TickingRates(ISharedRates):
+    """Сегмент, в котором курсы меняются перед каждым чтением версии"""
+
+    def __init__(self):
+        self._version = 0
+
+    @property
+    def name(self):
+        return "ticking"
+
+    @property
+    def version(self):
+        self._version += 1
+        return self._version
+
+    def snapshot(self):
+        return self._version, 0.0, {"USD": 90.0 + self._version, "EUR": 100.0}
+
+
+def test_batch_rates_and_matrix_come_from_one_snapshot():
+    portfolio = SharedRatesPortfolio(
+        initial_amounts=AmountCurrencyListDTO(
+            items=[CurrencyAmountDTO(code="USD", amount=1.0)]
+        ),
+        shared_rates=TickingRates(),
+    )
+
+    res = portfolio.get_batch_rates(["USD", "EUR"], with_matrix=True)
+
+    usd, eur = (item.value for item in res.rates.items)
+    assert res.matrix.matrix[0][1] == pytest.approx(usd / eur)
+    assert res.base == "RUB"
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+SRC = ROOT / "src"
+
+
+def run_python(code: str, **env: str) -> subprocess.CompletedProcess:
+    base_env = {k: v for k, v in os.environ.items() if k != "PROJ_ENV"}
+    return subprocess.run(
+        [sys.executable, "-c", code],
+        env={**base_env, "PYTHONPATH": os.pathsep.join((str(ROOT), str(SRC))), **env},
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+
+def test_settings_module_imports_without_env():
+    proc = run_python("import application.settings")
+    assert proc.returncode == 0, proc.stderr
+
+
+@pytest.mark.parametrize("module", ["main", "run_api", "run_service"])
+def test_entry_points_import_without_env(module):
+    proc = run_python(f"import {module}")
+    assert proc.returncode == 0, proc.stderr
+
+
+def test_settings_are_validated_on_first_access():
+    proc = run_python("from application.settings import settings")
+    assert proc.returncode != 0
+    assert "PROJ_ENV" in proc.stderr
+
+
+@pytest.mark.parametrize(
+    "module, not_loaded",
+    [
+        ("application.app", "application.api.endpoints.portfolio.portfolio"),
+        ("application.app", "uvicorn"),
+        ("run_api", "uvicorn"),
+        ("core.repo.portfolio_repo", "httpx"),
+        ("infra.services.base_http_service", "httpx"),
+    ],
+)
+def test_heavy_modules_are_not_imported_eagerly(module, not_loaded):
+    proc = run_python(
+        f"import sys, {module}; print({not_loaded!r} in sys.modules)", PROJ_ENV="test"
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == "False"
+
+
+def test_app_is_loaded_under_a_single_module_name():
+    proc = run_python(
+        "import sys; from application.app import create_app; create_app(); "
+        "print(sorted(m for m in sys.modules if m.startswith('src.')))",
+        PROJ_ENV="test",
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip().splitlines()[-1] == "[]"
@@ -0,0 +1,161 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from core.events.hub import EventHub
+from core.exceptions import WebhookError
+from core.interface.webhooks import IWebhookSender
+from core.services.webhook_dispatcher import WebhookDispatcher
+from infra.webhooks.http_sender import HttpxWebhookSender
+from infra.webhooks.sqlite_outbox import SqliteWebhookOutbox
+
+
+class FakeSender(IWebhookSender):
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.sent = []
+        self.in_flight = self.max_in_flight = 0
+
+    async def send(self, url, body):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if url in self.failing:
+            raise WebhookError(f"{url} is down")
+        self.sent.append((url, json.loads(body)))
+
+    async def aclose(self):
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make(tmp_path, sender, urls=("http://a", "http://b"), **kwargs):
+    clock = FakeClock()
+    outbox = SqliteWebhookOutbox(tmp_path / "outbox.sqlite3")
+    dispatcher = WebhookDispatcher(
+        outbox, sender, urls, EventHub(), clock=clock, **kwargs
+    )
+    return dispatcher, outbox, clock
+
+
+@pytest.mark.asyncio
+async def test_events_are_batched_per_url_with_bounded_concurrency(tmp_path):
+    sender = FakeSender()
+    dispatcher, outbox, _ = make(
+        tmp_path, sender, urls=("http://a", "http://b"), batch_size=2, max_concurrency=2
+    )
+    for i in range(5):
+        dispatcher.enqueue("rates", json.dumps({"v": i}))
+
+    flushed = [await dispatcher.flush() for _ in range(4)]
+    assert flushed == [4, 4, 2, 0]  # за раз — batch_size * max_concurrency
+    assert len(outbox) == 0
+    assert sender.max_in_flight == 2
+    batches_a = [body["events"] for url, body in sender.sent if url == "http://a"]
+    assert [len(events) for events in batches_a] == [2, 2, 1]
+    assert [e["data"]["v"] for events in batches_a for e in events] == [0, 1, 2, 3, 4]
+    assert batches_a[0][0]["topic"] == "rates"
+
+
+@pytest.mark.asyncio
+async def test_failed_url_is_retried_with_backoff_then_dropped(tmp_path):
+    sender = FakeSender(failing={"http://b"})
+    dispatcher, outbox, clock = make(
+        tmp_path, sender, max_attempts=2, backoff_base=10, lease=1000
+    )
+    dispatcher.enqueue("total", '{"total_amount":1}')
+
+    await dispatcher.flush()
+    assert [url for url, _ in sender.sent] == ["http://a"]
+    assert len(outbox) == 1
+
+    clock.now += 5
+    assert await dispatcher.flush() == 0  # задержка еще не прошла
+    clock.now += 5
+    assert await dispatcher.flush() == 1
+    assert len(outbox) == 0  # max_attempts исчерпаны
+
+
+@pytest.mark.asyncio
+async def test_outbox_survives_restart_and_claims_are_leased(tmp_path):
+    dispatcher, outbox, clock = make(tmp_path, FakeSender())
+    dispatcher.enqueue("rates", "{}")
+    await dispatcher.aclose()
+
+    reopened = SqliteWebhookOutbox(tmp_path / "outbox.sqlite3")
+    claimed = reopened.claim(clock.now, lease=30, limit=10)
+    assert [m.url for m in claimed] == ["http://a", "http://b"]
+    assert reopened.claim(clock.now, lease=30, limit=10) == []
+    assert len(reopened.claim(clock.now + 30, lease=30, limit=10)) == 2
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_run_forwards_hub_events_without_blocking_publish(tmp_path):
+    sender = FakeSender()
+    dispatcher, _, _ = make(tmp_path, sender, urls=("http://a",), topics=("rates",))
+    task = asyncio.create_task(dispatcher.run())
+    await asyncio.sleep(0)
+
+    dispatcher._hub.publish("total", {"ignored": True})
+    dispatcher._hub.publish("rates", {"items": []})
+    for _ in range(100):
+        if sender.sent:
+            break
+        await asyncio.sleep(0.01)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    await dispatcher.aclose()
+
+    assert [e["topic"] for _, body in sender.sent for e in body["events"]] == ["rates"]
+
+
+@pytest.mark.asyncio
+async def test_http_sender_reports_non_2xx():
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(200 if request.url.path == "/ok" else 500)
+    )
+    sender = HttpxWebhookSender(transport=transport)
+    await sender.send("http://hooks/ok", b"{}")
+    with pytest.raises(WebhookError):
+        await sender.send("http://hooks/fail", b"{}")
+    await sender.aclose()
+
+
+@pytest.mark.asyncio
+async def test_new_events_wait_for_retried_batch_of_same_url(tmp_path):
+    sender = FakeSender(failing={"http://b"})
+    dispatcher, outbox, clock = make(tmp_path, sender, backoff_base=10, lease=1000)
+    dispatcher.enqueue("rates", json.dumps({"v": 0}))
+    await dispatcher.flush()
+    sender.failing.clear()
+
+    dispatcher.enqueue("rates", json.dumps({"v": 1}))
+    await dispatcher.flush()
+    sent_b = [body for url, body in sender.sent if url == "http://b"]
+    assert sent_b == []  # v=1 не уходит раньше отложенного v=0
+    assert len(outbox) == 2
+
+    clock.now += 10
+    await dispatcher.flush()
+    sent_b = [body for url, body in sender.sent if url == "http://b"]
+    assert [e["data"]["v"] for body in sent_b for e in body["events"]] == [0, 1]
+
+
+def test_outbox_evicts_oldest_rows_over_max_rows(tmp_path):
+    outbox = SqliteWebhookOutbox(tmp_path / "outbox.sqlite3", max_rows=3)
+    assert outbox.add([("http://a", "rates", str(i), 0.0) for i in range(2)]) == 0
+    assert outbox.add([("http://a", "rates", str(i), 0.0) for i in range(2, 5)]) == 2
+
+    claimed = outbox.claim(now=1.0, lease=10, limit=10)
+    assert [m.data for m in claimed] == ["2", "3", "4"]
+    outbox.close()